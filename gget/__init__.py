@@ -1,6 +1,6 @@
 from .gget_ref import ref
-from .gget_search import search
-from .gget_info import info
+from .gget_search import search, build_search_index
+from .gget_info import info, info_iter
 from .gget_seq import seq
 from .gget_muscle import muscle
 from .gget_blast import blast
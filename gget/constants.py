@@ -7,9 +7,18 @@ ENSEMBL_FTP_URL_GRCH37 = "http://ftp.ensembl.org/pub/grch37/"
 # Non-vertebrate server
 ENSEMBL_FTP_URL_NV = "http://ftp.ensemblgenomes.org/pub/"
 
+# Public Ensembl MySQL server for gget search
+ENSEMBL_MYSQL_HOST = "mysql-eg-publicsql.ebi.ac.uk"
+# Ports to try (some databases are stored in different ports)
+# 3306 (and 5306) for the Ensembl instances, 3337 for GRCh37, 4157 for Ensembl Genomes, and 5316 for mart
+ENSEMBL_MYSQL_PORTS = [3306, 5306, 4157, 3337, 5316]
+
 # NCBI URL for gget info
 NCBI_URL = "https://www.ncbi.nlm.nih.gov"
 
+# NCBI E-utilities URL for gget info (esearch/esummary)
+NCBI_EUTILS_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"
+
 # NCBI VIRUS REST API URL for gget virus - Version 2 API endpoint
 NCBI_API_BASE = "https://api.ncbi.nlm.nih.gov/datasets/v2"
 
@@ -1,6 +1,7 @@
 import pandas as pd
 import json as json_package
 import time
+from contextlib import closing
 from bs4 import BeautifulSoup
 
 # Using urllib instead of requests here because requests does not
@@ -9,7 +10,8 @@ from urllib.request import urlopen, Request
 from urllib.parse import urlencode
 
 # Custom functions
-from .utils import parse_blast_ref_page, wrap_cols_func, read_fasta, set_up_logger
+from . import utils
+from .utils import parse_blast_ref_page, wrap_cols_func, iter_fasta, set_up_logger
 
 logger = set_up_logger()
 
@@ -86,7 +88,7 @@ def blast(
     # read the file and extract the first sequence
     if "." in sequence:
         if ".txt" in sequence or ".fa" in sequence:
-            _, seqs = read_fasta(sequence)
+            records = iter_fasta(sequence)
 
         else:
             raise ValueError(
@@ -94,8 +96,11 @@ def blast(
             )
 
         # Set the first sequence from the fasta file as 'sequence'
-        sequence = seqs[0]
-        if len(seqs) > 1:
+        # (only read as far as the second record, and close the file right away)
+        with closing(records):
+            sequence = next(records, (None, ""))[1]
+            multiple_records = next(records, None) is not None
+        if multiple_records:
             logger.warning(
                 "File contains more than one sequence. Only the first sequence will be submitted to BLAST."
             )
@@ -234,7 +239,7 @@ def blast(
 
     # Submit search to server
     request = Request(url, put_message, {"User-Agent": client})
-    handle = urlopen(request)
+    handle = urlopen(request, timeout=utils.HTTP_TIMEOUT)
 
     ## Fetch Request ID (RID) and estimated time to completion (RTOE)
     RID, RTOE = parse_blast_ref_page(handle)
@@ -278,7 +283,7 @@ def blast(
 
         # Query for search status
         request = Request(url, get_message, {"User-Agent": client})
-        handle = urlopen(request)
+        handle = urlopen(request, timeout=utils.HTTP_TIMEOUT)
         results = handle.read().decode()
 
         # Fetch search status
@@ -1,9 +1,11 @@
 import json as json_package
 from json.decoder import JSONDecodeError
+from contextlib import closing
 import pandas as pd
 from urllib import request
 
-from .utils import set_up_logger, read_fasta
+from . import utils
+from .utils import set_up_logger, iter_fasta
 
 logger = set_up_logger()
 
@@ -38,7 +40,7 @@ def blat(
     # read the file and extract the first sequence
     if "." in sequence:
         if ".txt" in sequence or ".fa" in sequence:
-            _, seqs = read_fasta(sequence)
+            records = iter_fasta(sequence)
 
         else:
             raise ValueError(
@@ -46,8 +48,11 @@ def blat(
             )
 
         # Set the first sequence from the fasta file as 'sequence'
-        sequence = seqs[0]
-        if len(seqs) > 1:
+        # (only read as far as the second record, and close the file right away)
+        with closing(records):
+            sequence = next(records, (None, ""))[1]
+            multiple_records = next(records, None) is not None
+        if multiple_records:
             if verbose:
                 logger.info(
                     "File contains more than one sequence. Only the first sequence will be submitted to BLAT."
@@ -128,7 +133,7 @@ def blat(
                 "User-Agent": "gget"
             }
         )
-    r = request.urlopen(req)
+    r = request.urlopen(req, timeout=utils.HTTP_TIMEOUT)
 
     # Get status code (in a way that is stable across Python versions)
     code = getattr(r, "status", None)
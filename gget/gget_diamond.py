@@ -7,7 +7,13 @@ import uuid
 import json as json_package
 
 from .compile import PACKAGE_PATH
-from .utils import tsv_to_df, create_tmp_fasta, remove_temp_files, set_up_logger
+from .utils import (
+    tsv_to_df,
+    create_tmp_fasta,
+    uncompressed_fasta,
+    remove_temp_files,
+    set_up_logger,
+)
 
 logger = set_up_logger()
 
@@ -40,6 +46,7 @@ def diamond(
     Args:
     - query          Sequences (str or list) or path to FASTA file containing sequences to be aligned against the reference.
     - reference      Reference sequences (str or list) or path to FASTA file containing reference sequences.
+                     FASTA files may be gzip (.gz) or zstd (.zst) compressed.
                      Set translated=True if reference sequences are amino acid sequences and query sequences are nucleotide sequences.
     - translated     True/False whether to perform translated alignment of nucleotide sequences to amino acid reference sequences.
                      Default: False.
@@ -78,14 +85,21 @@ def diamond(
 
     # Define paths to query/reference/db/output files
     files_to_delete = []
+    # DIAMOND reads gzip-compressed FASTA files natively
     if "." in query:
-        input_file = os.path.abspath(query)
+        input_file, is_tmp = uncompressed_fasta(query, supported=("gzip", "bgzf"))
+        if is_tmp:
+            files_to_delete.append(input_file)
     else:
         input_file = create_tmp_fasta(query)
         files_to_delete.append(input_file)
 
     if "." in reference:
-        reference_file = os.path.abspath(reference)
+        reference_file, is_tmp = uncompressed_fasta(
+            reference, supported=("gzip", "bgzf")
+        )
+        if is_tmp:
+            files_to_delete.append(reference_file)
     else:
         reference_file = create_tmp_fasta(reference)
         files_to_delete.append(reference_file)
@@ -1,23 +1,205 @@
 import numpy as np
 import pandas as pd
 import json as json_package
-import requests
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
 
 # Custom functions
 from .utils import (
     rest_query,
-    get_uniprot_info,
+    get_uniprot_info_bulk,
     wrap_cols_func,
-    get_pdb_ids,
+    get_pdb_ids_bulk,
     set_up_logger,
-    post_query,
+    post_query_chunked,
+    check_cache_mode,
+    get_ncbi_gene_info,
 )
 
 logger = set_up_logger()
 
 # Constants
-from .constants import ENSEMBL_REST_API, UNIPROT_REST_API, NCBI_URL
+from .constants import ENSEMBL_REST_API, UNIPROT_REST_API
+
+# Fields of the transcript, exon and translation records returned by Ensembl (expand=True)
+# mapped to the names of the corresponding long-format columns
+TRANSCRIPT_FIELDS = {
+    "biotype": "transcript_biotype",
+    "display_name": "transcript_name",
+    "strand": "transcript_strand",
+    "start": "transcript_start",
+    "end": "transcript_end",
+}
+EXON_FIELDS = {"start": "exon_start", "end": "exon_end"}
+TRANSLATION_FIELDS = {"start": "translation_start", "end": "translation_end"}
+# Order of the long-format data frames returned by gget info (long_format=True)
+LONG_FORMAT_FEATURES = ["transcripts", "exons", "translations"]
+
+
+def _versioned_id(record):
+    """
+    Return the ID of an Ensembl record with its latest version number appended (or just the ID if no version is available).
+    """
+    if "id" not in record:
+        return np.nan
+    if "version" in record:
+        return f"{record['id']}.{record['version']}"
+    return record["id"]
+
+
+def _feature_lists(results, key, fields):
+    """
+    Collect the IDs and the requested fields of the records listed under 'key' in each Ensembl lookup result.
+    Returns one row per result containing one list per column (or NaN if the result does not contain 'key').
+    """
+    rows = []
+    for result in results:
+        records = result.get(key)
+        if not isinstance(records, list):
+            rows.append([np.nan] * (len(fields) + 1))
+            continue
+
+        rows.append(
+            [[_versioned_id(record) for record in records]]
+            + [[record.get(field, np.nan) for record in records] for field in fields]
+        )
+
+    return rows
+
+
+def _translation_lists(results):
+    """
+    Collect the ID, start and end of the translation of each queried transcript.
+    Returns one row per result containing one list per column (an empty list for non-coding transcripts,
+    or NaN if the result is not a transcript).
+    """
+    records = []
+    for result in results:
+        if isinstance(result.get("Translation"), dict):
+            records.append({"Translation": [result["Translation"]]})
+        elif result.get("object_type") == "Transcript":
+            records.append({"Translation": []})
+        else:
+            records.append({})
+
+    return _feature_lists(records, "Translation", TRANSLATION_FIELDS)
+
+
+def _append_records(table, id_column, records, fields, **ids):
+    """
+    Append the ID and the requested fields of each record to the columns of a long-format table.
+    Additional keyword arguments are added as constant columns (e.g. the ID of the parent record).
+    """
+    for column, value in ids.items():
+        table[column].extend([value] * len(records))
+    table[id_column].extend([_versioned_id(record) for record in records])
+    for field, column in fields.items():
+        table[column].extend([record.get(field, np.nan) for record in records])
+
+
+def _feature_tables(master_dict, ens_ids):
+    """
+    Flatten the transcript, exon and translation records nested in the Ensembl lookup results
+    into long-format data frames with one row per transcript, exon and translation.
+    The transcripts of queried genes and the queried transcripts themselves are included.
+
+    Args:
+    - master_dict   Dictionary of Ensembl lookup results (expand=True) keyed by queried Ensembl ID.
+    - ens_ids       Queried Ensembl IDs in the order in which they should be returned.
+
+    Returns the transcripts, exons and translations data frames.
+    """
+    # Build each table column by column and create the data frames at the end
+    transcripts = {
+        column: []
+        for column in ["ensembl_id", "transcript_id", *TRANSCRIPT_FIELDS.values()]
+    }
+    exons = {
+        column: []
+        for column in ["ensembl_id", "transcript_id", "exon_id", *EXON_FIELDS.values()]
+    }
+    translations = {
+        column: []
+        for column in [
+            "ensembl_id",
+            "transcript_id",
+            "translation_id",
+            *TRANSLATION_FIELDS.values(),
+        ]
+    }
+
+    for ens_id in ens_ids:
+        result = master_dict[ens_id]
+        if isinstance(result.get("Transcript"), list):
+            transcript_records = result["Transcript"]
+        elif result.get("object_type") == "Transcript":
+            transcript_records = [result]
+        else:
+            continue
+
+        _append_records(
+            transcripts,
+            "transcript_id",
+            transcript_records,
+            TRANSCRIPT_FIELDS,
+            ensembl_id=result["ensembl_id"],
+        )
+
+        for transcript in transcript_records:
+            transcript_id = _versioned_id(transcript)
+            _append_records(
+                exons,
+                "exon_id",
+                transcript.get("Exon") or [],
+                EXON_FIELDS,
+                ensembl_id=result["ensembl_id"],
+                transcript_id=transcript_id,
+            )
+            if isinstance(transcript.get("Translation"), dict):
+                _append_records(
+                    translations,
+                    "translation_id",
+                    [transcript["Translation"]],
+                    TRANSLATION_FIELDS,
+                    ensembl_id=result["ensembl_id"],
+                    transcript_id=transcript_id,
+                )
+
+    return (
+        pd.DataFrame(transcripts),
+        pd.DataFrame(exons),
+        pd.DataFrame(translations),
+    )
+
+
+def _clean_ens_ids(ens_ids, verbose=True):
+    """
+    Remove version numbers from Ensembl IDs (but not from WormBase and FlyBase IDs)
+    and remove duplicates without changing the order of the IDs.
+    """
+    # If single Ensembl ID passed as string, convert to list
+    if type(ens_ids) == str:
+        ens_ids = [ens_ids]
+    # Remove Ensembl ID version if passed
+    ens_ids_clean = []
+    temp = 0
+    for ensembl_ID in ens_ids:
+        # But only for Ensembl ID (and not for flybase/wormbase IDs)
+        if ensembl_ID.startswith("ENS"):
+            ens_ids_clean.append(ensembl_ID.split(".")[0])
+
+            if "." in ensembl_ID and temp == 0:
+                if verbose is True:
+                    logger.info(
+                        "We noticed that you passed a version number with your Ensembl ID.\n"
+                        "Please note that gget info will always return information linked to the latest Ensembl ID version (see 'ensembl_id')."
+                    )
+                temp = +1
+
+        else:
+            ens_ids_clean.append(ensembl_ID)
+
+    # Remove duplicates in the Ensembl ID list without changing their order
+    return list(dict.fromkeys(ens_ids_clean))
 
 
 ## gget info
@@ -32,6 +214,8 @@ def info(
     save=False,
     expand=False,
     ensembl_only=False,
+    cache=None,
+    long_format=False,
 ):
     """
     Fetch gene and transcript metadata using Ensembl IDs.
@@ -46,8 +230,15 @@ def info(
     - json          If True, returns results in json/dictionary format instead of data frame. Default: False.
     - verbose       True/False whether to print progress information. Default True.
     - save          True/False wether to save csv with query results in current working directory. Default: False.
+    - cache         'off', 'read' or 'readwrite'. Whether server responses are read from and/or written to the
+                    persistent gget cache (directory set by environment variable GGET_CACHE_DIR).
+                    Default: None -> value of environment variable GGET_CACHE, or 'off'.
+    - long_format   If True, also returns long-format data frames with one row per transcript, exon and translation
+                    (of the queried genes and transcripts). Default: False.
 
     Returns a data frame containing the requested information.
+    If long_format=True, returns a tuple of four data frames (or JSON formatted dictionaries if json=True):
+    the results, the transcripts, the exons and the translations.
 
     Deprecated arguments:
     - expand        (gget info now always returns all of the available information)
@@ -65,6 +256,8 @@ def info(
                 "'ensembl_only' argument deprecated! Please use arguments 'ncbi=False' and 'uniprot=False'."
             )
 
+    cache = check_cache_mode(cache)
+
     # Set synonyms found by each database initially to none
     ncbi_synonyms = None
     df_uniprot = None
@@ -82,30 +275,7 @@ def info(
     content_type = "application/json"
 
     ## Clean up Ensembl IDs
-    # If single Ensembl ID passed as string, convert to list
-    if type(ens_ids) == str:
-        ens_ids = [ens_ids]
-    # Remove Ensembl ID version if passed
-    ens_ids_clean = []
-    temp = 0
-    for ensembl_ID in ens_ids:
-        # But only for Ensembl ID (and not for flybase/wormbase IDs)
-        if ensembl_ID.startswith("ENS"):
-            ens_ids_clean.append(ensembl_ID.split(".")[0])
-
-            if "." in ensembl_ID and temp == 0:
-                if verbose is True:
-                    logger.info(
-                        "We noticed that you passed a version number with your Ensembl ID.\n"
-                        "Please note that gget info will always return information linked to the latest Ensembl ID version (see 'ensembl_id')."
-                    )
-                temp = +1
-
-        else:
-            ens_ids_clean.append(ensembl_ID)
-
-    # Remove duplicates in the Ensembl ID list without changing their order
-    ens_ids_clean = sorted(set(ens_ids_clean), key=ens_ids_clean.index)
+    ens_ids_clean = _clean_ens_ids(ens_ids, verbose=verbose)
     # Create second clean list of Ensembl IDs which will not include IDs that were not found
     ens_ids_clean_2 = ens_ids_clean.copy()
 
@@ -113,10 +283,13 @@ def info(
     master_dict = {}
 
     # Query REST APIs from https://rest.ensembl.org/
+    # IDs are submitted in chunks of up to 1,000 IDs
     endpoint = "lookup/id/"
-    query = {"ids": ens_ids_clean, "expand": True}
+    query = {"expand": True}
 
-    results_dict = post_query(server, endpoint, query)
+    results_dict = post_query_chunked(
+        server, endpoint, ens_ids_clean, query=query, cache=cache
+    )
     results_dict = {k: v for k, v in results_dict.items() if v is not None}
 
     for ensembl_ID, df_temp in results_dict.items():
@@ -137,8 +310,9 @@ def info(
     if len(ens_ids_clean_tmp) > 0:
         # print(f"Second pass for ids: {ens_ids_clean_tmp}")
         # Try submitting query without expand (expand does not work for exons and translation IDs)
-        query = {"ids": ens_ids_clean_tmp}
-        results_dict_new = post_query(server, endpoint, query)
+        results_dict_new = post_query_chunked(
+            server, endpoint, ens_ids_clean_tmp, cache=cache
+        )
         results_dict_new = {k: v for k, v in results_dict_new.items() if v is not None}
 
         for ensembl_ID, df_temp in results_dict_new.items():
@@ -190,20 +364,47 @@ def info(
         # df_temp will hold information from NCBI, UniProt and PDB for each of the Ensembl IDs
         df_temp = pd.DataFrame()
 
-        for ens_id in ens_ids_clean_2:
+        pdb_executor = ThreadPoolExecutor(max_workers=1) if fetch_pdb else None
+        try:
+            if fetch_pdb:
+                # Get PDB IDs for all IDs (concurrent PDBe queries) while UniProt and NCBI are queried
+                pdb_future = pdb_executor.submit(
+                    get_pdb_ids_bulk, ens_ids_clean_2, verbose=verbose, cache=cache
+                )
+
             if fetch_uniprot is True:
                 try:
-                    # Get gene names and descriptions from UniProt
-                    df_uniprot = get_uniprot_info(
-                        UNIPROT_REST_API, ens_id, verbose=verbose
+                    # Get gene names and descriptions for all IDs from UniProt (batched queries)
+                    uniprot_dfs = get_uniprot_info_bulk(
+                        UNIPROT_REST_API, ens_ids_clean_2, verbose=verbose, cache=cache
                     )
 
                 except Exception as e:
                     if verbose:
                         logger.warning(
-                            f"UniProt server request for ID '{ens_id}' returned the following error:\n{e}"
+                            f"UniProt server request returned the following error:\n{e}"
                         )
-                    continue
+                    uniprot_dfs = {}
+
+            if fetch_ncbi is True:
+                # Get NCBI gene IDs, synonyms and descriptions for all IDs (batched E-utilities queries)
+                ncbi_results = get_ncbi_gene_info(
+                    ens_ids_clean_2,
+                    ensembl_info=master_dict,
+                    verbose=verbose,
+                    cache=cache,
+                )
+
+            if fetch_pdb:
+                pdb_results = pdb_future.result()
+        finally:
+            # Do not wait for the PDB queries if UniProt or NCBI raised
+            if pdb_executor is not None:
+                pdb_executor.shutdown(wait=False)
+
+        for ens_id in ens_ids_clean_2:
+            if fetch_uniprot is True:
+                df_uniprot = uniprot_dfs.get(ens_id)
 
                 if not isinstance(df_uniprot, type(None)):
                     # If two different UniProt IDs for a single query ID are returned, they should be merged into one column
@@ -232,80 +433,10 @@ def info(
                         logger.warning(f"No UniProt entry was found for ID {ens_id}.")
 
             if fetch_ncbi is True:
-                ## Get NCBI gene ID and description (for genes only)
-                url = NCBI_URL + f"/gene/?term={ens_id}"
-
-                try:
-                    html = requests.get(url)
-                    # Raise error if status code not "OK" Response
-                    if html.status_code != 200:
-                        logger.error(
-                            f"NCBI server request for {ens_id} returned error status code:\n{html.status_code}.\nPlease double-check arguments or try again later."
-                        )
-
-                    ## Web scrape NCBI website for gene ID, synonyms and description
-                    soup = BeautifulSoup(html.text, "html.parser")
-
-                    # Check for error message in NCBI return
-                    if (
-                        soup.find("li", class_="error icon") is not None
-                        and "An error has occured"
-                        in soup.find("li", class_="error icon").text.strip()
-                    ):
-                        error_message = soup.find(
-                            "li", class_="error icon"
-                        ).text.strip()
-
-                        logger.error(
-                            f"The NCBI server request for Ensembl ID '{ens_id}' returned the following error:\n{error_message}"
-                        )
-
-                        ncbi_gene_id = np.nan
-                        ncbi_description = np.nan
-                        ncbi_synonyms = None
-                        continue
-
-                    # Check if NCBI gene ID is available
-                    try:
-                        ncbi_gene_id = soup.find("input", {"id": "gene-id-value"}).get(
-                            "value"
-                        )
-                    except AttributeError:
-                        ncbi_gene_id = np.nan
-
-                    # Check if NCBI description is available
-                    try:
-                        ncbi_description = (
-                            soup.find("div", class_="section", id="summaryDiv")
-                            .find("dt", string="Summary")
-                            .find_next_sibling("dd")
-                            .text
-                        )
-                    except AttributeError:
-                        ncbi_description = np.nan
-
-                    # Check if NCBI synonyms are available
-                    try:
-                        ncbi_synonyms = (
-                            soup.find("div", class_="section", id="summaryDiv")
-                            .find("dt", string="Also known as")
-                            .find_next_sibling("dd")
-                            .text
-                        )
-                        # Split NCBI synonyms
-                        ncbi_synonyms = ncbi_synonyms.split("; ")
-                    except AttributeError:
-                        ncbi_synonyms = None
-
-                except Exception as e:
-                    logger.error(
-                        f"The NCBI server request for Ensembl ID '{ens_id}' returned the following error:\n{e}"
-                    )
-
-                    ncbi_gene_id = np.nan
-                    ncbi_description = np.nan
-                    ncbi_synonyms = None
-                    continue
+                ## Get NCBI gene ID, description and synonyms
+                ncbi_gene_id = ncbi_results[ens_id]["ncbi_gene_id"]
+                ncbi_description = ncbi_results[ens_id]["ncbi_description"]
+                ncbi_synonyms = ncbi_results[ens_id]["ncbi_synonyms"]
 
                 # Save NCBI info to data frame
                 df_ncbi = pd.DataFrame(
@@ -321,21 +452,16 @@ def info(
 
             if fetch_pdb:
                 ## Get PDB IDs from Ensembl ID
-                try:
-                    pdb_ids = get_pdb_ids(ens_id)
-
-                except Exception as e:
-                    if verbose:
-                        logger.warning(
-                            f"The PDBe server request for Ensembl ID '{ens_id}' returned the following error:\n{e}"
-                        )
+                # (IDs for which the PDBe server request failed are not included in pdb_results)
+                if ens_id not in pdb_results:
                     continue
+                pdb_ids = pdb_results[ens_id]
 
                 # Add pdb_ids to data frame
                 if pdb_ids:
-                    df_pdb["pdb_id"] = [pdb_ids]
+                    df_pdb = pd.DataFrame({"pdb_id": [pdb_ids]})
                 else:
-                    df_pdb["pdb_id"] = [np.nan]
+                    df_pdb = pd.DataFrame({"pdb_id": [np.nan]})
 
                 # Transpose pdb df and add Ensembl ID as column name
                 df_pdb = df_pdb.T
@@ -408,162 +534,39 @@ def info(
         ]
     )
 
-    ens_ids = []
-    # Dictionary to save clean info
-    data = {
-        "all_transcripts": [],
-        "transcript_biotypes": [],
-        "transcript_names": [],
-        "transcript_strands": [],
-        "transcript_starts": [],
-        "transcript_ends": [],
-        "all_exons": [],
-        "exon_starts": [],
-        "exon_ends": [],
-        "all_translations": [],
-        "translation_starts": [],
-        "translation_ends": [],
-    }
-
-    # Collect the transcripts info for each ID in separate lists
-    for ens_id in df.columns:
-        # Record Ensembl ID
-        ens_ids.append(ens_id)
-
-        # Clean up transcript info, if available
-        all_transcripts = []
-        transcript_biotypes = []
-        transcript_names = []
-        transcript_strands = []
-        transcript_starts = []
-        transcript_ends = []
-
-        try:
-            for trans_dict in df[ens_id]["Transcript"]:
-                try:
-                    try:
-                        # Add Transcript ID with latest version if available
-                        versioned_trans_id = (
-                            str(trans_dict["id"]) + "." + str(trans_dict["version"])
-                        )
-                        all_transcripts.append(versioned_trans_id)
-                    except KeyError:
-                        # Just add ID if no version found
-                        all_transcripts.append(trans_dict["id"])
-                except:
-                    all_transcripts.append(np.nan)
-                try:
-                    transcript_names.append(trans_dict["display_name"])
-                except:
-                    transcript_names.append(np.nan)
-                try:
-                    transcript_biotypes.append(trans_dict["biotype"])
-                except:
-                    transcript_biotypes.append(np.nan)
-                try:
-                    transcript_starts.append(trans_dict["start"])
-                except:
-                    transcript_starts.append(np.nan)
-                try:
-                    transcript_ends.append(trans_dict["end"])
-                except:
-                    transcript_ends.append(np.nan)
-                try:
-                    transcript_strands.append(trans_dict["strand"])
-                except:
-                    transcript_strands.append(np.nan)
-
-            data["all_transcripts"].append(all_transcripts)
-            data["transcript_biotypes"].append(transcript_biotypes)
-            data["transcript_names"].append(transcript_names)
-            data["transcript_strands"].append(transcript_strands)
-            data["transcript_starts"].append(transcript_starts)
-            data["transcript_ends"].append(transcript_ends)
-
-        except:
-            data["all_transcripts"].append(np.nan)
-            data["transcript_biotypes"].append(np.nan)
-            data["transcript_names"].append(np.nan)
-            data["transcript_strands"].append(np.nan)
-            data["transcript_starts"].append(np.nan)
-            data["transcript_ends"].append(np.nan)
-
-        # Clean up exon info, if available
-        all_exons = []
-        exon_starts = []
-        exon_ends = []
-        try:
-            for exon_dict in df[ens_id]["Exon"]:
-                try:
-                    try:
-                        # Add ID with latest version if available
-                        versioned_id = (
-                            str(exon_dict["id"]) + "." + str(exon_dict["version"])
-                        )
-                        all_exons.append(versioned_id)
-                    except KeyError:
-                        # Just add ID if no version found
-                        all_exons.append(exon_dict["id"])
-                except:
-                    all_exons.append(np.nan)
-                try:
-                    exon_starts.append(exon_dict["start"])
-                except:
-                    exon_starts.append(np.nan)
-                try:
-                    exon_ends.append(exon_dict["end"])
-                except:
-                    exon_ends.append(np.nan)
-
-            data["all_exons"].append(all_exons)
-            data["exon_starts"].append(exon_starts)
-            data["exon_ends"].append(exon_ends)
-
-        except:
-            data["all_exons"].append(np.nan)
-            data["exon_starts"].append(np.nan)
-            data["exon_ends"].append(np.nan)
-
-        # Clean up translation info, if available
-        all_translations = []
-        translation_starts = []
-        translation_ends = []
-        try:
-            for transl_dict in df[ens_id]["Exon"]:
-                try:
-                    try:
-                        # Add ID with latest version if available
-                        versioned_id = (
-                            str(transl_dict["id"]) + "." + str(transl_dict["version"])
-                        )
-                        all_translations.append(versioned_id)
-                    except KeyError:
-                        # Just add ID if no version found
-                        all_translations.append(transl_dict["id"])
-                except:
-                    all_translations.append(np.nan)
-                try:
-                    translation_starts.append(transl_dict["start"])
-                except:
-                    translation_starts.append(np.nan)
-                try:
-                    translation_ends.append(transl_dict["end"])
-                except:
-                    translation_ends.append(np.nan)
-
-            data["all_translations"].append(all_translations)
-            data["translation_starts"].append(translation_starts)
-            data["translation_ends"].append(translation_ends)
-
-        except:
-            data["all_translations"].append(np.nan)
-            data["translation_starts"].append(np.nan)
-            data["translation_ends"].append(np.nan)
+    ## Collect transcript, exon and translation info for all IDs
+    results = list(master_dict.values())
+    df_lists = pd.concat(
+        [
+            pd.DataFrame(
+                _feature_lists(results, "Transcript", TRANSCRIPT_FIELDS),
+                columns=[
+                    "all_transcripts",
+                    "transcript_biotypes",
+                    "transcript_names",
+                    "transcript_strands",
+                    "transcript_starts",
+                    "transcript_ends",
+                ],
+            ),
+            pd.DataFrame(
+                _feature_lists(results, "Exon", EXON_FIELDS),
+                columns=["all_exons", "exon_starts", "exon_ends"],
+            ),
+            pd.DataFrame(
+                _translation_lists(results),
+                columns=["all_translations", "translation_starts", "translation_ends"],
+            ),
+        ],
+        axis=1,
+    )
+    df_lists.index = list(master_dict)
 
     # Append cleaned up info to df_final
-    df_final = pd.concat(
-        [df_final, pd.DataFrame.from_dict(data, orient="index", columns=ens_ids)]
-    )
+    df_final = pd.concat([df_final, df_lists.T])
+
+    if long_format:
+        long_tables = _feature_tables(master_dict, list(master_dict))
 
     ## Transpose data frame so each row corresponds to one Ensembl ID
     df_final = df_final.T
@@ -670,10 +673,111 @@ def info(
             with open("gget_info_results.json", "w", encoding="utf-8") as f:
                 json_package.dump(results_dict, f, ensure_ascii=False, indent=4)
 
+        if long_format:
+            long_dicts = [
+                json_package.loads(df_long.to_json(orient="records"))
+                for df_long in long_tables
+            ]
+
+            if save:
+                for feature, long_dict in zip(LONG_FORMAT_FEATURES, long_dicts):
+                    with open(f"gget_info_{feature}.json", "w", encoding="utf-8") as f:
+                        json_package.dump(long_dict, f, ensure_ascii=False, indent=4)
+
+            return (results_dict, *long_dicts)
+
         return results_dict
 
     else:
         if save:
             df_final.to_csv("gget_info_results.csv", index=False)
+            if long_format:
+                for feature, df_long in zip(LONG_FORMAT_FEATURES, long_tables):
+                    df_long.to_csv(f"gget_info_{feature}.csv", index=False)
+
+        if long_format:
+            return (df_final, *long_tables)
 
         return df_final
+
+
+def info_iter(
+    ens_ids,
+    chunk_size=1000,
+    ncbi=True,
+    uniprot=True,
+    pdb=False,
+    json=False,
+    verbose=True,
+    cache=None,
+    long_format=False,
+):
+    """
+    Fetch gene and transcript metadata using Ensembl IDs and yield the results chunk by chunk.
+    Each chunk is fully annotated (Ensembl, UniProt, NCBI and PDB) before it is yielded,
+    and the next chunk is fetched while the current one is being processed.
+
+    Args:
+    - ens_ids       One or more Ensembl IDs to look up (string or list of strings).
+                    Also supports WormBase and Flybase IDs.
+    - chunk_size    Number of IDs annotated and returned per chunk. Default: 1000.
+    - ncbi          If False, does not return data from NCBI. Default: True.
+    - uniprot       If False, does not return data from UniProt. Default: True.
+    - pdb           If True, also returns PDB IDs (might increase run time). Default: False.
+    - json          If True, yields results in json/dictionary format instead of data frames. Default: False.
+    - verbose       True/False whether to print progress information. Default True.
+    - cache         'off', 'read' or 'readwrite'. Whether server responses are read from and/or written to the
+                    persistent gget cache. Default: None -> value of environment variable GGET_CACHE, or 'off'.
+    - long_format   If True, each chunk also contains the long-format transcripts, exons and translations
+                    data frames (see gget.info). Default: False.
+
+    Yields the gget info results for each chunk of IDs (chunks in which none of the IDs were found are skipped).
+    """
+    if chunk_size < 1:
+        raise ValueError(
+            f"Argument 'chunk_size' must be a positive integer. Got: {chunk_size}"
+        )
+    cache = check_cache_mode(cache)
+
+    ens_ids_clean = _clean_ens_ids(ens_ids, verbose=verbose)
+    chunks = [
+        ens_ids_clean[i : i + chunk_size]
+        for i in range(0, len(ens_ids_clean), chunk_size)
+    ]
+
+    def fetch_chunk(chunk):
+        return info(
+            chunk,
+            ncbi=ncbi,
+            uniprot=uniprot,
+            pdb=pdb,
+            json=json,
+            verbose=verbose,
+            cache=cache,
+            long_format=long_format,
+        )
+
+    # Fetch the next chunk in the background while the current chunk is consumed
+    executor = ThreadPoolExecutor(max_workers=1)
+    future = None
+    try:
+        if chunks:
+            future = executor.submit(fetch_chunk, chunks[0])
+        for i in range(len(chunks)):
+            results = future.result()
+            if i + 1 < len(chunks):
+                future = executor.submit(fetch_chunk, chunks[i + 1])
+
+            if verbose:
+                logger.info(
+                    f"Fetched chunk {i + 1}/{len(chunks)} ({len(chunks[i])} IDs)."
+                )
+
+            if results is not None:
+                yield results
+
+    finally:
+        # Cancel the prefetched chunk if it has not started yet (e.g. the caller stopped iterating)
+        if future is not None:
+            future.cancel()
+        executor.shutdown(wait=False)
@@ -8,7 +8,13 @@ import uuid
 
 # Custom functions
 from .compile import compile_muscle, MUSCLE_PATH, PACKAGE_PATH
-from .utils import aa_colors, n_colors, create_tmp_fasta, set_up_logger
+from .utils import (
+    aa_colors,
+    n_colors,
+    create_tmp_fasta,
+    uncompressed_fasta,
+    set_up_logger,
+)
 
 logger = set_up_logger()
 
@@ -29,6 +35,7 @@ def muscle(fasta, super5=False, out=None, verbose=True):
 
     Args:
     - fasta     List of sequences or path to fasta file containing the sequences to be aligned.
+                The fasta file may be gzip (.gz) or zstd (.zst) compressed.
     - super5    True/False (default: False).
                 If True, align input using Super5 algorithm instead of PPP algorithm to decrease time and memory.
                 Use for large inputs (a few hundred sequences).
@@ -45,8 +52,9 @@ def muscle(fasta, super5=False, out=None, verbose=True):
         fasta = fasta[0]
 
     if "." in fasta:
-        abs_fasta_path = os.path.abspath(fasta)
-        fasta_provided = True
+        # Muscle only reads plain text FASTA files
+        abs_fasta_path, is_tmp = uncompressed_fasta(fasta)
+        fasta_provided = not is_tmp
     else:
         fasta_path = create_tmp_fasta(fasta)
         abs_fasta_path = os.path.abspath(fasta_path)
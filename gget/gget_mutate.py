@@ -7,7 +7,7 @@ from typing import Union, List, Optional
 
 tqdm.pandas()
 
-from .utils import read_fasta, set_up_logger
+from .utils import iter_fasta, FastaIO, FastaWriter, set_up_logger
 
 logger = set_up_logger()
 
@@ -20,6 +20,9 @@ ambiguous_position_mutations = 0
 cosmic_incorrect_wt_base = 0
 mut_idx_outside_seq = 0
 
+# Maximum number of characters gathered at once when slicing sequences
+SLICE_CHUNK_SIZE = 2**24
+
 mutation_pattern = r"(?:c|g)\.([0-9_\-\+\*]+)([a-zA-Z>]+)"  # more complex: r'c\.([0-9_\-\+\*\(\)\?]+)([a-zA-Z>\(\)0-9]+)'
 
 # Get complement
@@ -41,6 +44,17 @@ complement = {
 }
 
 
+class _ComplementTable(dict):
+    # Translation table for str.translate: characters without a complement become N
+    def __missing__(self, key):
+        return "N"
+
+
+complement_table = _ComplementTable(
+    {ord(nucleotide): comp for nucleotide, comp in complement.items()}
+)
+
+
 codon_to_amino_acid = {
     "TTT": "F",
     "TTC": "F",
@@ -175,15 +189,156 @@ def merge_gtf_transcript_locations_into_cosmic_csv(
     return merged_df
 
 
-def get_sequence_length(seq_id, seq_dict):
-    return len(seq_dict.get(seq_id, ""))
+def build_seq_dict(records):
+    """
+    Args:
+    - records   Iterable of (title, sequence) tuples.
+
+    Returns a dictionary mapping sequence identifiers to sequences and the number of
+    sequences containing non-nucleotide characters.
+    """
+    # Set of possible nucleotides (- and . are gap annotations)
+    nucleotides = set("ATGCUNatgcun.-")
 
+    seq_dict = {}
+    non_nuc_seqs = 0
+    for title, seq in records:
+        # Check that sequences are nucleotide sequences
+        if not set(seq) <= nucleotides:
+            non_nuc_seqs += 1
+
+        # Keep text following the > until the first space/dot as the sequence identifier
+        # Dots are removed so Ensembl version numbers are removed
+        seq_dict[title.split(" ")[0].split(".")[0]] = seq
 
-def get_nucleotide_at_position(seq_id, pos, seq_dict):
-    full_seq = seq_dict.get(seq_id, "")
-    if pos < len(full_seq):
-        return full_seq[pos]
-    return None
+    return seq_dict, non_nuc_seqs
+
+
+class SequenceBuffer:
+    """
+    Sequences concatenated into one byte array, so that slice_sequences can gather slices
+    from them repeatedly without concatenating and encoding the sequences on every call.
+
+    Args:
+    - sequences     List of strings.
+    - seq_ids       Optional list with the identifier of each sequence, used by SequenceBuffer.codes().
+    """
+
+    def __init__(self, sequences, seq_ids=None):
+        self.sequences = sequences
+        self.seq_ids = pd.Index(seq_ids) if seq_ids is not None else None
+        self.lengths = np.array([len(seq) for seq in sequences], dtype=np.int64)
+        self.offsets = np.concatenate(([0], np.cumsum(self.lengths)[:-1])).astype(
+            np.int64
+        )
+
+        # Filled one sequence at a time to avoid a second full-size copy of the joined text
+        self.data = np.empty(int(self.lengths.sum()), dtype=np.uint8)
+        for seq, offset, length in zip(
+            sequences, self.offsets.tolist(), self.lengths.tolist()
+        ):
+            try:
+                self.data[offset : offset + length] = np.frombuffer(
+                    seq.encode("ascii"), dtype=np.uint8
+                )
+            except UnicodeEncodeError:
+                # Byte positions only match character positions for ASCII sequences
+                self.data = None
+                break
+
+    def codes(self, seq_ids):
+        """Returns the index of each of 'seq_ids' in the buffer (-1 if not present)."""
+        return self.seq_ids.get_indexer(seq_ids)
+
+
+def slice_sequences(sequences, codes, starts, ends):
+    """
+    Vectorized equivalent of [sequences[c][s:e] for c, s, e in zip(codes, starts, ends)].
+
+    The sequences are concatenated into one byte array and all slices are gathered with
+    integer position arrays, in chunks of at most SLICE_CHUNK_SIZE characters.
+
+    Args:
+    - sequences     List of strings, or a SequenceBuffer to reuse across calls.
+    - codes         Integer array with the index into 'sequences' of each slice.
+    - starts        Integer array of slice starts (Python slice semantics, negative values allowed).
+    - ends          Integer array of slice ends (Python slice semantics, negative values allowed).
+
+    Returns a numpy object array of strings.
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+    result = np.empty(len(codes), dtype=object)
+    if len(codes) == 0:
+        return result
+
+    buffer = (
+        sequences
+        if isinstance(sequences, SequenceBuffer)
+        else SequenceBuffer(sequences)
+    )
+    data = buffer.data
+    if data is None:
+        result[:] = [
+            buffer.sequences[c][s:e]
+            for c, s, e in zip(codes.tolist(), starts.tolist(), ends.tolist())
+        ]
+        return result
+
+    lengths = buffer.lengths[codes]
+
+    # Clip positions like Python slicing does
+    starts = np.where(
+        starts < 0, np.maximum(starts + lengths, 0), np.minimum(starts, lengths)
+    )
+    ends = np.where(ends < 0, np.maximum(ends + lengths, 0), np.minimum(ends, lengths))
+    slice_lengths = np.maximum(ends - starts, 0)
+    abs_starts = buffer.offsets[codes] + starts
+
+    total_lengths = np.cumsum(slice_lengths)
+    chunk_start = 0
+    while chunk_start < len(codes):
+        done = total_lengths[chunk_start - 1] if chunk_start else 0
+        chunk_end = max(
+            int(np.searchsorted(total_lengths, done + SLICE_CHUNK_SIZE, side="right")),
+            chunk_start + 1,
+        )
+        chunk_lengths = slice_lengths[chunk_start:chunk_end]
+        out_ends = np.cumsum(chunk_lengths)
+        out_starts = out_ends - chunk_lengths
+
+        positions = np.repeat(
+            abs_starts[chunk_start:chunk_end] - out_starts, chunk_lengths
+        ) + np.arange(out_ends[-1])
+        text = data[positions].tobytes().decode("ascii")
+        result[chunk_start:chunk_end] = [
+            text[a:b] for a, b in zip(out_starts.tolist(), out_ends.tolist())
+        ]
+        chunk_start = chunk_end
+
+    return result
+
+
+def slice_mutation_sequences(mutations, seq_buffer, seq_id_column, starts, ends):
+    """
+    Args:
+    - mutations       DataFrame of mutations.
+    - seq_buffer      SequenceBuffer with the reference sequences of all mutations and their identifiers.
+    - seq_id_column   Name of the column containing the sequence identifiers.
+    - starts/ends     Integer arrays with the slice bounds for each row of 'mutations'.
+
+    Returns a numpy object array with the slice of the reference sequence of each mutation.
+    """
+    return slice_sequences(
+        seq_buffer, seq_buffer.codes(mutations[seq_id_column]), starts, ends
+    )
+
+
+def slice_strings(strings, starts, ends):
+    """Vectorized equivalent of [x[s:e] for x, s, e in zip(strings, starts, ends)]."""
+    strings = list(strings)
+    return slice_sequences(strings, np.arange(len(strings)), starts, ends)
 
 
 def translate_sequence(sequence, start, end):
@@ -261,15 +416,6 @@ def add_mutation_type(mutations, mut_column):
     return mutations
 
 
-def extract_sequence(row, seq_dict, seq_id_column="seq_ID"):
-    if pd.isna(row["start_mutation_position"]) or pd.isna(row["end_mutation_position"]):
-        return None
-    seq = seq_dict[row[seq_id_column]][
-        int(row["start_mutation_position"]) : int(row["end_mutation_position"]) + 1
-    ]
-    return seq
-
-
 def common_prefix_length(s1, s2):
     min_len = min(len(s1), len(s2))
     for i in range(min_len):
@@ -320,34 +466,42 @@ def end_mut_nucleotides_with_left_flank(mut_nucleotides, left_flank_region):
         return common_suffix_length(mut_nucleotides, left_flank_region)
 
 
-def calculate_beginning_mutation_overlap_with_right_flank(row):
-    if row["mutation_type"] == "deletion":
-        sequence_to_check = row["wt_nucleotides_ensembl"]
-    else:
-        sequence_to_check = row["mut_nucleotides"]
+def calculate_mutation_flank_overlaps(mutations):
+    """
+    Args:
+    - mutations     DataFrame of non-substitution mutations with flank regions.
 
-    if row["mutation_type"] == "delins" or row["mutation_type"] == "inversion":
-        original_sequence = row["wt_nucleotides_ensembl"] + row["right_flank_region"]
-    else:
-        original_sequence = row["right_flank_region"]
+    Returns two lists: the overlap of the beginning of the mutated (or deleted) nucleotides with the
+    right flank, and the overlap of their end with the left flank, for each mutation.
+    """
+    deletion = (mutations["mutation_type"] == "deletion").values
+    replaces_wt = mutations["mutation_type"].isin(["delins", "inversion"]).values
 
-    return beginning_mut_nucleotides_with_right_flank(
-        sequence_to_check, original_sequence
+    sequences_to_check = np.where(
+        deletion,
+        mutations["wt_nucleotides_ensembl"].values,
+        mutations["mut_nucleotides"].values,
+    )
+    right_sequences = np.where(
+        replaces_wt,
+        (mutations["wt_nucleotides_ensembl"] + mutations["right_flank_region"]).values,
+        mutations["right_flank_region"].values,
+    )
+    left_sequences = np.where(
+        replaces_wt,
+        (mutations["left_flank_region"] + mutations["wt_nucleotides_ensembl"]).values,
+        mutations["left_flank_region"].values,
     )
 
-
-def calculate_end_mutation_overlap_with_left_flank(row):
-    if row["mutation_type"] == "deletion":
-        sequence_to_check = row["wt_nucleotides_ensembl"]
-    else:
-        sequence_to_check = row["mut_nucleotides"]
-
-    if row["mutation_type"] == "delins" or row["mutation_type"] == "inversion":
-        original_sequence = row["left_flank_region"] + row["wt_nucleotides_ensembl"]
-    else:
-        original_sequence = row["left_flank_region"]
-
-    return end_mut_nucleotides_with_left_flank(sequence_to_check, original_sequence)
+    beginning_overlaps = [
+        beginning_mut_nucleotides_with_right_flank(seq, right)
+        for seq, right in zip(sequences_to_check, right_sequences)
+    ]
+    end_overlaps = [
+        end_mut_nucleotides_with_left_flank(seq, left)
+        for seq, left in zip(sequences_to_check, left_sequences)
+    ]
+    return beginning_overlaps, end_overlaps
 
 
 def mutate(
@@ -393,6 +547,9 @@ def mutate(
                     NOTE: Only the letters until the first space or dot will be used as sequence identifiers
                     - Version numbers of Ensembl IDs will be ignored.
                     NOTE: When 'sequences' input is a genome, also see 'gtf' argument below.
+                    NOTE: FASTA files may be gzip (.gz) or zstd (.zst) compressed. Plain text and bgzip-compressed
+                    files are indexed with a samtools-compatible .fai file saved next to the input,
+                    and only the sequences referenced in 'mutations' are loaded.
 
     - mutations     Path to csv or tsv file (str) (e.g., 'mutations.csv') or data frame (DataFrame object)
                     containing information about the mutations in the following format:
@@ -455,6 +612,7 @@ def mutate(
 
     # General arguments:
     - out                          (str) Path to output fasta file containing the mutated sequences, e.g., 'path/to/output_fasta.fa'.
+                                   The file is compressed if the path ends with .gz or .zst.
                                    Default: None -> returns a list of the mutated sequences to standard out.
                                    The identifiers (following the '>') of the mutated sequences in the output fasta will be '>[seq_ID]_[mut_ID]'.
     - verbose                      (True/False) whether to print progress information. Default: True
@@ -475,19 +633,26 @@ def mutate(
         "end_mutation_position"
     ]
 
-    # Load input sequences and their identifiers from fasta file
+    # Index the fasta file so that only the sequences referenced in 'mutations' are loaded later
+    # (the index is reopened once 'mutations' was parsed)
+    indexed = False
     if "." in sequences:
-        titles, seqs = read_fasta(sequences)
+        try:
+            with FastaIO.index(sequences) as fasta_index:
+                n_seqs = len(fasta_index)
+            indexed = True
+        except ValueError as e:
+            # Fall back to streaming all records (e.g. for files with irregular line lengths)
+            logger.debug(f"Could not index {sequences}: {e}")
+            records = iter_fasta(sequences)
 
     # Handle input sequences passed as a list
     elif isinstance(sequences, list):
-        titles = [f"seq{i+1}" for i in range(len(sequences))]
-        seqs = sequences
+        records = ((f"seq{i+1}", seq) for i, seq in enumerate(sequences))
 
     # Handle a single sequence passed as a string
     elif isinstance(sequences, str):
-        titles = ["seq1"]
-        seqs = [sequences]
+        records = [("seq1", sequences)]
 
     else:
         raise ValueError(
@@ -500,6 +665,10 @@ def mutate(
             """
         )
 
+    if not indexed:
+        seq_dict, non_nuc_seqs = build_seq_dict(records)
+        n_seqs = len(seq_dict)
+
     mutations_path = None
 
     # Read in 'mutations' if passed as filepath to comma-separated csv
@@ -524,7 +693,7 @@ def mutate(
     # Handle mutations passed as a list
     elif isinstance(mutations, list):
         if len(mutations) > 1:
-            if len(mutations) != len(seqs):
+            if len(mutations) != n_seqs:
                 raise ValueError(
                     "If a list is passed, the number of mutations must equal the number of input sequences."
                 )
@@ -536,18 +705,18 @@ def mutate(
             mutations = temp
         else:
             temp = pd.DataFrame()
-            temp["mutation"] = [mutations[0]] * len(seqs)
-            temp["mut_ID"] = [f"mut{i+1}" for i in range(len(seqs))]
-            temp["seq_ID"] = [f"seq{i+1}" for i in range(len(seqs))]
+            temp["mutation"] = [mutations[0]] * n_seqs
+            temp["mut_ID"] = [f"mut{i+1}" for i in range(n_seqs)]
+            temp["seq_ID"] = [f"seq{i+1}" for i in range(n_seqs)]
             mutations = temp
 
     # Handle single mutation passed as a string
     elif isinstance(mutations, str):
         # This will work for one mutation for one sequence as well as one mutation for multiple sequences
         temp = pd.DataFrame()
-        temp["mutation"] = [mutations] * len(seqs)
-        temp["mut_ID"] = [f"mut{i+1}" for i in range(len(seqs))]
-        temp["seq_ID"] = [f"seq{i+1}" for i in range(len(seqs))]
+        temp["mutation"] = [mutations] * n_seqs
+        temp["mut_ID"] = [f"mut{i+1}" for i in range(n_seqs)]
+        temp["seq_ID"] = [f"seq{i+1}" for i in range(n_seqs)]
         mutations = temp
 
     elif isinstance(mutations, pd.DataFrame):
@@ -565,28 +734,6 @@ def mutate(
             """
         )
 
-    # Set of possible nucleotides (- and . are gap annotations)
-    nucleotides = set("ATGCUNatgcun.-")
-
-    seq_dict = {}
-    non_nuc_seqs = 0
-    for title, seq in zip(titles, seqs):
-        # Check that sequences are nucleotide sequences
-        if not set(seq) <= nucleotides:
-            non_nuc_seqs += 1
-
-        # Keep text following the > until the first space/dot as the sequence identifier
-        # Dots are removed so Ensembl version numbers are removed
-        seq_dict[title.split(" ")[0].split(".")[0]] = seq
-
-    if non_nuc_seqs > 0:
-        logger.warning(
-            f"""
-            Non-nucleotide characters detected in {non_nuc_seqs} input sequences. gget mutate is currently only optimized for mutating nucleotide sequences.
-            Specifically inversion mutations might not be performed correctly. 
-            """
-        )
-
     number_of_missing_seq_ids = mutations[seq_id_column].isna().sum()
 
     if number_of_missing_seq_ids > 0:
@@ -604,6 +751,24 @@ def mutate(
         convert_chromosome_value_to_int_when_possible
     )
 
+    if indexed:
+        # Only load the sequences referenced in 'mutations'
+        seq_ids = set(mutations[seq_id_column])
+        with FastaIO.index(sequences) as fasta_index:
+            seq_dict, non_nuc_seqs = build_seq_dict(
+                (name, fasta_index.fetch(name))
+                for name in fasta_index
+                if name.split(".")[0] in seq_ids
+            )
+
+    if non_nuc_seqs > 0:
+        logger.warning(
+            f"""
+            Non-nucleotide characters detected in {non_nuc_seqs} input sequences. gget mutate is currently only optimized for mutating nucleotide sequences.
+            Specifically inversion mutations might not be performed correctly. 
+            """
+        )
+
     mutations = add_mutation_type(mutations, mut_column)
 
     # Link sequences to their mutations using the sequence identifiers
@@ -700,8 +865,9 @@ def mutate(
     mutations["end_mutation_position"] -= 1  # don't forget to increment by 1 later
 
     # Calculate sequence length
-    mutations["sequence_length"] = mutations[seq_id_column].apply(
-        lambda x: get_sequence_length(x, seq_dict)
+    seq_lengths = {seq_id: len(seq) for seq_id, seq in seq_dict.items()}
+    mutations["sequence_length"] = (
+        mutations[seq_id_column].map(seq_lengths).fillna(0).astype(int)
     )
 
     # Filter out mutations with positions outside the sequence
@@ -717,6 +883,12 @@ def mutate(
         logger.warning("No valid mutations found in the input.")
         return mutations if update_df else []
 
+    # Concatenate the reference sequences of the remaining mutations once for all slices below
+    seq_ids = mutations[seq_id_column].unique()
+    seq_buffer = SequenceBuffer(
+        [seq_dict.get(seq_id, "") for seq_id in seq_ids], seq_ids
+    )
+
     # Create masks for each type of mutation
     mutations["wt_nucleotides_ensembl"] = None
     substitution_mask = mutations["mutation_type"] == "substitution"
@@ -758,16 +930,22 @@ def mutate(
 
     # Extract the WT nucleotides for the substitution rows from reference fasta (i.e., Ensembl)
     start_positions = mutations.loc[substitution_mask, "start_mutation_position"].values
+    sequence_lengths = mutations.loc[substitution_mask, "sequence_length"].values
 
-    # Get the nucleotides at the start positions
-    wt_nucleotides_substitution = np.array(
-        [
-            get_nucleotide_at_position(seq_id, pos, seq_dict)
-            for seq_id, pos in zip(
-                mutations.loc[substitution_mask, seq_id_column], start_positions
-            )
-        ]
+    # Get the nucleotides at the start positions (None for positions past the end of the sequence)
+    start_positions = np.where(
+        start_positions < 0, start_positions + sequence_lengths, start_positions
     )
+    wt_nucleotides_substitution = slice_mutation_sequences(
+        mutations.loc[substitution_mask],
+        seq_buffer,
+        seq_id_column,
+        start_positions,
+        start_positions + 1,
+    )
+    wt_nucleotides_substitution[
+        (start_positions < 0) | (start_positions >= sequence_lengths)
+    ] = None
 
     mutations.loc[substitution_mask, "wt_nucleotides_ensembl"] = (
         wt_nucleotides_substitution
@@ -802,9 +980,15 @@ def mutate(
     ] -= 1  # in this notation, the end position is one before the start position
 
     # Extract the WT nucleotides for the non-substitution rows from the Mutation CDS (i.e., COSMIC)
-    mutations.loc[non_substitution_mask, "wt_nucleotides_ensembl"] = mutations.loc[
-        non_substitution_mask
-    ].apply(lambda row: extract_sequence(row, seq_dict, seq_id_column), axis=1)
+    mutations.loc[non_substitution_mask, "wt_nucleotides_ensembl"] = (
+        slice_mutation_sequences(
+            mutations.loc[non_substitution_mask],
+            seq_buffer,
+            seq_id_column,
+            mutations.loc[non_substitution_mask, "start_mutation_position"].values,
+            mutations.loc[non_substitution_mask, "end_mutation_position"].values + 1,
+        )
+    )
 
     # Apply mutations to the sequences
     mutations["mut_nucleotides"] = None
@@ -819,16 +1003,14 @@ def mutate(
         insertion_mask, "actual_mutation"
     ].str.extract(r"ins([A-Z]+)")[0]
     mutations.loc[duplication_mask, "mut_nucleotides"] = mutations.loc[
-        duplication_mask
-    ].apply(lambda row: row["wt_nucleotides_ensembl"], axis=1)
-    mutations.loc[inversion_mask, "mut_nucleotides"] = mutations.loc[
-        inversion_mask
-    ].apply(
-        lambda row: "".join(
-            complement.get(nucleotide, "N")
-            for nucleotide in row["wt_nucleotides_ensembl"][::-1]
-        ),
-        axis=1,
+        duplication_mask, "wt_nucleotides_ensembl"
+    ]
+    # Reverse complement of the inverted WT nucleotides
+    mutations.loc[inversion_mask, "mut_nucleotides"] = (
+        mutations.loc[inversion_mask, "wt_nucleotides_ensembl"]
+        .astype(object)
+        .str[::-1]
+        .str.translate(complement_table)
     )
 
     # Adjust the nucleotide positions of duplication mutations to mimic that of insertions (since duplications are essentially just insertions)
@@ -886,47 +1068,40 @@ def mutate(
         else mutations.apply
     )
 
-    if update_df and store_full_sequences:
-        # Extract flank sequences
-        if verbose:
-            tqdm.pandas(desc="Extracting full left flank sequences")
-
-        mutations["left_flank_region_full"] = mut_apply(
-            lambda row: seq_dict[row[seq_id_column]][
-                0 : row["start_mutation_position"]
-            ],
-            axis=1,
-        )  # ? vectorize
-
-        if verbose:
-            tqdm.pandas(desc="Extracting full right flank sequences")
-
-        mutations["right_flank_region_full"] = mut_apply(
-            lambda row: seq_dict[row[seq_id_column]][
-                row["end_mutation_position"] + 1 : row["sequence_length"]
-            ],
-            axis=1,
-        )  # ? vectorize
-
-    if verbose:
-        tqdm.pandas(desc="Extracting k-mer left flank sequences")
-
-    mutations["left_flank_region"] = mut_apply(
-        lambda row: seq_dict[row[seq_id_column]][
-            row["start_kmer_position"] : row["start_mutation_position"]
-        ],
-        axis=1,
-    )  # ? vectorize
+    # Extract flank sequences for all mutations at once
+    start_mutation_positions = mutations["start_mutation_position"].values
+    end_mutation_positions = mutations["end_mutation_position"].values
 
-    if verbose:
-        tqdm.pandas(desc="Extracting k-mer right flank sequences")
+    if update_df and store_full_sequences:
+        mutations["left_flank_region_full"] = slice_mutation_sequences(
+            mutations,
+            seq_buffer,
+            seq_id_column,
+            np.zeros(len(mutations), dtype=np.int64),
+            start_mutation_positions,
+        )
+        mutations["right_flank_region_full"] = slice_mutation_sequences(
+            mutations,
+            seq_buffer,
+            seq_id_column,
+            end_mutation_positions + 1,
+            mutations["sequence_length"].values,
+        )
 
-    mutations["right_flank_region"] = mut_apply(
-        lambda row: seq_dict[row[seq_id_column]][
-            row["end_mutation_position"] + 1 : row["end_kmer_position"] + 1
-        ],
-        axis=1,
-    )  # ? vectorize
+    mutations["left_flank_region"] = slice_mutation_sequences(
+        mutations,
+        seq_buffer,
+        seq_id_column,
+        mutations["start_kmer_position"].values.astype(np.int64),
+        start_mutation_positions,
+    )
+    mutations["right_flank_region"] = slice_mutation_sequences(
+        mutations,
+        seq_buffer,
+        seq_id_column,
+        end_mutation_positions + 1,
+        mutations["end_kmer_position"].values.astype(np.int64) + 1,
+    )
 
     mutations["beginning_mutation_overlap_with_right_flank"] = 0
     mutations["end_mutation_overlap_with_left_flank"] = 0
@@ -944,26 +1119,24 @@ def mutate(
     # To what extend the end of i overlaps with the beginning of d --> shave up to that many nucleotides off the end of r2 until k - len(r2) ≥ extent of overlap
 
     if optimize_flanking_regions:
-        # Apply the function for beginning of mut_nucleotides with right_flank_region
+        # Overlap of the beginning of mut_nucleotides with right_flank_region
+        # and of the end of mut_nucleotides with left_flank_region
+        beginning_overlaps, end_overlaps = calculate_mutation_flank_overlaps(
+            mutations.loc[non_substitution_mask]
+        )
         mutations.loc[
             non_substitution_mask, "beginning_mutation_overlap_with_right_flank"
-        ] = mutations.loc[non_substitution_mask].apply(
-            calculate_beginning_mutation_overlap_with_right_flank, axis=1
-        )
-
-        # Apply the function for end of mut_nucleotides with left_flank_region
+        ] = beginning_overlaps
         mutations.loc[non_substitution_mask, "end_mutation_overlap_with_left_flank"] = (
-            mutations.loc[non_substitution_mask].apply(
-                calculate_end_mutation_overlap_with_left_flank, axis=1
-            )
+            end_overlaps
         )
 
         # Calculate k-len(flank) (see above instructions)
         mutations.loc[non_substitution_mask, "k_minus_left_flank_length"] = (
-            k - mutations.loc[non_substitution_mask, "left_flank_region"].apply(len)
+            k - mutations.loc[non_substitution_mask, "left_flank_region"].str.len()
         )
         mutations.loc[non_substitution_mask, "k_minus_right_flank_length"] = (
-            k - mutations.loc[non_substitution_mask, "right_flank_region"].apply(len)
+            k - mutations.loc[non_substitution_mask, "right_flank_region"].str.len()
         )
 
         mutations.loc[non_substitution_mask, "updated_left_flank_start"] = np.maximum(
@@ -997,16 +1170,27 @@ def mutate(
         + mutations.loc[substitution_mask, "right_flank_region"]
     )
 
+    # Shave the flanks of non-substitution k-mers (see above instructions)
+    left_flank_regions = mutations.loc[non_substitution_mask, "left_flank_region"]
+    right_flank_regions = mutations.loc[non_substitution_mask, "right_flank_region"]
+    if optimize_flanking_regions:
+        left_flank_regions = slice_strings(
+            left_flank_regions.values,
+            mutations.loc[non_substitution_mask, "updated_left_flank_start"].values,
+            left_flank_regions.str.len().values,
+        )
+        right_flank_regions = slice_strings(
+            right_flank_regions.values,
+            np.zeros(len(right_flank_regions), dtype=np.int64),
+            right_flank_regions.str.len().values
+            - mutations.loc[non_substitution_mask, "updated_right_flank_end"].values,
+        )
+
     # Create WT non-substitution k-mer sequences
-    mutations.loc[non_substitution_mask, "wt_sequence"] = mutations.loc[
-        non_substitution_mask
-    ].apply(
-        lambda row: row["left_flank_region"][row["updated_left_flank_start"] :]
-        + row["wt_nucleotides_ensembl"]
-        + row["right_flank_region"][
-            : len(row["right_flank_region"]) - row["updated_right_flank_end"]
-        ],
-        axis=1,
+    mutations.loc[non_substitution_mask, "wt_sequence"] = (
+        left_flank_regions
+        + mutations.loc[non_substitution_mask, "wt_nucleotides_ensembl"]
+        + right_flank_regions
     )
 
     # Create mutant substitution k-mer sequences
@@ -1017,31 +1201,23 @@ def mutate(
     )
 
     # Create mutant non-substitution k-mer sequences
-    mutations.loc[non_substitution_mask, "mutant_sequence"] = mutations.loc[
-        non_substitution_mask
-    ].apply(
-        lambda row: row["left_flank_region"][row["updated_left_flank_start"] :]
-        + row["mut_nucleotides"]
-        + row["right_flank_region"][
-            : len(row["right_flank_region"]) - row["updated_right_flank_end"]
-        ],
-        axis=1,
+    mutations.loc[non_substitution_mask, "mutant_sequence"] = (
+        left_flank_regions
+        + mutations.loc[non_substitution_mask, "mut_nucleotides"]
+        + right_flank_regions
     )
 
     if remove_seqs_with_wt_kmers:
-        if verbose:
-            tqdm.pandas(
-                desc="Removing mutant fragments that share a kmer with wt fragments"
-            )
-
-        mutations["wt_fragment_and_mutant_fragment_share_kmer"] = mut_apply(
-            lambda row: wt_fragment_and_mutant_fragment_share_kmer(
-                mutated_fragment=row["mutant_sequence"],
-                wildtype_fragment=row["wt_sequence"],
+        mutations["wt_fragment_and_mutant_fragment_share_kmer"] = [
+            wt_fragment_and_mutant_fragment_share_kmer(
+                mutated_fragment=mutant_sequence,
+                wildtype_fragment=wt_sequence,
                 k=k + 1,
-            ),
-            axis=1,
-        )
+            )
+            for mutant_sequence, wt_sequence in zip(
+                mutations["mutant_sequence"].values, mutations["wt_sequence"].values
+            )
+        ]
 
         mutations_overlapping_with_wt = mutations[
             "wt_fragment_and_mutant_fragment_share_kmer"
@@ -1060,8 +1236,8 @@ def mutate(
         )
 
     # Calculate k-mer lengths and report the distribution
-    mutations["mutant_sequence_kmer_length"] = mutations["mutant_sequence"].apply(
-        lambda x: len(x) if pd.notna(x) else 0
+    mutations["mutant_sequence_kmer_length"] = (
+        mutations["mutant_sequence"].str.len().fillna(0).astype(int)
     )
 
     max_length = mutations["mutant_sequence_kmer_length"].max()
@@ -1323,14 +1499,14 @@ def mutate(
             mutations.to_csv(update_df_out, index=False)
             print(f"Updated mutation info has been saved to {update_df_out}")
 
-    mutations["fasta_format"] = (
-        ">" + mutations["header"] + "\n" + mutations["mutant_sequence"] + "\n"
-    )
-
     if out:
-        # Save mutated sequences in new fasta file
-        with open(out, "w") as fasta_file:
-            fasta_file.write("".join(mutations["fasta_format"].values))
+        # Save mutated sequences in new fasta file (one line per sequence),
+        # streaming them through a buffered writer instead of joining them into one string
+        with FastaWriter(out, line_width=None) as writer:
+            for header, mutant_sequence in zip(
+                mutations["header"].values, mutations["mutant_sequence"].values
+            ):
+                writer.write_record(header, mutant_sequence)
 
         if verbose:
             logger.info(f"FASTA file containing mutated sequences created at {out}.")
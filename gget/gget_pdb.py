@@ -1,8 +1,6 @@
-from urllib.request import urlopen
-from urllib.error import HTTPError
 import json
 
-from .utils import set_up_logger
+from .utils import set_up_logger, http_get
 
 logger = set_up_logger()
 
@@ -92,22 +90,12 @@ def pdb(pdb_id, resource="pdb", identifier=None, save=False):
 
     # Submit URL request with fallback logic
     r = None
-    last_error = None
     code = None
     for url in urls:
-        try:
-            r = urlopen(url)
-
-            # Get status code (in a way that is stable across Python versions)
-            code = getattr(r, "status", None)
-            if code is None:
-                code = r.getcode()
-
-            if code == 200:
-                break
-        except HTTPError as e:
-            last_error = e
-            continue
+        r = http_get(url)
+        code = r.status_code
+        if code == 200:
+            break
 
     if r is None or code != 200:
         if resource == "assembly":
@@ -130,10 +118,10 @@ def pdb(pdb_id, resource="pdb", identifier=None, save=False):
 
     if resource != "pdb":
         # Read json formatted results
-        results = json.load(r)
+        results = r.json()
     else:
         # Read PDB file
-        results = r.read().decode()
+        results = r.text
 
     if save:
         if resource != "pdb":
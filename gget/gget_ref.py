@@ -1,6 +1,5 @@
-from bs4 import BeautifulSoup
-import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
 
 # Custom functions
 from .utils import (
@@ -8,39 +7,42 @@ from .utils import (
     find_latest_ens_rel,
     find_nv_kingdom,
     set_up_logger,
+    get_ens_ftp_table,
+    get_ens_checksums,
+    download_file,
 )
 
 logger = set_up_logger()
 
+# Keys of the results dictionary for each file type and their order for which="all"
+REF_DICT_KEYS = {
+    "cdna": "transcriptome_cdna",
+    "dna": "genome_dna",
+    "gtf": "annotation_gtf",
+    "cds": "coding_seq_cds",
+    "ncrna": "non-coding_seq_ncRNA",
+    "pep": "protein_translation_pep",
+}
+REF_DICT_ORDER = ["cdna", "dna", "gtf", "cds", "ncrna", "pep"]
+# Order of the links for which="all" and ftp=True
+REF_FTP_ORDER = ["gtf", "cdna", "dna", "cds", "ncrna", "pep"]
+# Maximum number of species whose links are fetched at the same time
+REF_MAX_WORKERS = 8
+# Maximum number of files downloaded at the same time
+REF_DOWNLOAD_MAX_WORKERS = 4
+
 from .constants import ENSEMBL_FTP_URL, ENSEMBL_FTP_URL_NV, ENSEMBL_FTP_URL_GRCH37
 
 
-def find_FTP_link(url, link_substring):
+def _parse_FTP_link(links, link_substring):
     """
-    Helper function for gget ref to find an FTP link, its release date and size.
-
-    Args:
-    url             - URL link to FTP subfolder (e.g. GTF) including species and release
-    link_to_find    - Unique substring to identify link to find
-
-    Returns the link, date, and size as strings.
+    Find the (last) link containing link_substring in the table cells of an FTP page
+    and return the link, date, and size as strings (None if not found).
     """
-    html = requests.get(url)
-
-    # Raise error if status code not "OK" Response
-    if html.status_code != 200:
-        raise RuntimeError(
-            f"HTTP response status code {html.status_code}. Please try again.\n"
-        )
-
-    soup = BeautifulSoup(html.text, "html.parser")
-
     link_str = None
     date_str = None
     size_str = None
 
-    # Get all entries from the website
-    links = [stuff.text.strip() for stuff in soup.findAll("td")]
     for i, link in enumerate(links):
         # Find the correct link
         if link_substring in link:
@@ -52,6 +54,204 @@ def find_FTP_link(url, link_substring):
     return link_str, date_str, size_str
 
 
+def _find_ref_link(database, release, folder, link_substrings, required=True):
+    """
+    Helper function for gget ref to find the FTP link, release date and size of a reference file.
+    The FTP pages are memoized per (database, release, folder) (see get_ens_ftp_table).
+
+    Args:
+    - database          Link to Ensembl database.
+    - release           Ensembl release number.
+    - folder            Folder within the release, e.g. 'fasta/homo_sapiens/dna'.
+    - link_substrings   Substrings identifying the link, tried in order (e.g. primary assembly before toplevel).
+    - required          If False, a missing folder is treated as the file not being available.
+
+    Returns the link, date and size as strings (empty if the file is not available).
+    """
+    links = get_ens_ftp_table(database, release, folder)
+
+    if links is None:
+        # Raise error if the folder does not exist
+        if required:
+            raise RuntimeError("HTTP response status code 404. Please try again.\n")
+        links = []
+
+    search_url = database + f"release-{release}/{folder}/"
+    for link_substring in link_substrings:
+        link_str, date_str, size_str = _parse_FTP_link(links, link_substring)
+        # Build the final download link
+        if link_str is not None:
+            return search_url + link_str, date_str, size_str
+
+    return "", " ", ""
+
+
+def _resolve_ref_species(species, release=None):
+    """
+    Helper function for gget ref to find the Ensembl database, release and kingdom of a species
+    (raises an error if the species is not available).
+    The species listings and release numbers are memoized, so resolving several species only fetches them once.
+
+    Returns the (cleaned) species, database, release, whether the GRCh37 assembly is used, and kingdom (None for vertebrates).
+    """
+    # Species shortcuts
+    grch37 = False
+    if species == "human":
+        species = "homo_sapiens"
+    if species == "mouse":
+        species = "mus_musculus"
+    if species == "human_grch37":
+        species = "homo_sapiens"
+        grch37 = True
+
+    # In case species was passed with upper case letters
+    species = species.lower()
+
+    # GRCh37 database (releases same as standard database)
+    if grch37:
+        database = ENSEMBL_FTP_URL_GRCH37
+        ENS_rel = find_latest_ens_rel(ENSEMBL_FTP_URL)
+    # Standard database
+    elif species in ref_species_options(
+        "dna", database=ENSEMBL_FTP_URL, release=release
+    ):
+        database = ENSEMBL_FTP_URL
+        # Find latest vertebrate Ensembl release
+        ENS_rel = find_latest_ens_rel(database)
+    # For non-vertebrates, switch to non-vertebrate databases
+    else:
+        database = ENSEMBL_FTP_URL_NV
+        # Find latest NV Ensembl release
+        ENS_rel = find_latest_ens_rel(database)
+
+    # If release != None, use user-defined Ensembl release
+    if release != None:
+        # Warn user when release is higher than the latest release
+        if release > ENS_rel:
+            logger.warning(
+                f"Provided Ensembl release number {release} is greater than the latest release ({ENS_rel})."
+            )
+        ENS_rel = release
+
+    if not grch37:
+        ## Raise error if species not found (both FASTA and GTF have to be available)
+        # Find all available species for genome FASTAs for this Ensembl release
+        species_list_dna = ref_species_options(
+            "dna", database=database, release=ENS_rel
+        )
+        # Find all available species for GTFs for this Ensembl release
+        species_list_gtf = ref_species_options(
+            "gtf", database=database, release=ENS_rel
+        )
+        # Find intersection of the two lists
+        # (Only species which have GTF and FASTAs available can continue)
+        species_list = list(set(species_list_gtf) & set(species_list_dna))
+
+        if species not in species_list:
+            raise ValueError(
+                f"Species does not match any available species for Ensembl release {ENS_rel}. Please double-check spelling.\n"
+                "'gget ref --list_species' -> lists out all available species (Python: 'gget.ref(None, list_species=True)').\n"
+                "Combine with `release` argument to define specific Ensembl release (default: latest).\n"
+            )
+
+    ## Find kingdom for non-vertebrate species
+    if database == ENSEMBL_FTP_URL_NV:
+        kingdom = find_nv_kingdom(species, release=ENS_rel)
+    else:
+        kingdom = None
+
+    return species, database, ENS_rel, grch37, kingdom
+
+
+def _find_ref_links(species, which, database, ENS_rel, grch37, kingdom):
+    """
+    Helper function for gget ref to find the FTP links, release dates and sizes of the requested file types.
+
+    Returns a dictionary mapping each requested file type (e.g. 'gtf') to its link, date and size.
+    """
+    ## Define the FTP folder and link substrings of each requested file type
+    if database == ENSEMBL_FTP_URL_NV:
+        gtf_folder = f"{kingdom}/gtf/{species}"
+        fasta_folder = f"{kingdom}/fasta/{species}"
+    else:
+        gtf_folder = f"gtf/{species}"
+        fasta_folder = f"fasta/{species}"
+
+    if grch37:
+        gtf_substring = "GRCh37.87.gtf.gz"
+    else:
+        gtf_substring = f"{ENS_rel}.gtf.gz"
+
+    link_specs = {
+        "gtf": (gtf_folder, [gtf_substring]),
+        "cdna": (f"{fasta_folder}/cdna", ["cdna.all.fa"]),
+        # Get toplevel if primary assembly not available
+        "dna": (
+            f"{fasta_folder}/dna",
+            [".dna.primary_assembly.fa", ".dna.toplevel.fa"],
+        ),
+        "cds": (f"{fasta_folder}/cds", ["cds.all.fa"]),
+        "ncrna": (f"{fasta_folder}/ncrna", [".ncrna.fa"]),
+        "pep": (f"{fasta_folder}/pep", [".pep.all.fa"]),
+    }
+    if "all" not in which:
+        link_specs = {key: link_specs[key] for key in which}
+
+    ## Get links, release dates and dataset sizes for this species and release
+    # The FTP pages of the different file types are fetched concurrently
+    with ThreadPoolExecutor(max_workers=len(link_specs)) as executor:
+        futures = {
+            key: executor.submit(
+                _find_ref_link,
+                database,
+                ENS_rel,
+                folder,
+                link_substrings,
+                # If ncRNA data is not available, the ncRNA folder does not exist
+                required=key != "ncrna",
+            )
+            for key, (folder, link_substrings) in link_specs.items()
+        }
+        links = {key: future.result() for key, future in futures.items()}
+
+    return links
+
+
+def _download_refs(urls, out_dir=None, decompress=False, verbose=True):
+    """
+    Helper function for gget ref to download the reference files in parallel
+    and verify them against the CHECKSUMS file of their Ensembl FTP folder.
+
+    Returns the list of paths to the downloaded files.
+    """
+    urls = list(dict.fromkeys(url for url in urls if url))
+
+    # Fetch the CHECKSUMS file of each FTP folder once
+    folders = list(dict.fromkeys(url.rsplit("/", 1)[0] + "/" for url in urls))
+    with ThreadPoolExecutor(max_workers=max(len(folders), 1)) as executor:
+        checksums = dict(zip(folders, executor.map(get_ens_checksums, folders)))
+
+    def download(url):
+        folder, filename = url.rsplit("/", 1)
+        checksum = checksums[folder + "/"].get(filename)
+        if checksum is None and verbose:
+            logger.warning(
+                f"No checksum found for {url}. The file will not be verified."
+            )
+        return download_file(
+            url,
+            out_dir=out_dir,
+            checksum=checksum,
+            decompress=decompress,
+            verbose=verbose,
+        )
+
+    with ThreadPoolExecutor(
+        max_workers=max(min(len(urls), REF_DOWNLOAD_MAX_WORKERS), 1)
+    ) as executor:
+        return list(executor.map(download, urls))
+
+
 def ref(
     species,
     which="all",
@@ -61,6 +261,9 @@ def ref(
     list_species=False,
     list_iv_species=False,
     verbose=True,
+    download=False,
+    out_dir=None,
+    decompress=False,
 ):
     """
     Fetch FTPs for reference genomes and annotations by species from Ensembl.
@@ -68,6 +271,8 @@ def ref(
     Args:
     - species         Defines the species for which the reference should be fetched in the format "<genus>_<species>",
                       e.g. species = "homo_sapiens".
+                      Pass a list of species, e.g. species = ["homo_sapiens", "mus_musculus"], to fetch the
+                      references of several species at once (results are merged into one dictionary/list).
                       Supported shortcuts: "human", "mouse", "human_grch37" (accesses the GRCh37 genome assembly)
     - which           Defines which results to return.
                       Default: 'all' -> Returns all available results.
@@ -87,8 +292,13 @@ def ref(
     - list_iv_species If True and `species=None`, returns a list of all available INVERTEBRATE species from the Ensembl database (default: False).
                       (Can be combined with the `release` argument to get the available species from a specific Ensembl release.)
     - verbose         True/False whether to print progress information (default: True).
+    - download        If True, downloads the requested files to out_dir (default: False).
+                      Files are downloaded in parallel, interrupted downloads are resumed, and each file is
+                      verified against the CHECKSUMS file of its Ensembl FTP folder.
+    - out_dir         Directory the files are downloaded to (default: None -> current working directory).
+    - decompress      If True, downloaded .gz files are decompressed into out_dir (default: False).
 
-    Returns a dictionary containing the requested URLs with their respective Ensembl version and release date and time.
+    Returns a dictionary (with one entry per species) containing the requested URLs with their respective Ensembl version and release date and time.
     (If FTP=True, returns a list containing only the URLs.)
     """
     # Return list of all available species
@@ -168,386 +378,78 @@ def ref(
             f"Parameter 'which' must be 'all', or any one or a combination of the following: 'gtf', 'cdna', 'dna', 'cds', 'ncrna', 'pep'.\n"
         )
 
-    # Species shortcuts
-    grch37 = False
-    if species == "human":
-        species = "homo_sapiens"
-    if species == "mouse":
-        species = "mus_musculus"
-    if species == "human_grch37":
-        species = "homo_sapiens"
-        grch37 = True
-
-    # In case species was passed with upper case letters
-    species = species.lower()
-
-    # GRCh37 database (releases same as standard database)
-    if grch37:
-        database = ENSEMBL_FTP_URL_GRCH37
-        ENS_rel = find_latest_ens_rel(ENSEMBL_FTP_URL)
-    # Standard database
-    elif species in ref_species_options(
-        "dna", database=ENSEMBL_FTP_URL, release=release
-    ):
-        database = ENSEMBL_FTP_URL
-        # Find latest vertebrate Ensembl release
-        ENS_rel = find_latest_ens_rel(database)
-    # For non-vertebrates, switch to non-vertebrate databases
-    else:
-        database = ENSEMBL_FTP_URL_NV
-        # Find latest NV Ensembl release
-        ENS_rel = find_latest_ens_rel(database)
-
-    # If release != None, use user-defined Ensembl release
-    if release != None:
-        # Warn user when release is higher than the latest release
-        if release > ENS_rel:
-            logger.warning(
-                f"Provided Ensembl release number {release} is greater than the latest release ({ENS_rel})."
-            )
-        ENS_rel = release
-
-    if not grch37:
-        ## Raise error if species not found (both FASTA and GTF have to be available)
-        # Find all available species for genome FASTAs for this Ensembl release
-        species_list_dna = ref_species_options(
-            "dna", database=database, release=ENS_rel
-        )
-        # Find all available species for GTFs for this Ensembl release
-        species_list_gtf = ref_species_options(
-            "gtf", database=database, release=ENS_rel
-        )
-        # Find intersection of the two lists
-        # (Only species which have GTF and FASTAs available can continue)
-        species_list = list(set(species_list_gtf) & set(species_list_dna))
-
-        if species not in species_list:
-            raise ValueError(
-                f"Species does not match any available species for Ensembl release {ENS_rel}. Please double-check spelling.\n"
-                "'gget ref --list_species' -> lists out all available species (Python: 'gget.ref(None, list_species=True)').\n"
-                "Combine with `release` argument to define specific Ensembl release (default: latest).\n"
-            )
-
-    ## Find kingdom for non-vertebrate species
-    if database == ENSEMBL_FTP_URL_NV:
-        kingdom = find_nv_kingdom(species, release=ENS_rel)
-
-    ## Get GTF link for this species and release
-    if "all" in which or "gtf" in which:
-        # Define location of GTF links
-        if database == ENSEMBL_FTP_URL_NV:
-            gtf_search_url = database + f"release-{ENS_rel}/{kingdom}/gtf/{species}/"
-        else:
-            gtf_search_url = database + f"release-{ENS_rel}/gtf/{species}/"
-
-        if grch37:
-            link_substring = "GRCh37.87.gtf.gz"
-        else:
-            link_substring = f"{ENS_rel}.gtf.gz"
-
-        # Get link, release date and dataset size
-        gtf_str, gtf_date, gtf_size = find_FTP_link(
-            url=gtf_search_url, link_substring=link_substring
-        )
-        # Build the final download link
-        if not isinstance(gtf_str, type(None)):
-            gtf_url = gtf_search_url + gtf_str
-        else:
-            gtf_url = ""
-            gtf_date = " "
-            gtf_size = ""
-
-    ## Get cDNA FASTA link for this species and release
-    if "all" in which or "cdna" in which:
-        if database == ENSEMBL_FTP_URL_NV:
-            # Define location of cdna links
-            cdna_search_url = (
-                database + f"release-{ENS_rel}/{kingdom}/fasta/{species}/cdna/"
-            )
-        else:
-            # Define location of cdna links
-            cdna_search_url = database + f"release-{ENS_rel}/fasta/{species}/cdna/"
-
-        # Get link, release date and dataset size
-        cdna_str, cdna_date, cdna_size = find_FTP_link(
-            url=cdna_search_url, link_substring="cdna.all.fa"
-        )
-        # Build the final download link
-        if not isinstance(cdna_str, type(None)):
-            cdna_url = cdna_search_url + cdna_str
-        else:
-            cdna_url = ""
-            cdna_date = " "
-            cdna_size = ""
-
-    ## Get DNA FASTA link for this species and release
-    if "all" in which or "dna" in which:
-        # Define location of dna links
-        if database == ENSEMBL_FTP_URL_NV:
-            dna_search_url = (
-                database + f"release-{ENS_rel}/{kingdom}/fasta/{species}/dna/"
-            )
-        else:
-            dna_search_url = database + f"release-{ENS_rel}/fasta/{species}/dna/"
-        # Get link, release date and dataset size
-        dna_str, dna_date, dna_size = find_FTP_link(
-            url=dna_search_url, link_substring=".dna.primary_assembly.fa"
+    ## Find the databases and releases of all species
+    # (release discovery and species listings are fetched once and shared by all species)
+    if isinstance(species, str):
+        species = [species]
+    # Raise error if no species was passed
+    if not species or any(not sp for sp in species):
+        raise ValueError(
+            "Please provide one or more species, e.g. species='homo_sapiens' or species=['homo_sapiens', 'mus_musculus'].\n"
+            "'gget ref --list_species' -> lists out all available species (Python: 'gget.ref(None, list_species=True)').\n"
         )
-
-        # Get toplevel if primary assembly not available
-        if dna_str is None:
-            # Get link, release date and dataset size
-            dna_str, dna_date, dna_size = find_FTP_link(
-                url=dna_search_url, link_substring=".dna.toplevel.fa"
+    resolved = [_resolve_ref_species(sp, release=release) for sp in species]
+
+    ## Get the links of all species concurrently
+    with ThreadPoolExecutor(
+        max_workers=min(len(resolved), REF_MAX_WORKERS)
+    ) as executor:
+        futures = [
+            executor.submit(
+                _find_ref_links, sp, which, database, ENS_rel, grch37, kingdom
             )
+            for sp, database, ENS_rel, grch37, kingdom in resolved
+        ]
+        species_links = [future.result() for future in futures]
 
-        # Build the final download link
-        if not isinstance(dna_str, type(None)):
-            dna_url = dna_search_url + dna_str
-        else:
-            dna_url = ""
-            dna_date = " "
-            dna_size = ""
-
-    ## Get CDS FASTA link for this species and release
-    if "all" in which or "cds" in which:
-        # Define location of cds links
-        if database == ENSEMBL_FTP_URL_NV:
-            cds_search_url = (
-                database + f"release-{ENS_rel}/{kingdom}/fasta/{species}/cds/"
-            )
-        else:
-            cds_search_url = database + f"release-{ENS_rel}/fasta/{species}/cds/"
-        # Get link, release date and dataset size
-        cds_str, cds_date, cds_size = find_FTP_link(
-            url=cds_search_url, link_substring="cds.all.fa"
-        )
-        # Build the final download link
-        if not isinstance(cds_str, type(None)):
-            cds_url = cds_search_url + cds_str
-        else:
-            cds_url = ""
-            cds_date = " "
-            cds_size = ""
-
-    ## Get ncRNA FASTA link for this species and release (if available)
-    if "all" in which or "ncrna" in which:
-        # Define location of ncRNA links
-        if database == ENSEMBL_FTP_URL_NV:
-            ncrna_search_url = (
-                database + f"release-{ENS_rel}/{kingdom}/fasta/{species}/ncrna/"
+    if verbose:
+        for sp, _, ENS_rel, _, _ in resolved:
+            logger.info(
+                f"Fetching reference information for {sp} from Ensembl release: {ENS_rel}."
             )
-        else:
-            ncrna_search_url = database + f"release-{ENS_rel}/fasta/{species}/ncrna/"
 
-        html = requests.get(ncrna_search_url)
-
-        # If ncRNA data is not available, HTML requests returns an error code (!= 200)
-        if html.status_code == 200:
-            soup = BeautifulSoup(html.text, "html.parser")
-
-            # Get all entries from the website
-            links = [stuff.text.strip() for stuff in soup.findAll("td")]
-            for i, link in enumerate(links):
-                # Find the correct link
-                if ".ncrna.fa" in link:
-                    ncrna_str = link
-                    # Get date and size
-                    ncrna_date = links[i + 1]
-                    ncrna_size = links[i + 2]
-
-            ncrna_url = ncrna_search_url + ncrna_str
-
-        # If the HTML request returned an error code here, I will assume that ncRNA data is not available
-        else:
-            ncrna_url = ""
-            ncrna_date = " "
-            ncrna_size = ""
-
-    ## Get pep FASTA link for this species and release
-    if "all" in which or "pep" in which:
-        # Define location of pep links
-        if database == ENSEMBL_FTP_URL_NV:
-            pep_search_url = (
-                database + f"release-{ENS_rel}/{kingdom}/fasta/{species}/pep/"
-            )
-        else:
-            pep_search_url = database + f"release-{ENS_rel}/fasta/{species}/pep/"
-        # Get link, release date and dataset size
-        pep_str, pep_date, pep_size = find_FTP_link(
-            url=pep_search_url, link_substring=".pep.all.fa"
+    ## Download the requested files
+    if download:
+        _download_refs(
+            [
+                links[key][0]
+                for links in species_links
+                for key in REF_FTP_ORDER
+                if key in links
+            ],
+            out_dir=out_dir,
+            decompress=decompress,
+            verbose=verbose,
         )
-        # Build the final download link
-        if not isinstance(pep_str, type(None)):
-            pep_url = pep_search_url + pep_str
-        else:
-            pep_url = ""
-            pep_date = " "
-            pep_size = ""
 
     ## Return results
+    not_requested = ("", " ", "")
     # If FTP=False, return dictionary/json of specified results
     if ftp is False:
-        ref_dict = {species: {}}
-        for return_val in which:
-            if return_val == "all":
-                ref_dict = {
-                    species: {
-                        "transcriptome_cdna": {
-                            "ftp": cdna_url,
-                            "ensembl_release": int(ENS_rel),
-                            "release_date": cdna_date.split(" ")[0],
-                            "release_time": cdna_date.split(" ")[1],
-                            "bytes": cdna_size,
-                        },
-                        "genome_dna": {
-                            "ftp": dna_url,
-                            "ensembl_release": int(ENS_rel),
-                            "release_date": dna_date.split(" ")[0],
-                            "release_time": dna_date.split(" ")[1],
-                            "bytes": dna_size,
-                        },
-                        "annotation_gtf": {
-                            "ftp": gtf_url,
-                            "ensembl_release": int(ENS_rel),
-                            "release_date": gtf_date.split(" ")[0],
-                            "release_time": gtf_date.split(" ")[1],
-                            "bytes": gtf_size,
-                        },
-                        "coding_seq_cds": {
-                            "ftp": cds_url,
-                            "ensembl_release": int(ENS_rel),
-                            "release_date": cds_date.split(" ")[0],
-                            "release_time": cds_date.split(" ")[1],
-                            "bytes": cds_size,
-                        },
-                        "non-coding_seq_ncRNA": {
-                            "ftp": ncrna_url,
-                            "ensembl_release": int(ENS_rel),
-                            "release_date": ncrna_date.split(" ")[0],
-                            "release_time": ncrna_date.split(" ")[1],
-                            "bytes": ncrna_size,
-                        },
-                        "protein_translation_pep": {
-                            "ftp": pep_url,
-                            "ensembl_release": int(ENS_rel),
-                            "release_date": pep_date.split(" ")[0],
-                            "release_time": pep_date.split(" ")[1],
-                            "bytes": pep_size,
-                        },
-                    }
-                }
-            elif return_val == "gtf":
-                dict_temp = {
-                    "annotation_gtf": {
-                        "ftp": gtf_url,
-                        "ensembl_release": int(ENS_rel),
-                        "release_date": gtf_date.split(" ")[0],
-                        "release_time": gtf_date.split(" ")[1],
-                        "bytes": gtf_size,
-                    },
-                }
-                ref_dict[species].update(dict_temp)
-            elif return_val == "cdna":
-                dict_temp = {
-                    "transcriptome_cdna": {
-                        "ftp": cdna_url,
-                        "ensembl_release": int(ENS_rel),
-                        "release_date": cdna_date.split(" ")[0],
-                        "release_time": cdna_date.split(" ")[1],
-                        "bytes": cdna_size,
-                    },
-                }
-                ref_dict[species].update(dict_temp)
-            elif return_val == "dna":
-                dict_temp = {
-                    "genome_dna": {
-                        "ftp": dna_url,
-                        "ensembl_release": int(ENS_rel),
-                        "release_date": dna_date.split(" ")[0],
-                        "release_time": dna_date.split(" ")[1],
-                        "bytes": dna_size,
-                    },
-                }
-                ref_dict[species].update(dict_temp)
-            elif return_val == "cds":
-                dict_temp = {
-                    "coding_seq_cds": {
-                        "ftp": cds_url,
-                        "ensembl_release": int(ENS_rel),
-                        "release_date": cds_date.split(" ")[0],
-                        "release_time": cds_date.split(" ")[1],
-                        "bytes": cds_size,
-                    },
-                }
-                ref_dict[species].update(dict_temp)
-            elif return_val == "ncrna":
-                dict_temp = {
-                    "non-coding_seq_ncRNA": {
-                        "ftp": ncrna_url,
-                        "ensembl_release": int(ENS_rel),
-                        "release_date": ncrna_date.split(" ")[0],
-                        "release_time": ncrna_date.split(" ")[1],
-                        "bytes": ncrna_size,
-                    },
+        ref_dict = {}
+        for (sp, _, ENS_rel, _, _), links in zip(resolved, species_links):
+            ref_dict[sp] = {}
+            for key in REF_DICT_ORDER if "all" in which else which:
+                url, date, size = links.get(key, not_requested)
+                ref_dict[sp][REF_DICT_KEYS[key]] = {
+                    "ftp": url,
+                    "ensembl_release": int(ENS_rel),
+                    "release_date": date.split(" ")[0],
+                    "release_time": date.split(" ")[1],
+                    "bytes": size,
                 }
-                ref_dict[species].update(dict_temp)
-            elif return_val == "pep":
-                dict_temp = {
-                    "protein_translation_pep": {
-                        "ftp": pep_url,
-                        "ensembl_release": int(ENS_rel),
-                        "release_date": pep_date.split(" ")[0],
-                        "release_time": pep_date.split(" ")[1],
-                        "bytes": pep_size,
-                    },
-                }
-                ref_dict[species].update(dict_temp)
-            else:
-                raise ValueError(
-                    "Parameter 'which' must be 'all', or any one or a combination of the following: 'gtf', 'cdna', 'dna', 'cds', 'ncrna', 'pep'.\n"
-                )
 
         if save:
             with open("gget_ref_results.json", "w", encoding="utf-8") as file:
                 json.dump(ref_dict, file, ensure_ascii=False, indent=4)
-        if verbose:
-            logger.info(
-                f"Fetching reference information for {species} from Ensembl release: {ENS_rel}."
-            )
         return ref_dict
 
     # If FTP==True, return only the specified URLs as a list
     if ftp:
-        if verbose:
-            logger.info(
-                f"Fetching reference information for {species} from Ensembl release: {ENS_rel}."
-            )
         results = []
-        for return_val in which:
-            if return_val == "all":
-                results.append(gtf_url)
-                results.append(cdna_url)
-                results.append(dna_url)
-                results.append(cds_url)
-                results.append(ncrna_url)
-                results.append(pep_url)
-            elif return_val == "gtf":
-                results.append(gtf_url)
-            elif return_val == "cdna":
-                results.append(cdna_url)
-            elif return_val == "dna":
-                results.append(dna_url)
-            elif return_val == "cds":
-                results.append(cds_url)
-            elif return_val == "ncrna":
-                results.append(ncrna_url)
-            elif return_val == "pep":
-                results.append(pep_url)
-            else:
-                raise ValueError(
-                    "Parameter 'which' must be 'all', or any one or a combination of the following: 'gtf', 'cdna', 'dna', 'cds', 'ncrna', 'pep'.\n"
-                )
+        for links in species_links:
+            for key in REF_FTP_ORDER if "all" in which else which:
+                results.append(links.get(key, not_requested)[0])
 
         if save:
             with open("gget_ref_results.txt", "w") as tfile:
@@ -2,12 +2,20 @@ import numpy as np
 import pandas as pd
 import json as json_package
 import mysql.connector as sql
+import os
+import re
+import gzip
 import time
+import atexit
+import sqlite3
+import threading
 import warnings
+from contextlib import contextmanager
 
 warnings.simplefilter(action="ignore", category=UserWarning)
 
 # Custom functions
+from . import utils
 from .utils import (
     search_species_options,
     find_latest_ens_rel,
@@ -18,94 +26,185 @@ from .utils import (
 
 logger = set_up_logger()
 
-from gget.constants import ENSEMBL_FTP_URL, ENSEMBL_FTP_URL_NV
+from gget.constants import (
+    ENSEMBL_FTP_URL,
+    ENSEMBL_FTP_URL_NV,
+    ENSEMBL_MYSQL_HOST,
+    ENSEMBL_MYSQL_PORTS,
+)
 
 
-def clean_cols(x):
-    if isinstance(x, list):
-        unique_list = list(set(x))
-        if len(unique_list) == 1:
-            return unique_list[0]
-        else:
-            return unique_list
+## Pool of Ensembl MySQL connections shared across gget.search calls
+# Idle connections per (host, database)
+_mysql_pool = {}
+# Port that worked for each (host, database), tried first on the next connect
+_mysql_ports = {}
+_mysql_pool_lock = threading.Lock()
+
+
+def _connect_mysql(host, database):
+    """
+    Open a new connection to an Ensembl MySQL database, starting with the port that
+    worked last time for this (host, database) before probing the remaining ports.
+    """
+    key = (host, database)
+    known_port = _mysql_ports.get(key)
+    ports = [known_port] if known_port else []
+    ports += [port for port in ENSEMBL_MYSQL_PORTS if port != known_port]
+
+    last_exception = None
+    for port in ports:
+        try:
+            connection = sql.connect(
+                host=host,
+                database=database,
+                user="anonymous",
+                password="",
+                port=port,
+            )
+            _mysql_ports[key] = port
+            return connection
+        except Exception as e:
+            last_exception = e
+            # Continue to the next port if the connection is unsuccessful
+            continue
+
+    # If none of the ports work, raise an error with the last exception encountered
+    _mysql_ports.pop(key, None)
+    if "Access denied" in str(last_exception):
+        raise RuntimeError(
+            f"""
+            The Ensembl server returned the following error: {str(last_exception)}.
+            This might be caused by the Ensembl release number being too low. 
+            Please try again with a more recent release.
+            """
+        )
     else:
-        return x
+        raise RuntimeError(
+            f"The Ensembl server returned the following error: {str(last_exception)}"
+        )
 
 
-def search(
-    searchwords,
-    species,
-    release=None,
-    id_type="gene",
-    seqtype=None,
-    andor="or",
-    limit=None,
-    wrap_text=False,
-    json=False,
-    save=False,
-    verbose=True,
-):
+@contextmanager
+def mysql_connection(database, host=ENSEMBL_MYSQL_HOST):
     """
-    Function to query Ensembl for genes based on species and free form search terms.
-    Automatically fetches results from latest Ensembl release, unless user specifies database (see 'species' argument)
-    or release database (see 'release' argument).
+    Borrow a connection to an Ensembl MySQL database from the module-level pool.
+    Live idle connections are reused, otherwise a new connection is opened.
+    The connection is returned to the pool when the block exits without error.
 
     Args:
-    - searchwords     Free form search words (not case-sensitive) as a string or list of strings
-                      (e.g.searchwords = ["GABA", "gamma-aminobutyric"]).
-    - species         Species can be passed in the format "genus_species", e.g. "homo_sapiens" or "arabidopsis_thaliana".
-                      To pass a specific database, enter the name of the core database, e.g. "mus_musculus_dba2j_core_105_1".
-                      All available core databases can be found here:
-                      Vertebrates: http://ftp.ensembl.org/pub/current/mysql/
-                      Invertebrates: http://ftp.ensemblgenomes.org/pub/current/ + kingdom + mysql/
-    - release         Defines the Ensembl release number from which the files are fetched, e.g. 104.
-                      Note: This argument does not apply to invertebrate species (you can pass a specific core database (which includes release number) to the species argument instead).
-                      This argument is overwritten if a specific database (which includes a release number) is passed to the species argument.
-                      Default: None -> latest Ensembl release is used
-    - id_type         "gene" (default) or "transcript"
-                      Defines whether genes or transcripts matching the searchwords are returned.
-    - andor           "or" (default) or "and"
-                      "or": Returns all genes that INCLUDE AT LEAST ONE of the searchwords in their name/description.
-                      "and": Returns only genes that INCLUDE ALL of the searchwords in their name/description.
-    - limit           (int) Limit the number of search results returned (default: None).
-    - wrap_text       If True, displays data frame with wrapped text for easy reading. Default: False.
-    - json            If True, returns results in json format instead of data frame. Default: False.
-    - save            If True, the data frame is saved as a csv in the current directory (default: False).
-    - verbose         True/False whether to print progress information. Default True.
+    - database    Name of the Ensembl core database, e.g. 'homo_sapiens_core_110_38'.
+    - host        MySQL host (default: the public Ensembl Genomes server).
+    """
+    key = (host, database)
+    connection = None
+    with _mysql_pool_lock:
+        idle = _mysql_pool.get(key, [])
+        while idle and connection is None:
+            candidate = idle.pop()
+            try:
+                if candidate.is_connected():
+                    connection = candidate
+                    continue
+            except Exception:
+                pass
+            _close_quietly(candidate)
 
-    Returns a data frame with the query results.
+    if connection is None:
+        connection = _connect_mysql(host, database)
 
-    Note: Only returns results based on matches in the "gene name" or "description" sections in the Ensembl database.
+    try:
+        yield connection
+    except BaseException:
+        # Do not reuse a connection that might be in an inconsistent state
+        _close_quietly(connection)
+        raise
 
-    Deprecated arguments: 'seqtype' (renamed to id_type)
+    with _mysql_pool_lock:
+        _mysql_pool.setdefault(key, []).append(connection)
+
+
+def _close_quietly(connection):
+    try:
+        connection.close()
+    except Exception:
+        pass
+
+
+def close_mysql_connections():
     """
-    # Handle deprecated arguments
-    if seqtype:
-        logger.error(
-            "'seqtype' argument deprecated! Please use argument 'id_type' instead."
-        )
-        return
+    Close all pooled Ensembl MySQL connections (called automatically at exit).
+    """
+    with _mysql_pool_lock:
+        for connections in _mysql_pool.values():
+            for connection in connections:
+                _close_quietly(connection)
+        _mysql_pool.clear()
 
-    start_time = time.time()
 
-    ## Check validity or arguments
-    # Check if id_type is valid
-    id_types = ["gene", "transcript"]
-    id_type = id_type.lower()
-    if id_type not in id_types:
-        raise ValueError(
-            f"ID type (id_type) specified is '{id_type}'. Expected one of: {', '.join(id_types)}"
-        )
+atexit.register(close_mysql_connections)
 
-    # Check if 'andor' arg is valid
-    andors = ["and", "or"]
-    andor = andor.lower()
-    if andor not in andors:
-        raise ValueError(
-            f"'andor' argument specified as {andor}. Expected one of {', '.join(andors)}"
-        )
 
-    ## Get database for specified species
+def _group_lists(values, column):
+    """
+    Lists of the values of a column per Ensembl ID (values must be sorted by Ensembl ID).
+    """
+    if values.empty:
+        return pd.Series(dtype=object)
+
+    ids = values["ensembl_id"].to_numpy()
+    # Positions where a new ID starts
+    starts = np.flatnonzero(ids[1:] != ids[:-1]) + 1
+    lists = [
+        group.tolist() for group in np.split(values[column].to_numpy(object), starts)
+    ]
+    return pd.Series(lists, index=ids[np.r_[0, starts]], dtype=object)
+
+
+def _collapse_results(df):
+    """
+    Collapse the rows returned for each Ensembl ID (one row per synonym) into a single row per ID.
+    Columns with one unique value per ID are kept as scalars, otherwise as lists of the unique values.
+    Synonyms are always returned as a sorted list.
+    """
+    collapsed = pd.DataFrame(
+        index=pd.Index(df["ensembl_id"].unique(), name="ensembl_id").sort_values()
+    )
+    for column in df.columns.drop("ensembl_id"):
+        # Unique values of the column per ID
+        values = df[["ensembl_id", column]].drop_duplicates()
+
+        if column == "synonym":
+            values = values.sort_values(["ensembl_id", column])
+            collapsed[column] = _group_lists(values, column)
+
+        else:
+            # Only build lists for the IDs with more than one value
+            n_values = values.groupby("ensembl_id")[column].transform("size")
+            single = values[n_values == 1].set_index("ensembl_id")[column]
+            multiple = _group_lists(
+                values[n_values > 1].sort_values("ensembl_id", kind="stable"), column
+            )
+            collapsed[column] = pd.concat([single, multiple])
+
+    return collapsed.reset_index()
+
+
+def _search_joins(id_type):
+    """
+    Joins needed to match the searchwords against names, descriptions, synonyms and attributes.
+    """
+    return f"""
+        LEFT JOIN xref ON {id_type}.display_xref_id = xref.xref_id
+        LEFT JOIN external_synonym ON {id_type}.display_xref_id = external_synonym.xref_id
+        LEFT JOIN {id_type}_attrib ON {id_type}.{id_type}_id = {id_type}_attrib.{id_type}_id
+    """
+
+
+def _clean_species(species):
+    """
+    Clean up species or database name (resolve shortcuts, trailing '/' and case).
+    """
     # Species shortcuts
     if species == "human":
         species = "homo_sapiens"
@@ -119,6 +218,24 @@ def search(
     # In case species was passed with upper case letters
     species = species.lower()
 
+    return species
+
+
+def _find_kingdom(db):
+    """
+    Find the Ensembl Genomes kingdom of a core database (None for vertebrates).
+    """
+    # Remove database numbers to retain only species name
+    clean_db = "_".join(db.split("_")[:3]).replace("_core", "")
+    return find_nv_kingdom(
+        clean_db, release=find_latest_ens_rel(database=ENSEMBL_FTP_URL_NV)
+    )
+
+
+def _find_database(species, release=None):
+    """
+    Find the Ensembl core database for the (cleaned) species name or database name.
+    """
     if "core" in species:
         db = species
         if release:
@@ -182,152 +299,676 @@ def search(
         else:
             db = db[0]
 
-    if verbose:
-        logger.info(f"Fetching results from database: {db}")
+    return db
 
-    ## Connect to Ensembl SQL server data for specified species
-    # Ports to try (some databases are stored in different ports)
-    # 3306 (and 5306) for the Ensembl instances, 3337 for GRCh37, 4157 for Ensembl Genomes, and 5316 for mart
-    ports = [3306, 5306, 4157, 3337, 5316]
 
-    connection_successful = False
-    last_exception = None
-    for port in ports:
+def build_search_query(searchwords, id_type="gene", andor="or", limit=None):
+    """
+    Build a single parameterized MySQL query that returns the genes or transcripts
+    matching the searchwords from an Ensembl core database.
+
+    Args:
+    - searchwords     List of search words.
+    - id_type         "gene" or "transcript".
+    - andor           "or": matches INCLUDE AT LEAST ONE of the searchwords.
+                      "and": matches INCLUDE ALL of the searchwords.
+    - limit           (int) Maximum number of genes/transcripts returned (default: None -> no limit).
+                      The first matches sorted by Ensembl ID are returned.
+
+    Returns the query and the list of query parameters.
+    """
+    joins = _search_joins(id_type)
+    fields = [
+        f"{id_type}.description",
+        "xref.description",
+        "xref.display_label",
+        "external_synonym.synonym",
+        f"{id_type}_attrib.value",
+    ]
+
+    # One condition per searchword (searchword found in any of the fields)
+    condition = "(" + " OR ".join(f"{field} LIKE %s" for field in fields) + ")"
+    conditions = [condition] * len(searchwords)
+    any_condition = " OR ".join(conditions)
+    word_params = [[f"%{word}%"] * len(fields) for word in searchwords]
+    all_word_params = [param for params in word_params for param in params]
+
+    # Find the IDs of all matches (and only keep matches that include all searchwords if andor="and")
+    params = list(all_word_params)
+    subquery = f"""
+        SELECT {id_type}.{id_type}_id, {id_type}.stable_id
+        FROM {id_type}
+        {joins}
+        WHERE {any_condition}
+        GROUP BY {id_type}.{id_type}_id, {id_type}.stable_id
+    """
+    if andor == "and":
+        subquery += "HAVING " + " AND ".join(f"MAX{cond}" for cond in conditions)
+        params += all_word_params
+    subquery += f" ORDER BY {id_type}.stable_id"
+    if limit is not None:
+        subquery += f" LIMIT {int(limit)}"
+
+    # Fetch the rows matching the searchwords for each of these IDs
+    # (for andor="and", the rows matching the first searchword)
+    if andor == "and":
+        row_conditions = conditions[0]
+        params += word_params[0]
+    else:
+        row_conditions = any_condition
+        params += all_word_params
+
+    query = f"""
+    SELECT DISTINCT {id_type}.stable_id AS 'ensembl_id', xref.display_label AS 'gene_name', {id_type}.description AS 'ensembl_description', xref.description AS 'ext_ref_description', {id_type}.biotype AS 'biotype', external_synonym.synonym AS 'synonym'
+    FROM ({subquery}) AS matches
+    JOIN {id_type} ON {id_type}.{id_type}_id = matches.{id_type}_id
+    {joins}
+    WHERE {row_conditions}
+    """
+
+    return query, params
+
+
+## Local full-text search index (SQLite FTS5)
+# Columns stored for each gene/transcript row of the index
+LOCAL_INDEX_COLUMNS = [
+    "id_type",
+    "ensembl_id",
+    "gene_name",
+    "ensembl_description",
+    "ext_ref_description",
+    "biotype",
+    "synonym",
+    "attrib",
+]
+# Columns the searchwords are matched against (same fields as the remote search)
+LOCAL_SEARCH_COLUMNS = [
+    "ensembl_description",
+    "ext_ref_description",
+    "gene_name",
+    "synonym",
+    "attrib",
+]
+# Columns of the Ensembl core tables needed to build the index
+# (name: type) and their default order in the MySQL dump files,
+# used if the dump does not include the database schema (.sql file)
+DUMP_TABLE_COLUMNS = {
+    "gene": {
+        "gene_id": "INTEGER",
+        "stable_id": "TEXT",
+        "display_xref_id": "INTEGER",
+        "description": "TEXT",
+        "biotype": "TEXT",
+    },
+    "transcript": {
+        "transcript_id": "INTEGER",
+        "stable_id": "TEXT",
+        "display_xref_id": "INTEGER",
+        "description": "TEXT",
+        "biotype": "TEXT",
+    },
+    "xref": {"xref_id": "INTEGER", "display_label": "TEXT", "description": "TEXT"},
+    "external_synonym": {"xref_id": "INTEGER", "synonym": "TEXT"},
+    "gene_attrib": {"gene_id": "INTEGER", "value": "TEXT"},
+    "transcript_attrib": {"transcript_id": "INTEGER", "value": "TEXT"},
+}
+DUMP_DEFAULT_COLUMNS = {
+    "gene": [
+        "gene_id",
+        "biotype",
+        "analysis_id",
+        "seq_region_id",
+        "seq_region_start",
+        "seq_region_end",
+        "seq_region_strand",
+        "display_xref_id",
+        "source",
+        "description",
+        "is_current",
+        "canonical_transcript_id",
+        "stable_id",
+        "version",
+        "created_date",
+        "modified_date",
+    ],
+    "transcript": [
+        "transcript_id",
+        "gene_id",
+        "analysis_id",
+        "seq_region_id",
+        "seq_region_start",
+        "seq_region_end",
+        "seq_region_strand",
+        "display_xref_id",
+        "source",
+        "biotype",
+        "description",
+        "is_current",
+        "canonical_translation_id",
+        "stable_id",
+        "version",
+        "created_date",
+        "modified_date",
+    ],
+    "xref": [
+        "xref_id",
+        "external_db_id",
+        "dbprimary_acc",
+        "display_label",
+        "version",
+        "description",
+        "info_type",
+        "info_text",
+    ],
+    "external_synonym": ["xref_id", "synonym"],
+    "gene_attrib": ["gene_id", "attrib_type_id", "value"],
+    "transcript_attrib": ["transcript_id", "attrib_type_id", "value"],
+}
+# Escape sequences used in MySQL dump files
+_DUMP_ESCAPES = {"0": "\0", "b": "\b", "n": "\n", "r": "\r", "t": "\t", "Z": "\x1a"}
+
+
+def _search_index_dir(index_dir=None):
+    """
+    Directory the local search indexes are saved in (default: 'search_index' in the gget cache directory).
+    """
+    if index_dir is None:
+        index_dir = os.path.join(utils.CACHE_DIR, "search_index")
+    return index_dir
+
+
+def _find_search_index(species, release=None, index_dir=None):
+    """
+    Find the local search index for the (cleaned) species name or database name.
+    If a species name is passed, the index of the latest (or the specified) release is used.
+    """
+    index_dir = _search_index_dir(index_dir)
+
+    if "core" in species:
+        index_path = os.path.join(index_dir, f"{species}.sqlite")
+        if os.path.isfile(index_path):
+            return index_path
+        candidates = []
+    else:
+        candidates = []
+        if os.path.isdir(index_dir):
+            for filename in os.listdir(index_dir):
+                match = re.match(
+                    rf"^{re.escape(species)}_core_(\d+)_\w+\.sqlite$", filename
+                )
+                if match and (release is None or int(match.group(1)) == int(release)):
+                    candidates.append((int(match.group(1)), filename))
+        if candidates:
+            return os.path.join(index_dir, max(candidates)[1])
+
+    raise FileNotFoundError(
+        f"No local search index found for '{species}' in {index_dir}. "
+        "Please build the index first using gget.build_search_index "
+        "(or use backend='remote')."
+    )
+
+
+def _parse_dump_schema(dump_dir):
+    """
+    Get the column names of each table from the schema (.sql or .sql.gz file) of an Ensembl MySQL dump.
+    Returns an empty dictionary if the dump does not include the schema.
+    """
+    schema_files = [
+        filename
+        for filename in os.listdir(dump_dir)
+        if filename.endswith(".sql") or filename.endswith(".sql.gz")
+    ]
+    if not schema_files:
+        return {}
+
+    schema_path = os.path.join(dump_dir, schema_files[0])
+    opener = gzip.open if schema_path.endswith(".gz") else open
+    with opener(schema_path, "rt", encoding="utf-8") as schema_file:
+        schema = schema_file.read()
+
+    columns = {}
+    for table, body in re.findall(
+        r"CREATE TABLE `(\w+)` \((.*?)\n\)", schema, flags=re.DOTALL
+    ):
+        columns[table] = re.findall(r"^\s*`(\w+)`", body, flags=re.MULTILINE)
+    return columns
+
+
+def _read_dump_table(dump_dir, table, columns):
+    """
+    Read the rows of an Ensembl MySQL dump table (table.txt or table.txt.gz),
+    only keeping the specified columns (NULL values are returned as None).
+    """
+    for filename in [f"{table}.txt.gz", f"{table}.txt"]:
+        path = os.path.join(dump_dir, filename)
+        if os.path.isfile(path):
+            break
+    else:
+        raise FileNotFoundError(
+            f"Table '{table}' ({table}.txt.gz) not found in MySQL dump directory {dump_dir}."
+        )
+
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8", newline="\n") as dump_file:
+        for line in dump_file:
+            fields = line.rstrip("\n").split("\t")
+            row = []
+            for i in columns:
+                field = fields[i]
+                if field == "\\N":
+                    row.append(None)
+                elif "\\" in field:
+                    row.append(
+                        re.sub(
+                            r"\\(.)",
+                            lambda m: _DUMP_ESCAPES.get(m.group(1), m.group(1)),
+                            field,
+                        )
+                    )
+                else:
+                    row.append(field)
+            yield row
+
+
+def _load_dump_tables(connection, dump_dir):
+    """
+    Load the tables needed to build the index from an Ensembl MySQL dump into the 'staging' database.
+    """
+    schema = _parse_dump_schema(dump_dir)
+    for table, column_types in DUMP_TABLE_COLUMNS.items():
+        dump_columns = schema.get(table, DUMP_DEFAULT_COLUMNS[table])
+        columns = [dump_columns.index(column) for column in column_types]
+        connection.execute(
+            f"CREATE TABLE staging.{table} ("
+            + ", ".join(f"{name} {type_}" for name, type_ in column_types.items())
+            + ")"
+        )
+        connection.executemany(
+            f"INSERT INTO staging.{table} VALUES ({', '.join('?' * len(columns))})",
+            _read_dump_table(dump_dir, table, columns),
+        )
+        # Index the columns the tables are joined on
+        key = list(column_types)[0]
+        connection.execute(f"CREATE INDEX staging.{table}_{key} ON {table} ({key})")
+
+
+def _index_rows_query(id_type):
+    """
+    Query returning the rows of the local search index for genes or transcripts
+    (same joins as the remote search query).
+    """
+    return f"""
+    SELECT {id_type}.stable_id, xref.display_label, {id_type}.description, xref.description, {id_type}.biotype, external_synonym.synonym, {id_type}_attrib.value
+    FROM {id_type}
+    {_search_joins(id_type)}
+    """
+
+
+def build_search_index(
+    species, release=None, dump_dir=None, index_dir=None, verbose=True
+):
+    """
+    Build a local full-text index (SQLite FTS5) of the gene and transcript stable IDs, names, descriptions,
+    synonyms and attributes of an Ensembl core database, which can be searched using gget.search(..., backend="local").
+
+    Args:
+    - species     Species in the format "genus_species", e.g. "homo_sapiens", or name of the core database,
+                  e.g. "mus_musculus_dba2j_core_105_1" (see gget.search).
+    - release     Ensembl release number the database is fetched from, e.g. 104 (see gget.search).
+                  Default: None -> latest Ensembl release is used.
+    - dump_dir    Path to a local copy of the MySQL dump of the core database, e.g.
+                  http://ftp.ensembl.org/pub/current/mysql/homo_sapiens_core_110_38/ (only the files
+                  gene, transcript, xref, external_synonym, gene_attrib and transcript_attrib .txt.gz
+                  and the schema .sql.gz are needed).
+                  Default: None -> the index is built by querying the Ensembl MySQL server.
+    - index_dir   Directory the index is saved in.
+                  Default: None -> 'search_index' in the gget cache directory (GGET_CACHE_DIR).
+    - verbose     True/False whether to print progress information. Default True.
+
+    Returns the path to the index.
+    """
+    start_time = time.time()
+
+    species = _clean_species(species)
+    if dump_dir is not None:
+        # The dump directory is named after the database
+        if "core" in species:
+            db = species
+        else:
+            db = os.path.basename(os.path.normpath(dump_dir))
+        if "core" not in db:
+            raise ValueError(
+                "Could not determine the core database of the MySQL dump. "
+                "Please pass the name of the core database to the species argument."
+            )
+    else:
+        db = _find_database(species, release)
+
+    # Store the kingdom of non-vertebrate species, used to build the Ensembl URLs of the results
+    try:
+        kingdom = _find_kingdom(db)
+    except Exception as e:
+        kingdom = None
+        logger.warning(
+            f"Could not determine the Ensembl kingdom of {db} ({e}). "
+            "The local search results will link to the vertebrate Ensembl website."
+        )
+
+    index_dir = _search_index_dir(index_dir)
+    os.makedirs(index_dir, exist_ok=True)
+    index_path = os.path.join(index_dir, f"{db}.sqlite")
+    # The index is built in a temporary file, so that searches never see a partial index
+    tmp_path = f"{index_path}.{os.getpid()}.tmp"
+    staging_path = f"{tmp_path}.staging"
+
+    if verbose:
+        logger.info(
+            f"Building local search index for database {db} from "
+            + (f"MySQL dump {dump_dir}." if dump_dir else "the Ensembl MySQL server.")
+        )
+
+    try:
+        connection = sqlite3.connect(tmp_path)
         try:
-            db_connection = sql.connect(
-                host="mysql-eg-publicsql.ebi.ac.uk",
-                database=db,
-                user="anonymous",
-                password="",
-                port=port,
+            connection.execute(
+                f"CREATE TABLE search_rows ({', '.join(LOCAL_INDEX_COLUMNS)})"
             )
-            connection_successful = True
-            break
-        except Exception as e:
-            last_exception = e
-            # Continue to the next port if the connection is unsuccessful
-            continue
+            try:
+                connection.execute(
+                    f"""
+                    CREATE VIRTUAL TABLE search_fts USING fts5(
+                        {', '.join(LOCAL_SEARCH_COLUMNS)},
+                        content='search_rows', tokenize='trigram'
+                    )
+                    """
+                )
+            except sqlite3.OperationalError as e:
+                raise RuntimeError(
+                    f"The local search index requires SQLite >= 3.34 with FTS5 support. SQLite error: {e}"
+                )
 
-    # If none of the ports work, raise an error with the last exception encountered
-    if not connection_successful:
-        if "Access denied" in str(last_exception):
-            raise RuntimeError(
-                f"""
-                The Ensembl server returned the following error: {str(last_exception)}.
-                This might be caused by the Ensembl release number being too low. 
-                Please try again with a more recent release.
-                """
+            insert = (
+                f"INSERT INTO search_rows ({', '.join(LOCAL_INDEX_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(LOCAL_INDEX_COLUMNS))})"
+            )
+            if dump_dir is not None:
+                connection.execute("ATTACH DATABASE ? AS staging", (staging_path,))
+                _load_dump_tables(connection, dump_dir)
+
+            for id_type in ["gene", "transcript"]:
+                if dump_dir is not None:
+                    connection.execute(
+                        f"INSERT INTO search_rows ({', '.join(LOCAL_INDEX_COLUMNS)}) "
+                        f"SELECT '{id_type}', * FROM ({_index_rows_query(id_type)})"
+                    )
+                else:
+                    with mysql_connection(db) as db_connection:
+                        cursor = db_connection.cursor()
+                        cursor.execute(_index_rows_query(id_type))
+                        while True:
+                            rows = cursor.fetchmany(10000)
+                            if not rows:
+                                break
+                            connection.executemany(
+                                insert, [(id_type, *row) for row in rows]
+                            )
+                        cursor.close()
+
+            if dump_dir is not None:
+                connection.commit()
+                connection.execute("DETACH DATABASE staging")
+
+            # Build the full-text index and the index used to group the matches by ID
+            connection.execute("INSERT INTO search_fts(search_fts) VALUES('rebuild')")
+            connection.execute(
+                "CREATE INDEX search_rows_id ON search_rows (id_type, ensembl_id)"
+            )
+            connection.execute(
+                "CREATE TABLE metadata (key TEXT PRIMARY KEY, value TEXT)"
+            )
+            connection.executemany(
+                "INSERT INTO metadata VALUES (?, ?)",
+                [
+                    ("database", db),
+                    ("kingdom", kingdom),
+                    ("source", dump_dir if dump_dir else "server"),
+                    ("created", str(time.time())),
+                ],
+            )
+            connection.commit()
+            (n_rows,) = connection.execute(
+                "SELECT COUNT(*) FROM search_rows"
+            ).fetchone()
+        finally:
+            connection.close()
+
+        os.replace(tmp_path, index_path)
+
+    finally:
+        for path in [tmp_path, staging_path]:
+            if os.path.exists(path):
+                os.remove(path)
+
+    if verbose:
+        logger.info(
+            f"Indexed {n_rows} rows in {round(time.time() - start_time, 2)} seconds: {index_path}"
+        )
+
+    return index_path
+
+
+def build_local_search_query(searchwords, id_type="gene", andor="or", limit=None):
+    """
+    Build a parameterized SQLite query that returns the genes or transcripts matching the searchwords
+    from a local search index (same results as build_search_query on the Ensembl MySQL server).
+
+    Args:
+    - searchwords     List of search words.
+    - id_type         "gene" or "transcript".
+    - andor           "or": matches INCLUDE AT LEAST ONE of the searchwords.
+                      "and": matches INCLUDE ALL of the searchwords.
+    - limit           (int) Maximum number of genes/transcripts returned (default: None -> no limit).
+                      The first matches sorted by Ensembl ID are returned.
+
+    Returns the query and the list of query parameters.
+    """
+    # One condition per searchword (searchword found in any of the fields)
+    conditions = []
+    word_params = []
+    for word in searchwords:
+        if len(word) >= 3:
+            # Substring match using the trigram full-text index
+            conditions.append(
+                "search_rows.rowid IN (SELECT rowid FROM search_fts WHERE search_fts MATCH ?)"
             )
+            word_params.append(['"' + word.replace('"', '""') + '"'])
         else:
-            raise RuntimeError(
-                f"The Ensembl server returned the following error: {str(last_exception)}"
+            # The trigram index cannot match searchwords shorter than 3 characters
+            conditions.append(
+                "("
+                + " OR ".join(
+                    f"search_rows.{column} LIKE ?" for column in LOCAL_SEARCH_COLUMNS
+                )
+                + ")"
             )
+            word_params.append([f"%{word}%"] * len(LOCAL_SEARCH_COLUMNS))
+    any_condition = " OR ".join(conditions)
+    all_word_params = [param for params in word_params for param in params]
+
+    # Find the IDs of all matches (and only keep matches that include all searchwords if andor="and")
+    params = [id_type] + all_word_params
+    subquery = f"""
+        SELECT search_rows.ensembl_id
+        FROM search_rows
+        WHERE search_rows.id_type = ? AND ({any_condition})
+        GROUP BY search_rows.ensembl_id
+    """
+    if andor == "and":
+        subquery += "HAVING " + " AND ".join(f"MAX({cond})" for cond in conditions)
+        params += all_word_params
+    subquery += " ORDER BY search_rows.ensembl_id"
+    if limit is not None:
+        subquery += f" LIMIT {int(limit)}"
+
+    # Fetch the rows matching the searchwords for each of these IDs
+    # (for andor="and", the rows matching the first searchword)
+    params.append(id_type)
+    if andor == "and":
+        row_conditions = conditions[0]
+        params += word_params[0]
+    else:
+        row_conditions = any_condition
+        params += all_word_params
+
+    query = f"""
+    SELECT DISTINCT search_rows.ensembl_id AS ensembl_id, search_rows.gene_name AS gene_name, search_rows.ensembl_description AS ensembl_description, search_rows.ext_ref_description AS ext_ref_description, search_rows.biotype AS biotype, search_rows.synonym AS synonym
+    FROM ({subquery}) AS matches
+    JOIN search_rows ON search_rows.ensembl_id = matches.ensembl_id
+    WHERE search_rows.id_type = ? AND ({row_conditions})
+    """
+
+    return query, params
+
+
+def search(
+    searchwords,
+    species,
+    release=None,
+    id_type="gene",
+    seqtype=None,
+    andor="or",
+    limit=None,
+    wrap_text=False,
+    json=False,
+    save=False,
+    verbose=True,
+    backend="remote",
+    index_dir=None,
+):
+    """
+    Function to query Ensembl for genes based on species and free form search terms.
+    Automatically fetches results from latest Ensembl release, unless user specifies database (see 'species' argument)
+    or release database (see 'release' argument).
+
+    Args:
+    - searchwords     Free form search words (not case-sensitive) as a string or list of strings
+                      (e.g.searchwords = ["GABA", "gamma-aminobutyric"]).
+    - species         Species can be passed in the format "genus_species", e.g. "homo_sapiens" or "arabidopsis_thaliana".
+                      To pass a specific database, enter the name of the core database, e.g. "mus_musculus_dba2j_core_105_1".
+                      All available core databases can be found here:
+                      Vertebrates: http://ftp.ensembl.org/pub/current/mysql/
+                      Invertebrates: http://ftp.ensemblgenomes.org/pub/current/ + kingdom + mysql/
+    - release         Defines the Ensembl release number from which the files are fetched, e.g. 104.
+                      Note: This argument does not apply to invertebrate species (you can pass a specific core database (which includes release number) to the species argument instead).
+                      This argument is overwritten if a specific database (which includes a release number) is passed to the species argument.
+                      Default: None -> latest Ensembl release is used
+    - id_type         "gene" (default) or "transcript"
+                      Defines whether genes or transcripts matching the searchwords are returned.
+    - andor           "or" (default) or "and"
+                      "or": Returns all genes that INCLUDE AT LEAST ONE of the searchwords in their name/description.
+                      "and": Returns only genes that INCLUDE ALL of the searchwords in their name/description.
+    - limit           (int) Limit the number of search results returned (default: None).
+    - wrap_text       If True, displays data frame with wrapped text for easy reading. Default: False.
+    - json            If True, returns results in json format instead of data frame. Default: False.
+    - save            If True, the data frame is saved as a csv in the current directory (default: False).
+    - verbose         True/False whether to print progress information. Default True.
+    - backend         "remote" (default) or "local"
+                      "remote": Queries the Ensembl MySQL server.
+                      "local": Queries a local full-text index built with gget.build_search_index (no internet connection needed).
+                      For species names, the index of the latest (or the specified) release found in index_dir is used.
+    - index_dir       Directory of the local search indexes (default: None -> 'search_index' in the gget cache directory).
+
+    Returns a data frame with the query results.
+
+    Note: Only returns results based on matches in the "gene name" or "description" sections in the Ensembl database.
+
+    Deprecated arguments: 'seqtype' (renamed to id_type)
+    """
+    # Handle deprecated arguments
+    if seqtype:
+        logger.error(
+            "'seqtype' argument deprecated! Please use argument 'id_type' instead."
+        )
+        return
+
+    start_time = time.time()
+
+    ## Check validity or arguments
+    # Check if id_type is valid
+    id_types = ["gene", "transcript"]
+    id_type = id_type.lower()
+    if id_type not in id_types:
+        raise ValueError(
+            f"ID type (id_type) specified is '{id_type}'. Expected one of: {', '.join(id_types)}"
+        )
+
+    # Check if 'andor' arg is valid
+    andors = ["and", "or"]
+    andor = andor.lower()
+    if andor not in andors:
+        raise ValueError(
+            f"'andor' argument specified as {andor}. Expected one of {', '.join(andors)}"
+        )
+
+    # Check if 'backend' arg is valid
+    backends = ["remote", "local"]
+    backend = backend.lower()
+    if backend not in backends:
+        raise ValueError(
+            f"'backend' argument specified as {backend}. Expected one of {', '.join(backends)}"
+        )
+
+    ## Get database for specified species
+    species = _clean_species(species)
+    if backend == "local":
+        index_path = _find_search_index(species, release, index_dir)
+        db = os.path.basename(index_path)[: -len(".sqlite")]
+    else:
+        db = _find_database(species, release)
+
+    if verbose:
+        logger.info(
+            f"Fetching results from database: {db}"
+            + (" (local index)" if backend == "local" else "")
+        )
 
     ## Clean up list of searchwords
     # If single searchword passed as string, convert to list
     if type(searchwords) == str:
         searchwords = [searchwords]
 
-    ## Find genes
-    for i, searchword in enumerate(searchwords):
-        if id_type == "gene":
-            query = f"""
-            SELECT gene.stable_id AS 'ensembl_id', xref.display_label AS 'gene_name', gene.description AS 'ensembl_description', xref.description AS 'ext_ref_description', gene.biotype AS 'biotype', external_synonym.synonym AS 'synonym'
-            FROM gene 
-            LEFT JOIN xref ON gene.display_xref_id = xref.xref_id 
-            LEFT JOIN external_synonym ON gene.display_xref_id = external_synonym.xref_id 
-            LEFT JOIN gene_attrib ON gene.gene_id = gene_attrib.gene_id 
-            WHERE (gene.description LIKE '%{searchword}%' OR xref.description LIKE '%{searchword}%' OR xref.display_label LIKE '%{searchword}%' OR external_synonym.synonym LIKE '%{searchword}%' OR gene_attrib.value LIKE '%{searchword}%')
-            """
-
-            # Fetch the search results from the host using the specified query
-            df_temp = pd.read_sql(query, con=db_connection)
-
-            # Order by ENSEMBL ID (I am using pandas for this instead of SQL to increase speed)
-            df_temp = df_temp.sort_values("ensembl_id").reset_index(drop=True)
+    ## Find genes/transcripts matching the searchwords
+    # All searchwords are combined into one query, so that only the
+    # (distinct and limited) matching rows are returned by the server
+    if backend == "local":
+        query, params = build_local_search_query(searchwords, id_type, andor, limit)
 
-            # If andor="or", keep all results
-            if andor == "or":
-                # In the first iteration, make the search results equal to the master data frame
-                if i == 0:
-                    df = df_temp.copy()
-                # Add new search results to master data frame
-                else:
-                    df = pd.concat([df, df_temp])
-
-            # If andor="and", only keep overlap between results
-            if andor == "and":
-                # In the first iteration, make the search results equal to the master data frame
-                if i == 0:
-                    df = df_temp.copy()
-                # Only keep overlapping results in master data frame
-                else:
-                    val = np.intersect1d(df["ensembl_id"], df_temp["ensembl_id"])
-                    df = df[df.ensembl_id.isin(val)]
-
-        if id_type == "transcript":
-            query = f"""
-            SELECT transcript.stable_id AS 'ensembl_id', xref.display_label AS 'gene_name', transcript.description AS 'ensembl_description', xref.description AS 'ext_ref_description', transcript.biotype AS 'biotype', external_synonym.synonym AS 'synonym'
-            FROM transcript 
-            LEFT JOIN xref ON transcript.display_xref_id = xref.xref_id 
-            LEFT JOIN external_synonym ON transcript.display_xref_id = external_synonym.xref_id 
-            LEFT JOIN transcript_attrib ON transcript.transcript_id = transcript_attrib.transcript_id 
-            WHERE (transcript.description LIKE '%{searchword}%' OR xref.description LIKE '%{searchword}%' OR xref.display_label LIKE '%{searchword}%' OR external_synonym.synonym LIKE '%{searchword}%' OR transcript_attrib.value LIKE '%{searchword}%')
-            """
+        # Fetch the search results from the local full-text index
+        connection = sqlite3.connect(index_path)
+        try:
+            df = pd.read_sql(query, con=connection, params=params)
+            local_kingdom = connection.execute(
+                "SELECT value FROM metadata WHERE key = 'kingdom'"
+            ).fetchone()[0]
+        finally:
+            connection.close()
 
-            # Fetch the search results from the host using the specified query
-            df_temp = pd.read_sql(query, con=db_connection)
-            # Order by ENSEMBL ID (I am using pandas for this instead of SQL to increase speed)
-            df_temp = df_temp.sort_values("ensembl_id").reset_index(drop=True)
-
-            # If andor="or", keep all results
-            if andor == "or":
-                # In the first iteration, make the search results equal to the master data frame
-                if i == 0:
-                    df = df_temp.copy()
-                # Add new search results to master data frame
-                else:
-                    df = pd.concat([df, df_temp])
-            # If andor="and", only keep overlap between results
-            if andor == "and":
-                # In the first iteration, make the search results equal to the master data frame
-                if i == 0:
-                    df = df_temp.copy()
-                # Only keep overlapping results in master data frame
-                else:
-                    val = np.intersect1d(df["ensembl_id"], df_temp["ensembl_id"])
-                    df = df[df.ensembl_id.isin(val)]
+    else:
+        query, params = build_search_query(searchwords, id_type, andor, limit)
 
-    # Remove any duplicate search results from the master data frame and reset the index
-    df = df.drop_duplicates().reset_index(drop=True)
+        # Fetch the search results from the host using the specified query
+        # (connections to the Ensembl SQL server are pooled and reused across calls)
+        with mysql_connection(db) as db_connection:
+            df = pd.read_sql(query, con=db_connection, params=params)
 
     # Collapse entries for the same Ensembl ID
-    # .applymap was renamed to .map in pandas 2.1.0
-    try:
-        df = df.groupby("ensembl_id").agg(tuple).map(list).reset_index()
-    except AttributeError:
-        df = df.groupby("ensembl_id").agg(tuple).applymap(list).reset_index()
-
-    # Convert list of values to type string if there is only one value
-    # .applymap was renamed to .map in pandas 2.1.0
-    try:
-        df = df.map(clean_cols)
-    except AttributeError:
-        df = df.applymap(clean_cols)
-
-    # Keep synonyms always of type list for consistency
-    df["synonym"] = [
-        np.sort(syn).tolist() if isinstance(syn, list) else np.sort([syn]).tolist()
-        for syn in df["synonym"].values
-    ]
+    df = _collapse_results(df)
 
-    # If limit is not None, keep only the first {limit} rows
+    # The number of matches was limited to {limit} by the query
     if limit != None:
-        # Print number of genes/transcripts found versus fetched
+        # Print number of genes/transcripts fetched
         if verbose:
-            logger.info(f"Returning {limit} matches of {len(df)} total matches found.")
-        # Remove all but limit rows
-        df = df.head(limit)
+            logger.info(f"Returning {len(df)} matches (limit: {limit}).")
 
     else:
         # Print number of genes/transcripts fetched
@@ -342,9 +983,11 @@ def search(
     clean_db = "_".join(db.split("_")[:3]).replace("_core", "")
 
     ## Find kingdom for non-vertebrate species
-    kingdom = find_nv_kingdom(
-        clean_db, release=find_latest_ens_rel(database=ENSEMBL_FTP_URL_NV)
-    )
+    # (the local index stores the kingdom, so that no server is queried)
+    if backend == "local":
+        kingdom = local_kingdom
+    else:
+        kingdom = _find_kingdom(db)
 
     if kingdom:
         # Add URL to gene summary on Ensembl for invertebrates
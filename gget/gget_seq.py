@@ -1,7 +1,14 @@
+import os
+import gzip
 import numpy as np
 
 # Custom functions
-from .utils import rest_query, get_uniprot_seqs, set_up_logger, post_query
+from .utils import (
+    get_uniprot_seqs,
+    set_up_logger,
+    iter_post_query_chunks,
+    check_cache_mode,
+)
 
 logger = set_up_logger()
 from .gget_info import info
@@ -18,6 +25,8 @@ def seq(
     transcribe=None,
     seqtype=None,
     verbose=True,
+    cache=None,
+    out=None,
 ):
     """
     Fetch nucleotide or amino acid sequence (FASTA) of a gene
@@ -33,9 +42,18 @@ def seq(
     - isoforms      If True, returns the sequences of all known transcripts (default: False).
                     (Only for gene IDs.)
     - save          If True, saves output FASTA to current directory (default: False).
+                    Cannot be combined with 'out'.
     - verbose       True/False whether to print progress information. Default True.
+    - cache         'off', 'read' or 'readwrite'. Whether server responses are read from and/or written to the
+                    persistent gget cache (directory set by environment variable GGET_CACHE_DIR).
+                    Default: None -> value of environment variable GGET_CACHE, or 'off'.
+    - out           Path to the FASTA file the results will be written to, e.g. 'path/to/results.fa'
+                    (gzip-compressed if the path ends with '.gz'). Nucleotide sequences are written
+                    as they are fetched instead of being collected in memory. The file is first written to
+                    'out' + '.part' and only moved to 'out' once all sequences were fetched. Default: None.
 
     Returns a list (or FASTA file if 'save=True') containing the requested sequences.
+    If 'out' is specified, the sequences are written to 'out' and None is returned.
 
     Deprecated arguments: 'seqtype', 'transcribe' (use True/False flag 'translate' instead.)
     """
@@ -48,6 +66,61 @@ def seq(
     if transcribe:
         translate = transcribe
 
+    cache = check_cache_mode(cache)
+
+    if out is None:
+        fasta = _fetch_fasta(ens_ids, translate, isoforms, verbose, cache)
+
+        # Save
+        if save:
+            file = open("gget_seq_results.fa", "w")
+            for element in fasta:
+                file.write(element + "\n")
+            file.close()
+
+        return fasta
+
+    if save:
+        raise ValueError(
+            "Arguments 'save' and 'out' cannot be combined. Use 'out' to define where the results are saved."
+        )
+
+    # Nucleotide sequences are written to the output file chunk by chunk as they are fetched
+    # (to a temporary '.part' file, so 'out' is not left incomplete if an error occurs)
+    directory = os.path.dirname(out)
+    if directory != "":
+        os.makedirs(directory, exist_ok=True)
+    part_path = out + ".part"
+    try:
+        if out.endswith(".gz"):
+            out_file = gzip.open(part_path, "wt")
+        else:
+            out_file = open(part_path, "w")
+
+        with out_file:
+            fasta = _fetch_fasta(
+                ens_ids, translate, isoforms, verbose, cache, out_file=out_file
+            )
+            # Write remaining FASTA entries (amino acid sequences)
+            out_file.write("".join(element + "\n" for element in fasta))
+
+    except BaseException:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+
+    os.replace(part_path, out)
+
+    return None
+
+
+def _fetch_fasta(ens_ids, translate, isoforms, verbose, cache, out_file=None):
+    """
+    Fetch the sequences for gget seq (see seq for the arguments).
+    If out_file is an open file, nucleotide sequences are written to it as they are fetched.
+
+    Returns the list of FASTA lines that were not written to out_file.
+    """
     ## Clean up arguments
     # Clean up Ensembl IDs
     # If single Ensembl ID passed as string, convert to list
@@ -79,64 +152,36 @@ def seq(
     if translate is False:
         # Define Ensembl REST API server
         server = ENSEMBL_REST_API
-        # Define type of returned content from REST
-        content_type = "application/json"
 
-        # Initiate dictionary to save results for all IDs in
-        master_dict = {}
-
-        # Query REST APIs from https://rest.ensembl.org/
+        # Collect one (ID to fetch, ID used in the FASTA header) entry per requested sequence in input order
+        # (header ID None -> transcript ID returned by Ensembl); duplicate IDs are fetched once
+        entries = []
 
         # If isoforms False, just fetch sequences of passed Ensembl ID
         if not isoforms:
-            actual_results_dict = {}
-
-            endpoint = "sequence/id/"
-            query = {"ids": ens_ids_clean}
-
-            # noinspection PyTypeChecker
-            results_list = post_query(server, endpoint, query)
-            results_dict = {v["query"]: v for v in results_list if v is not None}
-
-            for ensembl_ID, df_temp in results_dict.items():
-                # Delete superfluous entries
-                keys_to_delete = ["query", "id", "version", "molecule"]
-                for key in keys_to_delete:
-                    # Pop keys, None -> do not raise an error if key to delete not found
-                    df_temp.pop(key, None)
-
-                # Add results to main dict
-                actual_results_dict[ensembl_ID] = {"seq": df_temp}
+            for ensembl_ID in ens_ids_clean:
+                entries.append((ensembl_ID, ensembl_ID))
 
                 if verbose:
                     logger.info(
                         f"Requesting nucleotide sequence of {ensembl_ID} from Ensembl."
                     )
 
-            missing_ids = set(ens_ids_clean) - set(actual_results_dict.keys())
-
-            for missing in missing_ids:
-                logger.error(
-                    f"ID {missing} not found. Please double-check spelling/arguments and try again."
-                )
-
-            # Add results to master dict
-            master_dict.update(actual_results_dict)
-
         # If isoforms true, fetch sequences of isoforms instead
-        # todo this could possibly be refactored to use bulk queries
         else:
-            for ensembl_ID in ens_ids_clean:
-                # Create dict to save query results
-                results_dict = {ensembl_ID: {}}
-
-                # Get ID type (gene, transcript, ...) using gget info
-                info_df = info(
-                    ensembl_ID, verbose=False, pdb=False, ncbi=False, uniprot=False
-                )
+            # Get ID types (gene, transcript, ...) and transcripts of all IDs using gget info
+            info_df = info(
+                ens_ids_clean,
+                verbose=False,
+                pdb=False,
+                ncbi=False,
+                uniprot=False,
+                cache=cache,
+            )
 
+            for ensembl_ID in ens_ids_clean:
                 # Check if Ensembl ID was found
-                if isinstance(info_df, type(None)):
+                if info_df is None or ensembl_ID not in info_df.index:
                     logger.warning(
                         f"ID '{ensembl_ID}' not found. Please double-check spelling/arguments and try again."
                     )
@@ -155,78 +200,80 @@ def seq(
                         # Remove version number for Ensembl IDs (not for flybase/wormbase IDs)
                         if transcipt_id.startswith("ENS"):
                             transcipt_id = transcipt_id.split(".")[0]
-
-                        # Try if query is valid
-                        try:
-                            # Define the REST query
-                            query = "sequence/id/" + transcipt_id + "?"
-                            # Submit query
-                            df_temp = rest_query(server, query, content_type)
-
-                            # Delete superfluous entries
-                            keys_to_delete = ["query", "version", "molecule"]
-                            for key in keys_to_delete:
-                                # Pop keys, None -> do not raise an error if key to delete not found
-                                df_temp.pop(key, None)
-
-                            # Add results to main dict
-                            results_dict[ensembl_ID].update(
-                                {f"{transcipt_id}": df_temp}
-                            )
-
-                        except RuntimeError:
-                            logger.error(
-                                f"ID {transcipt_id} not found. "
-                                "Please double-check spelling/arguments and try again."
-                            )
+                        entries.append((transcipt_id, None))
 
                 # If isoform true, but ID is not a gene; ignore the isoform parameter
                 else:
-                    # Try if query is valid
-                    try:
-                        # Define the REST query
-                        query = "sequence/id/" + ensembl_ID + "?"
-
-                        # Submit query
-                        df_temp = rest_query(server, query, content_type)
+                    entries.append((ensembl_ID, ensembl_ID))
 
-                        # Delete superfluous entries
-                        keys_to_delete = ["query", "id", "version", "molecule"]
-                        for key in keys_to_delete:
-                            # Pop keys, None -> do not raise an error if key to delete not found
-                            df_temp.pop(key, None)
+                    logger.info(
+                        f"Requesting nucleotide sequence of {ensembl_ID} from Ensembl."
+                    )
+                    logger.warning("The isoform option only applies to gene IDs.")
 
-                        # Add results to main dict
-                        results_dict[ensembl_ID].update({"seq": df_temp})
+        # Query REST APIs from https://rest.ensembl.org/
+        # IDs are submitted in chunks of up to 50 IDs and the
+        # FASTA entries are built (and written to out_file) chunk by chunk
+        seq_ids = list(dict.fromkeys(seq_id for seq_id, _ in entries))
+        positions = {seq_id: i for i, seq_id in enumerate(seq_ids)}
+        # Number of entries still to be written for each fetched ID
+        remaining = {}
+        for seq_id, _ in entries:
+            remaining[seq_id] = remaining.get(seq_id, 0) + 1
+
+        fetched = {}
+        found_ids = set()
+        # Each chunk covers a contiguous range of seq_ids, so all IDs up to the
+        # last ID returned so far have either been fetched or were not found
+        resolved = -1
+        next_entry = 0
+
+        def write_entries():
+            nonlocal next_entry
+            chunk_fasta = []
+            while (
+                next_entry < len(entries)
+                and positions[entries[next_entry][0]] <= resolved
+            ):
+                seq_id, header_id = entries[next_entry]
+                next_entry += 1
+                result = fetched.get(seq_id)
+                if result is None:
+                    continue
 
-                        logger.info(
-                            f"Requesting nucleotide sequence of {ensembl_ID} from Ensembl."
-                        )
-                        logger.warning("The isoform option only applies to gene IDs.")
+                chunk_fasta.append(
+                    ">" + (header_id or result["id"]) + " " + result["desc"]
+                )
+                chunk_fasta.append(result["seq"])
+
+                remaining[seq_id] -= 1
+                if remaining[seq_id] == 0:
+                    del fetched[seq_id]
+
+            if out_file is not None:
+                out_file.write("\n".join(chunk_fasta + [""]))
+            else:
+                fasta.extend(chunk_fasta)
+
+        for results_list in iter_post_query_chunks(
+            server, "sequence/id/", seq_ids, cache=cache
+        ):
+            for result in results_list:
+                if result is None or result["query"] not in positions:
+                    continue
+                found_ids.add(result["query"])
+                fetched[result["query"]] = result
+                resolved = max(resolved, positions[result["query"]])
 
-                    except RuntimeError:
-                        logger.error(
-                            f"ID {ensembl_ID} not found. "
-                            "Please double-check spelling/arguments and try again."
-                        )
+            write_entries()
 
-                # Add results to master dict
-                master_dict.update(results_dict)
+        resolved = len(seq_ids)
+        write_entries()
 
-        # Build FASTA file
-        for ens_ID in master_dict:
-            for key in master_dict[ens_ID].keys():
-                if key == "seq":
-                    fasta.append(">" + ens_ID + " " + master_dict[ens_ID][key]["desc"])
-                    fasta.append(master_dict[ens_ID][key]["seq"])
-                else:
-                    fasta.append(
-                        ">"
-                        + master_dict[ens_ID][key]["id"]
-                        + " "
-                        + master_dict[ens_ID][key]["desc"]
-                    )
-                    fasta.append(master_dict[ens_ID][key]["seq"])
+        for missing in [seq_id for seq_id in seq_ids if seq_id not in found_ids]:
+            logger.error(
+                f"ID {missing} not found. Please double-check spelling/arguments and try again."
+            )
 
     ## Fetch amino acid sequences from UniProt
     if translate is True:
@@ -234,14 +281,19 @@ def seq(
             # List to collect transcript IDs
             trans_ids = []
 
-            for ensembl_ID in ens_ids_clean:
-                # Get ID type (gene, transcript, ...) using gget info
-                info_df = info(
-                    ensembl_ID, verbose=False, pdb=False, ncbi=False, uniprot=False
-                )
+            # Get ID types (gene, transcript, ...) of all IDs using gget info
+            info_df = info(
+                ens_ids_clean,
+                verbose=False,
+                pdb=False,
+                ncbi=False,
+                uniprot=False,
+                cache=cache,
+            )
 
+            for ensembl_ID in ens_ids_clean:
                 # Check that Ensembl ID was found
-                if isinstance(info_df, type(None)):
+                if info_df is None or ensembl_ID not in info_df.index:
                     logger.warning(
                         f"ID '{ensembl_ID}' not found. Please double-check spelling/arguments."
                     )
@@ -295,20 +347,25 @@ def seq(
                     )
 
             # Fetch the amino acid sequences of the transcript Ensembl IDs
-            df_uniprot = get_uniprot_seqs(UNIPROT_REST_API, trans_ids)
+            df_uniprot = get_uniprot_seqs(UNIPROT_REST_API, trans_ids, cache=cache)
 
         if isoforms is True:
             # List to collect transcript IDs
             trans_ids = []
 
-            for ensembl_ID in ens_ids_clean:
-                # Get ID type (gene, transcript, ...) using gget info
-                info_df = info(
-                    ensembl_ID, verbose=False, pdb=False, ncbi=False, uniprot=False
-                )
+            # Get ID types (gene, transcript, ...) of all IDs using gget info
+            info_df = info(
+                ens_ids_clean,
+                verbose=False,
+                pdb=False,
+                ncbi=False,
+                uniprot=False,
+                cache=cache,
+            )
 
+            for ensembl_ID in ens_ids_clean:
                 # Check that Ensembl ID was found
-                if isinstance(info_df, type(None)):
+                if info_df is None or ensembl_ID not in info_df.index:
                     logger.warning(
                         f"ID '{ensembl_ID}' not found. Please double-check spelling/arguments."
                     )
@@ -358,7 +415,7 @@ def seq(
                     )
 
             # Fetch amino acid sequences of all isoforms from the UniProt REST API
-            df_uniprot = get_uniprot_seqs(UNIPROT_REST_API, trans_ids)
+            df_uniprot = get_uniprot_seqs(UNIPROT_REST_API, trans_ids, cache=cache)
 
         # Check if any results were found
         if len(df_uniprot) < 1:
@@ -397,11 +454,4 @@ def seq(
                 )
                 fasta.append(str(uniprot_seq))
 
-    # Save
-    if save:
-        file = open("gget_seq_results.fa", "w")
-        for element in fasta:
-            file.write(element + "\n")
-        file.close()
-
     return fasta
@@ -10,6 +10,7 @@ import traceback     # For error traceback logging
 import platform      # For OS detection
 import stat          # For file permission constants
 import pandas as pd  # For data manipulation and CSV output
+import numpy as np   # For vectorized sequence filters
 import requests      # For HTTP requests to NCBI API
 import zipfile       # For extracting downloaded ZIP files
 from datetime import datetime  # For date handling
@@ -21,7 +22,7 @@ from urllib3.util.retry import Retry
 from requests.adapters import HTTPAdapter
 
 # Internal imports for logging, unique ID generation, and FASTA parsing
-from .utils import set_up_logger, FastaIO
+from .utils import set_up_logger, http_get, FastaIO, FastaBatch
 from .constants import NCBI_API_BASE, NCBI_EUTILS_BASE
 from .compile import PACKAGE_PATH
 
@@ -446,7 +447,7 @@ def fetch_virus_metadata(
                 # Make the HTTP GET request to the NCBI API  
                 logger.debug("Making API request to: %s (attempt %d/%d)", url, attempt + 1, max_retries)
                 logger.debug("Request parameters: %s", params)
-                response = requests.get(url, params=params, timeout=API_REQUEST_TIMEOUT)
+                response = http_get(url, params=params, timeout=API_REQUEST_TIMEOUT)
                 logger.debug("Explicit URL request sent: %s", response.url)
                 
                 # Raise an exception if the HTTP request failed (4xx or 5xx status codes)
@@ -1607,7 +1608,7 @@ def _download_sequences_single_batch(accessions, NCBI_EUTILS_BASE, fasta_path, f
         logger.debug("E-utilities URL: %s", NCBI_EUTILS_BASE)
         
         # Make the request with extended timeout for large datasets
-        response = requests.get(NCBI_EUTILS_BASE, params=params, timeout=EUTILS_TIMEOUT)
+        response = http_get(NCBI_EUTILS_BASE, params=params, timeout=EUTILS_TIMEOUT)
         
         # Check if the request was successful
         response.raise_for_status()
@@ -1706,7 +1707,7 @@ def _download_sequences_batched(accessions, NCBI_EUTILS_BASE, fasta_path, batch_
                 
                 try:
                     # Make the request with timeout
-                    response = requests.get(NCBI_EUTILS_BASE, params=params, timeout=EUTILS_TIMEOUT)
+                    response = http_get(NCBI_EUTILS_BASE, params=params, timeout=EUTILS_TIMEOUT)
                     response.raise_for_status()
                     
                     # Verify we got FASTA data
@@ -2085,6 +2086,7 @@ def filter_sequences(
     max_ambiguous_chars=None,
     has_proteins=None,
     proteins_complete=False,
+    workers=1,
 ):
     """
     Apply sequence-dependent filters to downloaded sequences.
@@ -2103,16 +2105,18 @@ def filter_sequences(
         max_ambiguous_chars (int): Maximum number of ambiguous nucleotides allowed
         has_proteins (str/list): Required proteins/genes filter
         proteins_complete (bool): Whether proteins must be complete
+        workers (int): Number of worker processes used to parse the FASTA file (default: 1)
         
     Returns:
         tuple: (filtered_sequences, filtered_metadata, protein_headers)
+            filtered_sequences is a FastaBatch; iterating it yields FastaRecord objects
     """
     logger.info("Applying sequence-dependent filters...")
     logger.debug("Sequence filters: max_ambiguous=%s, proteins=%s, complete=%s",
                 max_ambiguous_chars, has_proteins, proteins_complete)
     
     # Initialize lists to store filtered results
-    filtered_sequences = []    # Will store FastaRecord objects that pass filters
+    filtered_batches = []      # Will store FastaBatch objects with the sequences that pass filters
     filtered_metadata = []     # Will store corresponding metadata dictionaries
     protein_headers = []       # Will store protein/segment information from FASTA headers
     
@@ -2126,46 +2130,51 @@ def filter_sequences(
 
     # Read and process sequences from the FASTA file
     logger.info("Reading sequences from FASTA file: %s", fna_file)
-    for record in FastaIO.parse(fna_file, "fasta"):
-        total_sequences += 1
-        record_passes = True
-            
+    # Large downloads are split at record boundaries and can be parsed in worker processes.
+    # Sequences stay in compact columnar batches instead of one object per record.
+    for batch in FastaIO.parse_parallel(fna_file, workers=workers, batches=True):
+        total_sequences += len(batch)
+        keep = np.ones(len(batch), dtype=bool)
+
         # Count ambiguous characters (N's)
         if max_ambiguous_chars is not None:
-            ambiguous_count = record.seq.upper().count('N')
-            if ambiguous_count > max_ambiguous_chars:
-                filter_stats['ambiguous_chars'] += 1
-                record_passes = False
-                continue
-        
-        # Get metadata for this record to check protein information
-        record_metadata = metadata_dict.get(record.id, {})
-        
-        # Check protein requirements if specified
-        if has_proteins is not None or proteins_complete:
-            protein_check_passed = _check_protein_requirements(
-                record, 
-                record_metadata, 
-                has_proteins, 
-                proteins_complete
-            )
-            
-            if not protein_check_passed:
-                filter_stats['proteins'] += 1
-                record_passes = False
-                logger.debug("Sequence %s failed protein requirements", record.id)
-                continue
-        
-        # If sequence passed all filters, keep it and its metadata
-        if record_passes:
-            filtered_sequences.append(record)
+            ambiguous_fail = batch.count('Nn') > max_ambiguous_chars
+            filter_stats['ambiguous_chars'] += int(ambiguous_fail.sum())
+            keep &= ~ambiguous_fail
+
+        for i in np.flatnonzero(keep):
+            record = batch[i]
+
+            # Get metadata for this record to check protein information
+            record_metadata = metadata_dict.get(record.id, {})
+
+            # Check protein requirements if specified
+            if has_proteins is not None or proteins_complete:
+                protein_check_passed = _check_protein_requirements(
+                    record, 
+                    record_metadata, 
+                    has_proteins, 
+                    proteins_complete
+                )
+
+                if not protein_check_passed:
+                    filter_stats['proteins'] += 1
+                    keep[i] = False
+                    logger.debug("Sequence %s failed protein requirements", record.id)
+                    continue
+
+            # If sequence passed all filters, keep its metadata
             filtered_metadata.append(record_metadata)
-            
+
             # Extract protein/segment information from FASTA header for CSV output
             # This is useful for segmented viruses like influenza
             protein_info = _extract_protein_info_from_header(record.description)
             protein_headers.append(protein_info)
 
+        filtered_batches.append(batch.select(keep))
+
+    filtered_sequences = FastaBatch.concat(filtered_batches)
+
     # Log filtering results
     logger.info("Sequence filter results:")
     logger.info("- Total sequences processed: %d", total_sequences)
@@ -3758,6 +3767,7 @@ def virus(
     genbank_metadata=False,
     genbank_batch_size=200,
     download_all_accessions=False,
+    parse_workers=1,
     ):
     """
     Download a virus genome dataset from the NCBI Virus database (https://www.ncbi.nlm.nih.gov/labs/virus/).
@@ -3804,6 +3814,8 @@ def virus(
         genbank_batch_size (int): Batch size for GenBank API requests (default: 200)
         keep_temp (bool): Flag to indicate if all output files should be saved, including intermediate files (default: False)
         refseq_only (bool): Whether to restrict to RefSeq sequences only
+        parse_workers (int): Number of worker processes used to parse the downloaded FASTA file (default: 1).
+            Values above 1 start a process pool, so scripts need an `if __name__ == "__main__":` guard.
 
     Returns:
         None: Files are saved to the output directory
@@ -4267,7 +4279,9 @@ def virus(
 
         if filters_seq["max_ambiguous_chars"] is None and filters_seq["has_proteins"] is None and not filters_seq["proteins_complete"]:
             logger.info("No sequence-dependent filters specified, skipping this step.")
-            filtered_sequences = list(FastaIO.parse(fna_file, "fasta"))
+            filtered_sequences = FastaBatch.concat(
+                FastaIO.parse_parallel(fna_file, workers=parse_workers, batches=True)
+            )
             filtered_metadata_final = filtered_metadata  # No change to metadata
             protein_headers = []
             logger.info("All %d downloaded sequences will be saved", len(filtered_sequences))
@@ -4279,6 +4293,7 @@ def virus(
                 fna_file,
                 filtered_metadata_dict,
                 **filters_seq,
+                workers=parse_workers,
             )
 
     # SECTION 7: SAVING FINAL OUTPUT FILES
@@ -10,7 +10,6 @@ dt_string = datetime.now().strftime("%Y_%m_%d-%H_%M")
 
 import os
 import json
-import subprocess
 
 from .utils import set_up_logger
 
@@ -20,7 +19,7 @@ from .__init__ import __version__
 
 # Module functions
 from .gget_ref import ref
-from .gget_search import search
+from .gget_search import search, build_search_index
 from .gget_info import info
 from .gget_seq import seq
 from .gget_muscle import muscle
@@ -114,6 +113,7 @@ def main():
         default=None,
         help=(
             "Species or database to be searched. Species should be passed in the format 'genus_species', e.g. 'homo_sapiens'.\n"
+            "Several species can be passed as a comma-separated list, e.g. 'homo_sapiens,mus_musculus'.\n"
             "Supported shortcuts: 'human', 'mouse', 'human_grch37' (accesses the GRCh37 genome assembly)"
         ),
     )
@@ -180,7 +180,18 @@ def main():
         default=False,
         action="store_true",
         required=False,
-        help="Download FTPs to the directory specified by --out_dir using curl.",
+        help=(
+            "Download FTPs to the directory specified by --out_dir.\n"
+            "Files are downloaded in parallel, interrupted downloads are resumed, and files are verified against the Ensembl CHECKSUMS."
+        ),
+    )
+    parser_ref.add_argument(
+        "-dc",
+        "--decompress",
+        default=False,
+        action="store_true",
+        required=False,
+        help="Decompress the downloaded .gz files into the directory specified by --out_dir (use with --download).",
     )
     parser_ref.add_argument(
         "-od",
@@ -297,6 +308,44 @@ def main():
         required=False,
         help="Limits the number of results, e.g. 10 (default: None).",
     )
+    parser_gget.add_argument(
+        "-b",
+        "--backend",
+        choices=["remote", "local"],
+        default="remote",
+        type=str,
+        required=False,
+        help=(
+            "'remote': Queries the Ensembl MySQL server (default).\n"
+            "'local': Queries a local full-text index of the species database (see --build_index)."
+        ),
+    )
+    parser_gget.add_argument(
+        "-bi",
+        "--build_index",
+        default=False,
+        action="store_true",
+        required=False,
+        help="Builds (or rebuilds) the local search index of the species database before searching it (implies --backend local).",
+    )
+    parser_gget.add_argument(
+        "--dump_dir",
+        type=str,
+        default=None,
+        required=False,
+        help=(
+            "Path to a local copy of the MySQL dump of the core database used to build the local search index,\n"
+            "e.g. a download of http://ftp.ensembl.org/pub/current/mysql/homo_sapiens_core_110_38/.\n"
+            "Default: None -> the index is built by querying the Ensembl MySQL server."
+        ),
+    )
+    parser_gget.add_argument(
+        "--index_dir",
+        type=str,
+        default=None,
+        required=False,
+        help="Directory of the local search indexes (default: 'search_index' in the gget cache directory).",
+    )
     parser_gget.add_argument(
         "-csv",
         "--csv",
@@ -612,6 +661,17 @@ def main():
             "Default: Standard out."
         ),
     )
+    parser_info.add_argument(
+        "--cache",
+        choices=["off", "read", "readwrite"],
+        default=None,
+        type=str,
+        required=False,
+        help=(
+            "Read server responses from ('read') and/or write them to ('readwrite') the persistent gget cache.\n"
+            "Default: value of environment variable GGET_CACHE, or 'off'."
+        ),
+    )
     parser_info.add_argument(
         "-eo",
         "--ensembl_only",
@@ -688,6 +748,7 @@ def main():
         required=False,
         help=(
             "Path to the FASTA file the results will be saved in, e.g. path/to/directory/results.fa.\n"
+            "The file is gzip-compressed if the path ends with '.gz'.\n"
             "Default: Standard out."
         ),
     )
@@ -699,6 +760,17 @@ def main():
         required=False,
         help="Does not print progress information.",
     )
+    parser_seq.add_argument(
+        "--cache",
+        choices=["off", "read", "readwrite"],
+        default=None,
+        type=str,
+        required=False,
+        help=(
+            "Read server responses from ('read') and/or write them to ('readwrite') the persistent gget cache.\n"
+            "Default: value of environment variable GGET_CACHE, or 'off'."
+        ),
+    )
     parser_seq.add_argument(
         "-id",
         "--ens_ids",
@@ -2690,6 +2762,13 @@ def main():
         required=False,
         help="Maximum number of accessions to fetch in each GenBank metadata request. Smaller batches are slower but more reliable for large datasets. Only used when --genbank_metadata is True. Default: 200",
     )
+    parser_virus.add_argument(
+        "--parse_workers",
+        default=1,
+        type=int,
+        required=False,
+        help="Number of worker processes used to parse the downloaded FASTA file. Default: 1",
+    )
     parser_virus.add_argument(
         "-q",
         "--quiet",
@@ -3171,13 +3250,21 @@ def main():
         which_clean = args.which.split(",")
 
         if args.species:
+            ## Clean up 'species' entry (split by comma to fetch several species)
+            species_clean = [sp for sp in args.species.split(",") if sp != ""]
+            if len(species_clean) == 1:
+                species_clean = species_clean[0]
+
             # Query Ensembl for requested FTPs using function ref
             ref_results = ref(
-                species=args.species,
+                species=species_clean,
                 which=which_clean,
                 release=args.release,
                 ftp=args.ftp,
                 verbose=args.quiet,
+                download=args.download,
+                out_dir=args.out_dir,
+                decompress=args.decompress,
             )
 
             # Print or save list of URLs (ftp=True)
@@ -3196,18 +3283,6 @@ def main():
                     for ref_res in ref_results:
                         print(ref_res)
 
-                # Either way, download the files if download flag is set
-                if args.download:
-                    if args.out_dir is not None and args.out_dir != "":
-                        os.makedirs(args.out_dir, exist_ok=True)
-
-                    # Download list of URLs
-                    for link in ref_results:
-                        if args.out_dir:
-                            subprocess.run(["curl", "--output-dir", args.out_dir, "-O", link], check=True)
-                        else:
-                            subprocess.run(["curl", "-O", link], check=True)
-
             # Print or save json file (ftp=False)
             else:
                 # Save in specified directory if -o specified
@@ -3222,20 +3297,6 @@ def main():
                 else:
                     print(json.dumps(ref_results, ensure_ascii=False, indent=4))
 
-                # Either way, download the files if download flag is set
-                if args.download:
-                    if args.out_dir is not None and args.out_dir != "":
-                        os.makedirs(args.out_dir, exist_ok=True)
-
-                    # Download the URLs from the dictionary
-                    for sp in ref_results:
-                        for ftp_type in ref_results[sp]:
-                            link = ref_results[sp][ftp_type]["ftp"]
-                            if args.out_dir:
-                                subprocess.run(["curl", "--output-dir", args.out_dir, "-O", link], check=True)
-                            else:
-                                subprocess.run(["curl", "-O", link], check=True)
-
     ## search return
     if args.command == "search":
         # Handle deprecated flags for backwards compatibility
@@ -3262,6 +3323,17 @@ def main():
         while "" in sw_clean_final:
             sw_clean_final.remove("")
 
+        # Build the local search index
+        if args.build_index:
+            build_search_index(
+                args.species,
+                release=args.release,
+                dump_dir=args.dump_dir,
+                index_dir=args.index_dir,
+                verbose=args.quiet,
+            )
+            args.backend = "local"
+
         # Query Ensembl for genes based on species and searchwords using function search
         gget_results = search(
             sw_clean_final,
@@ -3273,6 +3345,8 @@ def main():
             limit=args.limit,
             json=args.csv,
             verbose=args.quiet,
+            backend=args.backend,
+            index_dir=args.index_dir,
         )
 
         # Save search results if args.out specified
@@ -3421,6 +3495,7 @@ def main():
             expand=args.expand,
             json=args.csv,
             verbose=args.quiet,
+            cache=args.cache,
         )
 
         # Check if the function returned something
@@ -3483,20 +3558,13 @@ def main():
             isoforms=args.isoforms,
             transcribe=args.transcribe,
             verbose=args.quiet,
+            cache=args.cache,
+            # Sequences are written to args.out as they are fetched
+            out=args.out,
         )
 
-        # Save in specified directory if -o specified
-        if args.out and seq_results != None:
-            directory = "/".join(args.out.split("/")[:-1])
-            if directory != "":
-                os.makedirs(directory, exist_ok=True)
-            file = open(args.out, "w")
-            for element in seq_results:
-                file.write(element + "\n")
-            file.close()
-
         # Print results if no directory specified
-        else:
+        if not args.out:
             if seq_results != None:
                 for seq_res in seq_results:
                     print(seq_res)
@@ -3804,4 +3872,5 @@ def main():
             genbank_metadata=args.genbank_metadata,
             genbank_batch_size=args.genbank_batch_size,
             download_all_accessions=args.download_all_accessions,
+            parse_workers=args.parse_workers,
         )
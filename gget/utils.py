@@ -1,11 +1,31 @@
 from bs4 import BeautifulSoup
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-# from requests.adapters import HTTPAdapter, Retry
 # import time
 import re
 import os
+import gzip
+import shutil
+import subprocess
 import uuid
+import time
+import email.utils
+import json as json_package
+import hashlib
+import io
+import mmap
+import struct
+import zlib
+import bisect
+import sqlite3
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from collections import deque
+from urllib.parse import urlparse
 import pandas as pd
 import numpy as np
 from IPython.display import display, HTML
@@ -21,6 +41,7 @@ from .constants import (
     ENSEMBL_FTP_URL_NV,
     ENS_TO_PDB_API,
     COSMIC_RELEASE_URL,
+    NCBI_EUTILS_URL,
 )
 
 
@@ -59,6 +80,473 @@ def set_up_logger():
 logger = set_up_logger()
 
 
+# Shared HTTP client configuration (can be overridden using environment variables or configure_http)
+HTTP_TIMEOUT = float(os.getenv("GGET_HTTP_TIMEOUT", 60))  # Seconds per connect/read
+# Number of hosts to keep connection pools for and keep-alive connections per host
+HTTP_POOL_CONNECTIONS = int(os.getenv("GGET_HTTP_POOL_CONNECTIONS", 20))
+HTTP_POOL_MAXSIZE = int(os.getenv("GGET_HTTP_POOL_MAXSIZE", 10))
+HTTP_MAX_RETRIES = int(os.getenv("GGET_HTTP_MAX_RETRIES", 3))
+HTTP_BACKOFF_FACTOR = float(os.getenv("GGET_HTTP_BACKOFF_FACTOR", 0.5))
+HTTP_RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+# POST is not retried since it is not idempotent for every endpoint (e.g. BLAST submissions)
+# Read-only POST queries are retried with request_with_retries instead
+HTTP_RETRY_METHODS = frozenset(["GET", "HEAD"])
+HTTP_MAX_RETRY_AFTER = 60  # Maximum number of seconds to wait for a Retry-After header
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+
+def _build_http_session():
+    """
+    Build a requests session with keep-alive connection pools and retry/backoff.
+    """
+    try:
+        retry_strategy = Retry(
+            total=HTTP_MAX_RETRIES,
+            backoff_factor=HTTP_BACKOFF_FACTOR,
+            status_forcelist=HTTP_RETRY_STATUS_CODES,
+            allowed_methods=HTTP_RETRY_METHODS,
+            raise_on_status=False,
+        )
+    except TypeError:
+        # Fallback for older urllib3 versions that use method_whitelist
+        retry_strategy = Retry(
+            total=HTTP_MAX_RETRIES,
+            backoff_factor=HTTP_BACKOFF_FACTOR,
+            status_forcelist=HTTP_RETRY_STATUS_CODES,
+            method_whitelist=HTTP_RETRY_METHODS,
+            raise_on_status=False,
+        )
+
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        max_retries=retry_strategy,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    return session
+
+
+def get_http_session():
+    """
+    Returns the process-wide requests session shared by all gget modules.
+    Connections are kept alive and reused per host.
+    """
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                _http_session = _build_http_session()
+
+    return _http_session
+
+
+def configure_http(
+    timeout=None,
+    pool_connections=None,
+    pool_maxsize=None,
+    max_retries=None,
+    backoff_factor=None,
+):
+    """
+    Configure the shared HTTP client. Arguments that are None are left unchanged.
+    The current session is closed and rebuilt on next use.
+
+    Args:
+    - timeout           Timeout in seconds for each request.
+    - pool_connections  Number of hosts for which connection pools are kept.
+    - pool_maxsize      Maximum number of keep-alive connections per host.
+    - max_retries       Number of retries for failed connections and retryable status codes.
+    - backoff_factor    Backoff factor between retries (sleeps backoff_factor * 2^(retry - 1) seconds).
+    """
+    global _http_session, HTTP_TIMEOUT, HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE
+    global HTTP_MAX_RETRIES, HTTP_BACKOFF_FACTOR
+
+    with _http_session_lock:
+        if timeout is not None:
+            HTTP_TIMEOUT = timeout
+        if pool_connections is not None:
+            HTTP_POOL_CONNECTIONS = pool_connections
+        if pool_maxsize is not None:
+            HTTP_POOL_MAXSIZE = pool_maxsize
+        if max_retries is not None:
+            HTTP_MAX_RETRIES = max_retries
+        if backoff_factor is not None:
+            HTTP_BACKOFF_FACTOR = backoff_factor
+
+        if _http_session is not None:
+            _http_session.close()
+            _http_session = None
+
+
+def http_get(url, **kwargs):
+    """
+    Perform a GET request through the shared HTTP session.
+    Takes the same keyword arguments as requests.get (default timeout: HTTP_TIMEOUT).
+    """
+    kwargs.setdefault("timeout", HTTP_TIMEOUT)
+    return get_http_session().get(url, **kwargs)
+
+
+def http_post(url, **kwargs):
+    """
+    Perform a POST request through the shared HTTP session.
+    Takes the same keyword arguments as requests.post (default timeout: HTTP_TIMEOUT).
+    """
+    kwargs.setdefault("timeout", HTTP_TIMEOUT)
+    return get_http_session().post(url, **kwargs)
+
+
+def _retry_after_seconds(r):
+    """
+    Returns the number of seconds requested by the Retry-After header of a response
+    (None if the header is missing or invalid).
+    """
+    value = r.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    date = email.utils.parsedate_tz(value)
+    if date is None:
+        return None
+    return max(email.utils.mktime_tz(date) - time.time(), 0)
+
+
+def request_with_retries(send, retry_timeouts=True):
+    """
+    Perform an idempotent request, e.g. a read-only POST query, which the shared session does not retry.
+    Responses with a retryable status code (HTTP_RETRY_STATUS_CODES) and connection errors are retried
+    up to HTTP_MAX_RETRIES times. Between attempts, waits for the time in the Retry-After header
+    (at most HTTP_MAX_RETRY_AFTER seconds) or backoff_factor * 2^(retry - 1) seconds.
+
+    Args:
+    - send              Function without arguments that performs the request and returns the response.
+    - retry_timeouts    If False, timeouts are raised without retrying (e.g. to retry a smaller request).
+
+    Returns the response of the last attempt.
+    """
+    for attempt in range(HTTP_MAX_RETRIES + 1):
+        last_attempt = attempt == HTTP_MAX_RETRIES
+        r = None
+        try:
+            r = send()
+        except requests.Timeout:
+            if not retry_timeouts or last_attempt:
+                raise
+        except requests.ConnectionError:
+            if last_attempt:
+                raise
+
+        if r is not None:
+            if r.status_code not in HTTP_RETRY_STATUS_CODES or last_attempt:
+                return r
+            delay = _retry_after_seconds(r)
+            logger.debug(
+                f"{r.url} returned status code {r.status_code}. Retrying (attempt {attempt + 1} of {HTTP_MAX_RETRIES})."
+            )
+        else:
+            delay = None
+
+        if delay is None:
+            delay = HTTP_BACKOFF_FACTOR * 2**attempt
+        time.sleep(min(delay, HTTP_MAX_RETRY_AFTER))
+
+
+# Persistent response cache configuration (can be overridden using environment variables or configure_cache)
+CACHE_DIR = os.getenv(
+    "GGET_CACHE_DIR",
+    os.path.join(
+        os.getenv("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+        "gget",
+    ),
+)
+CACHE_MAX_SIZE = int(os.getenv("GGET_CACHE_MAX_SIZE", 2 * 1024**3))  # Bytes
+CACHE_MODES = ("off", "read", "readwrite")
+# Time to live (in seconds) of cached responses per host
+CACHE_TTLS = {
+    "rest.ensembl.org": 7 * 24 * 3600,
+    "rest.uniprot.org": 7 * 24 * 3600,
+    "eutils.ncbi.nlm.nih.gov": 7 * 24 * 3600,
+    "www.ncbi.nlm.nih.gov": 7 * 24 * 3600,
+    "www.ebi.ac.uk": 7 * 24 * 3600,
+}
+CACHE_DEFAULT_TTL = 24 * 3600
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+class ResponseCache:
+    """
+    Persistent, content-addressed cache for server responses.
+
+    Entries are keyed by a hash of the request method, URL and payload and stored in a
+    SQLite database inside cache_dir. Entries expire after the TTL defined for their host
+    and the least recently used entries are evicted once the cache exceeds max_size bytes.
+    """
+
+    def __init__(
+        self,
+        cache_dir=CACHE_DIR,
+        max_size=CACHE_MAX_SIZE,
+        ttls=None,
+        default_ttl=CACHE_DEFAULT_TTL,
+    ):
+        self.cache_dir = cache_dir
+        self.path = os.path.join(cache_dir, "responses.sqlite")
+        self.max_size = max_size
+        self.ttls = dict(CACHE_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            conn = sqlite3.connect(
+                self.path, timeout=30, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, host TEXT, created REAL, accessed REAL, size INTEGER, body TEXT)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)"
+            )
+            self._conn = conn
+
+        return self._conn
+
+    @staticmethod
+    def make_key(method, url, payload=None):
+        """
+        Returns the cache key for a request based on its method, URL and payload.
+        """
+        payload_hash = ""
+        if payload:
+            payload_hash = hashlib.sha256(
+                json_package.dumps(payload, sort_keys=True, default=str).encode()
+            ).hexdigest()
+
+        return hashlib.sha256(
+            f"{method.upper()} {url} {payload_hash}".encode()
+        ).hexdigest()
+
+    def ttl(self, url):
+        """
+        Returns the time to live (in seconds) of responses from the host of url.
+        """
+        return self.ttls.get(urlparse(url).hostname, self.default_ttl)
+
+    def get(self, key, url, update=True):
+        """
+        Returns the cached body for key, or None if there is no valid entry.
+        If update is False, the cache is not modified: the access time used for LRU eviction
+        is not updated, expired entries are not deleted and no cache database is created.
+        """
+        with self._lock:
+            if not update and self._conn is None and not os.path.exists(self.path):
+                return None
+
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT created, body FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            now = time.time()
+            if now - row[0] > self.ttl(url):
+                if update:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+
+            if update:
+                conn.execute(
+                    "UPDATE responses SET accessed = ? WHERE key = ?", (now, key)
+                )
+
+            return row[1]
+
+    def set(self, key, url, body):
+        """
+        Save body under key and evict the least recently used entries if the cache is too large.
+        """
+        size = len(body.encode("utf-8"))
+        if size > self.max_size:
+            return
+
+        with self._lock:
+            conn = self._connect()
+            now = time.time()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, urlparse(url).hostname, now, now, size, body),
+            )
+            self._evict(conn)
+
+    def _evict(self, conn):
+        total_size = conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+        if total_size <= self.max_size:
+            return
+
+        to_delete = []
+        for key, size in conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed"
+        ):
+            to_delete.append((key,))
+            total_size -= size
+            if total_size <= self.max_size:
+                break
+
+        conn.executemany("DELETE FROM responses WHERE key = ?", to_delete)
+
+    def clear(self):
+        """
+        Delete all cached responses.
+        """
+        with self._lock:
+            self._connect().execute("DELETE FROM responses")
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def get_response_cache():
+    """
+    Returns the process-wide persistent response cache.
+    """
+    global _response_cache
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache()
+
+    return _response_cache
+
+
+def configure_cache(cache_dir=None, max_size=None, ttls=None, default_ttl=None):
+    """
+    Configure the persistent response cache. Arguments that are None are left unchanged.
+
+    Args:
+    - cache_dir     Directory the cache is saved in (default: GGET_CACHE_DIR or ~/.cache/gget).
+    - max_size      Maximum size of the cache in bytes. Least recently used entries are evicted first.
+    - ttls          Dictionary of host: time to live (in seconds) for cached responses.
+    - default_ttl   Time to live (in seconds) for responses from hosts not in ttls.
+    """
+    global _response_cache, CACHE_DIR, CACHE_MAX_SIZE, CACHE_DEFAULT_TTL
+
+    with _response_cache_lock:
+        if cache_dir is not None:
+            CACHE_DIR = cache_dir
+        if max_size is not None:
+            CACHE_MAX_SIZE = max_size
+        if ttls is not None:
+            CACHE_TTLS.update(ttls)
+        if default_ttl is not None:
+            CACHE_DEFAULT_TTL = default_ttl
+
+        if _response_cache is not None:
+            _response_cache.close()
+        _response_cache = ResponseCache(
+            cache_dir=CACHE_DIR,
+            max_size=CACHE_MAX_SIZE,
+            default_ttl=CACHE_DEFAULT_TTL,
+        )
+
+
+def check_cache_mode(cache):
+    """
+    Validate the cache argument of a gget function.
+    None falls back on the environment variable GGET_CACHE (default: 'off').
+    """
+    if cache is None:
+        cache = os.getenv("GGET_CACHE", "off")
+
+    if cache not in CACHE_MODES:
+        raise ValueError(
+            f"Argument 'cache' specified as {cache}. Expected one of: {', '.join(CACHE_MODES)}"
+        )
+
+    return cache
+
+
+class CachedResponse:
+    """
+    Minimal stand-in for requests.Response returned for cache hits.
+    """
+
+    status_code = 200
+    ok = True
+
+    def __init__(self, url, text):
+        self.url = url
+        self.text = text
+
+    def json(self):
+        return json_package.loads(self.text)
+
+
+def cached_request(method, url, cache=None, **kwargs):
+    """
+    Perform a request through the shared HTTP session and the persistent response cache.
+
+    Args:
+    - method    'GET' or 'POST'.
+    - url       URL to query.
+    - cache     'off', 'read' or 'readwrite'. Whether cached responses are read and/or
+                successful responses are written to the cache (default: GGET_CACHE or 'off').
+    - kwargs    Passed to requests (params, json, data, headers, timeout, ...).
+
+    Returns a requests.Response (or a CachedResponse for cache hits).
+    """
+    cache = check_cache_mode(cache)
+
+    key = None
+    if cache != "off":
+        payload = {
+            arg: kwargs[arg]
+            for arg in ("params", "json", "data", "headers")
+            if kwargs.get(arg) is not None
+        }
+        key = ResponseCache.make_key(method, url, payload)
+        try:
+            # Only 'readwrite' modifies the cache (access times and expired entries)
+            body = get_response_cache().get(key, url, update=cache == "readwrite")
+        except sqlite3.Error as e:
+            logger.debug(f"Reading from the gget cache failed: {e}")
+            body = None
+        if body is not None:
+            return CachedResponse(url, body)
+
+    if method.upper() == "POST":
+        r = http_post(url, **kwargs)
+    else:
+        r = http_get(url, **kwargs)
+
+    if cache == "readwrite" and r.ok:
+        try:
+            get_response_cache().set(key, url, r.text)
+        except sqlite3.Error as e:
+            logger.debug(f"Writing to the gget cache failed: {e}")
+
+    return r
+
+
 def flatten(xss):
     """
     Function to flatten a list of lists.
@@ -67,7 +555,7 @@ def flatten(xss):
 
 
 def get_latest_cosmic():
-    html = requests.get(COSMIC_RELEASE_URL)
+    html = http_get(COSMIC_RELEASE_URL)
     if html.status_code != 200:
         raise RuntimeError(
             f"The COSMIC server returned error status code {html.status_code}. Please try again."
@@ -102,45 +590,58 @@ def check_file_for_error_message(filepath, filename, download_path):
         )
 
 
-def read_fasta(fasta):
+def iter_fasta(fasta):
     """
+    Stream the records of a fasta file one at a time.
+
     Args:
     - fasta     (str) Path to fasta file.
 
-    Returns titles and seqs from fasta file as two list objects.
+    Yields (title, seq) tuples. Sequence lines are collected in a list and joined once per
+    record, so parsing time is linear in the file size and only one record is held in memory.
     """
-    titles = []
-    seqs = []
-    title_last = False
-    new_seq = False
-    with open(fasta) as fasta_file:
+    with open_fasta(fasta) as fasta_file:
+        title = None
+        seq_lines = []
+        title_last = False
         for i, line in enumerate(fasta_file):
-            if i == 0 and line[0] != ">":
-                raise ValueError("Expected FASTA file to start with a '>' character. ")
-            elif line[0] == ">":
+            if line[0] == ">":
                 if title_last:
                     raise ValueError(
                         "FASTA file contains two lines starting with '>' in a row -> missing sequence line. "
                     )
 
-                if new_seq:
-                    # Append last recorded sequence
-                    seqs.append(new_seq)
+                if title is not None:
+                    yield title, "".join(seq_lines)
 
-                # Append title line to titles list
-                titles.append(line.strip().replace(">", ""))
+                title = line.strip().replace(">", "")
+                seq_lines = []
                 title_last = True
 
+            elif i == 0:
+                raise ValueError("Expected FASTA file to start with a '>' character. ")
+
             else:
-                if title_last:
-                    # Start recording new sequence if title was last
-                    new_seq = line.strip()
-                else:
-                    new_seq = new_seq + line.strip()
+                seq_lines.append(line.strip())
                 title_last = False
 
-        # Append last sequence
-        seqs.append(new_seq)
+        if title is not None:
+            yield title, "".join(seq_lines)
+
+
+def read_fasta(fasta):
+    """
+    Args:
+    - fasta     (str) Path to fasta file.
+
+    Returns titles and seqs from fasta file as two list objects.
+    Use iter_fasta() to stream large files instead of loading all records at once.
+    """
+    titles = []
+    seqs = []
+    for title, seq in iter_fasta(fasta):
+        titles.append(title)
+        seqs.append(seq)
 
     return titles, seqs
 
@@ -259,13 +760,145 @@ def aa_colors(amino_acid):
     return f"\033[38;5;{textcolor}m\033[48;5;{bkg_color}m{amino_acid}\033[0;0m"
 
 
-def get_uniprot_seqs(server, ensembl_ids):
+# UniProt batch query configuration
+UNIPROT_BATCH_SIZE = 50  # Number of IDs OR-joined into a single UniProt search
+UNIPROT_PAGE_SIZE = 500  # Maximum number of entries returned per UniProt search
+UNIPROT_MAX_WORKERS = 4  # Number of UniProt searches submitted concurrently
+UNIPROT_REQUESTS_PER_SECOND = 10
+
+
+class RateLimiter:
+    """
+    Thread-safe rate limiter which spaces out calls to wait() to at most max_per_second per second.
+    """
+
+    def __init__(self, max_per_second):
+        self.interval = 1 / max_per_second
+        self._lock = threading.Lock()
+        self._next_time = 0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            wait_time = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+
+def _uniprot_search(server, ids, reviewed, rate_limiter, cache=None):
+    """
+    Submit a single OR-joined UniProt search for a batch of IDs.
+    Batches that fail or whose results might have been truncated are split in half and resubmitted.
+
+    Returns dictionary of ID: list of matching UniProt entries (json).
+    """
+    # API documentation: https://www.uniprot.org/help/api_queries
+    query = "(" + "+OR+".join(ids) + ")"
+    if reviewed:
+        query += "+AND+reviewed:true"
+
+    rate_limiter.wait()
+    r = cached_request(
+        "GET", server + query + f"&size={UNIPROT_PAGE_SIZE}", cache=cache
+    )
+    if r.ok:
+        results = r.json()["results"]
+
+    if len(ids) > 1 and (not r.ok or len(results) >= UNIPROT_PAGE_SIZE):
+        half = len(ids) // 2
+        matches = _uniprot_search(server, ids[:half], reviewed, rate_limiter, cache)
+        matches.update(
+            _uniprot_search(server, ids[half:], reviewed, rate_limiter, cache)
+        )
+        return matches
+
+    if not r.ok:
+        logger.error(
+            f"UniProt server request returned with error status code: {r.status_code}. Please double-check arguments or try again later."
+        )
+        return {id_: [] for id_ in ids}
+
+    if len(ids) == 1:
+        return {ids[0]: results}
+
+    # Assign each entry to the IDs it contains (IDs are matched as whole words)
+    patterns = {
+        id_: re.compile(r"(?<!\w)" + re.escape(id_) + r"(?!\w)", re.IGNORECASE)
+        for id_ in ids
+    }
+    matches = {id_: [] for id_ in ids}
+    for result in results:
+        result_text = json_package.dumps(result)
+        for id_, pattern in patterns.items():
+            if pattern.search(result_text):
+                matches[id_].append(result)
+
+    return matches
+
+
+def get_uniprot_entries(server, ensembl_ids, verbose=True, cache=None):
+    """
+    Fetch UniProt entries for Ensembl, WormBase or FlyBase identifiers.
+    IDs are packed into OR-joined UniProt searches of UNIPROT_BATCH_SIZE IDs,
+    which are submitted concurrently under a rate limit.
+
+    Args:
+    - server        Link to UniProt REST API server.
+    - ensembl_ids   List of Ensembl, WormBase or FlyBase IDs.
+    - verbose       True/False to print logging messages.
+    - cache         'off', 'read' or 'readwrite' (see cached_request).
+
+    Returns dictionary of ID: list of UniProt entries (json). Reviewed entries are returned
+    if available, otherwise all unreviewed entries are returned.
+    """
+    unique_ids = list(dict.fromkeys(ensembl_ids))
+    rate_limiter = RateLimiter(UNIPROT_REQUESTS_PER_SECOND)
+
+    def search_batches(ids, reviewed):
+        batches = [
+            ids[i : i + UNIPROT_BATCH_SIZE]
+            for i in range(0, len(ids), UNIPROT_BATCH_SIZE)
+        ]
+        matches = {}
+        with ThreadPoolExecutor(max_workers=UNIPROT_MAX_WORKERS) as executor:
+            for batch_matches in executor.map(
+                lambda batch: _uniprot_search(
+                    server, batch, reviewed, rate_limiter, cache
+                ),
+                batches,
+            ):
+                matches.update(batch_matches)
+
+        return matches
+
+    entries = search_batches(unique_ids, reviewed=True)
+
+    # If no reviewed results were found, try again for unreviewed results
+    unreviewed_ids = [id_ for id_ in unique_ids if len(entries[id_]) == 0]
+    if len(unreviewed_ids) > 0:
+        unreviewed_entries = search_batches(unreviewed_ids, reviewed=False)
+        for id_ in unreviewed_ids:
+            entries[id_] = unreviewed_entries[id_]
+
+            # Warn user if unreviewed results were found
+            if len(entries[id_]) > 0 and verbose:
+                logger.warning(
+                    f"No reviewed UniProt results were found for ID {id_}. Returning all unreviewed results."
+                )
+
+    return entries
+
+
+def get_uniprot_seqs(server, ensembl_ids, cache=None):
     """
     Retrieve UniProt sequences based on Ensemsbl, WormBase or FlyBase identifiers.
 
     Args:
     - server        Link to UniProt REST API server.
     - ensembl_ids   One or more Ensembl, WormBase or FlyBase IDs (string or list of strings).
+    - cache         'off', 'read' or 'readwrite' (see cached_request).
 
     Returns data frame with UniProt ID, gene name, organism, sequence, sequence length, and query ID.
     """
@@ -274,82 +907,51 @@ def get_uniprot_seqs(server, ensembl_ids):
     if type(ensembl_ids) == str:
         ensembl_ids = [ensembl_ids]
 
-    # Initiate data frame so empty df will be returned if no matches are found
-    master_df = pd.DataFrame()
+    entries = get_uniprot_entries(server, ensembl_ids, cache=cache)
 
+    # Collect rows for all IDs and build the data frame once
+    rows = []
     for id_ in ensembl_ids:
-        # API documentation: https://www.uniprot.org/help/api_queries
-        # Submit server request
-        r = requests.get(server + id_ + "+AND+reviewed:true")
-        if not r.ok:
-            logger.error(
-                f"UniProt server request returned with error status code: {r.status_code}. Please double-check arguments or try again later."
-            )
-        # Convert to json
-        json = r.json()
-
-        # If no reviewed results were found, try again for unreviewed results
-        if not len(json["results"]) > 0:
-            # Submit server request
-            r = requests.get(server + id_)
-            if not r.ok:
-                logger.error(
-                    f"UniProt server request returned with error status code: {r.status_code}. Please double-check arguments or try again later."
-                )
-            # Convert to json
-            json = r.json()
-
-            # Warn user if unreviewed results were found
-            if len(json["results"]) > 0:
-                logger.warning(
-                    f"No reviewed UniProt results were found for ID {id_}. Returning all unreviewed results."
-                )
-
-        if len(json["results"]) > 0:
-            # Convert results to data frame
-            df = pd.json_normalize(json["results"])
-
-            # Remove non-relevant columns
-            df = df[
-                [
-                    "primaryAccession",
-                    "organism.scientificName",
-                    "sequence.value",
-                    "sequence.length",
-                ]
-            ]
-
-            # Rename columns
-            df.columns = [
-                "uniprot_id",
-                "organism",
-                "sequence",
-                "sequence_length",
-            ]
-
-            # Add gene name and query columns
-            gene_names = []
-            for i in np.arange(len(json["results"])):
+        if len(entries[id_]) > 0:
+            for result in entries[id_]:
                 try:
-                    gene_names.append(
-                        json["results"][i]["genes"][0]["geneName"]["value"]
-                    )
+                    gene_name = result["genes"][0]["geneName"]["value"]
                 except:
-                    gene_names.append(np.nan)
-            df["gene_name"] = gene_names
-            df["query"] = id_
-
-            # Append results for this ID to master data frame
-            master_df = pd.concat([master_df, df], axis=0)
+                    gene_name = np.nan
+
+                rows.append(
+                    [
+                        result["primaryAccession"],
+                        result["organism"]["scientificName"],
+                        result["sequence"]["value"],
+                        result["sequence"]["length"],
+                        gene_name,
+                        id_,
+                    ]
+                )
 
         else:
             # If no results were found, warn user and do nothing -> returns empty df
             logger.warning(f"No UniProt sequences were found for ID {id_}.")
 
-    return master_df
+    # Return empty data frame if no matches were found
+    if len(rows) == 0:
+        return pd.DataFrame()
 
+    return pd.DataFrame(
+        rows,
+        columns=[
+            "uniprot_id",
+            "organism",
+            "sequence",
+            "sequence_length",
+            "gene_name",
+            "query",
+        ],
+    )
 
-def get_uniprot_info(server, ensembl_id, verbose=True):
+
+def get_uniprot_info(server, ensembl_id, verbose=True, cache=None):
     """
     Retrieve UniProt synonyms and description based on Ensemsbl identifiers.
 
@@ -357,40 +959,40 @@ def get_uniprot_info(server, ensembl_id, verbose=True):
     - server          Link to UniProt REST API server.
     - ensembl_id      Ensembl, WormBase or FlyBase ID (str).
     - verbose         True/False to print logging messages.
+    - cache           'off', 'read' or 'readwrite' (see cached_request).
 
     Returns data frame with UniProt ID, gene name, organism, sequence, sequence length, and query ID.
     """
-    # API documentation: https://www.uniprot.org/help/api_queries
-    # Submit server request for reviewed entries
-    r = requests.get(server + ensembl_id + "+AND+reviewed:true")
-    if not r.ok:
-        logger.error(
-            f"UniProt server request returned with error status code: {r.status_code}. Please double-check arguments or try again later."
-        )
-    # Convert to json
-    json = r.json()
-
-    # If no reviewed entries were found, try again for unreviewed entries
-    if not len(json["results"]) > 0:
-        # Submit server request
-        r = requests.get(server + ensembl_id)
-        if not r.ok:
-            logger.error(
-                f"UniProt server request returned with error status code: {r.status_code}. Please double-check arguments or try again later."
-            )
-        # Convert to json
-        json = r.json()
+    return get_uniprot_info_bulk(server, [ensembl_id], verbose=verbose, cache=cache)[
+        ensembl_id
+    ]
 
-        # Warn user if unreviewed results were found
-        if len(json["results"]) > 0:
-            if verbose is True:
-                logger.warning(
-                    f"No reviewed UniProt results were found for ID {ensembl_id}. Returning all unreviewed results."
-                )
 
-    if len(json["results"]) > 0:
+def get_uniprot_info_bulk(server, ensembl_ids, verbose=True, cache=None):
+    """
+    Retrieve UniProt synonyms and descriptions for many Ensembl identifiers
+    using batched UniProt searches (see get_uniprot_entries).
+
+    Args:
+    - server          Link to UniProt REST API server.
+    - ensembl_ids     List of Ensembl, WormBase or FlyBase IDs.
+    - verbose         True/False to print logging messages.
+    - cache           'off', 'read' or 'readwrite' (see cached_request).
+
+    Returns dictionary of ID: data frame as returned by get_uniprot_info (None if no entry was found).
+    """
+    entries = get_uniprot_entries(server, ensembl_ids, verbose=verbose, cache=cache)
+
+    return {id_: _uniprot_info_df(results, id_) for id_, results in entries.items()}
+
+
+def _uniprot_info_df(results, ensembl_id):
+    """
+    Build the get_uniprot_info data frame from the UniProt entries found for ensembl_id.
+    """
+    if len(results) > 0:
         # Convert results to data frame
-        df = pd.json_normalize(json["results"])
+        df = pd.json_normalize(results)
 
         # Remove non-relevant columns
         df = df[
@@ -405,19 +1007,19 @@ def get_uniprot_info(server, ensembl_id, verbose=True):
 
         # Get primary gene name for each result
         gene_names = []
-        for i in np.arange(len(json["results"])):
+        for i in np.arange(len(results)):
             try:
-                gene_names.append(json["results"][i]["genes"][0]["geneName"]["value"])
+                gene_names.append(results[i]["genes"][0]["geneName"]["value"])
             except:
                 gene_names.append(np.nan)
         df["primary_gene_name"] = gene_names
 
         # Get synonyms for each result
         uni_synonyms = []
-        for i in np.arange(len(json["results"])):
+        for i in np.arange(len(results)):
             uni_syn_temp = []
             try:
-                for syn in json["results"][i]["genes"][0]["synonyms"]:
+                for syn in results[i]["genes"][0]["synonyms"]:
                     uni_syn_temp.append(syn["value"])
             except:
                 uni_syn_temp.append(np.nan)
@@ -426,12 +1028,12 @@ def get_uniprot_info(server, ensembl_id, verbose=True):
 
         # Get protein names for each result
         protein_names = []
-        for i in np.arange(len(json["results"])):
+        for i in np.arange(len(results)):
             try:
                 protein_names.append(
-                    json["results"][i]["proteinDescription"]["recommendedName"][
-                        "fullName"
-                    ]["value"]
+                    results[i]["proteinDescription"]["recommendedName"]["fullName"][
+                        "value"
+                    ]
                 )
             except:
                 protein_names.append(np.nan)
@@ -439,10 +1041,10 @@ def get_uniprot_info(server, ensembl_id, verbose=True):
 
         # Get descriptions for each result
         descriptions = []
-        for i in np.arange(len(json["results"])):
+        for i in np.arange(len(results)):
             des_temp = []
             try:
-                for text in json["results"][i]["comments"]:
+                for text in results[i]["comments"]:
                     if text["commentType"] == "FUNCTION":
                         des_temp.append(text["texts"][0]["value"])
                 # Keep only unique descriptions
@@ -457,11 +1059,11 @@ def get_uniprot_info(server, ensembl_id, verbose=True):
 
         # Get subcellular localisations for each result
         subcel_locs_final = []
-        for i in np.arange(len(json["results"])):
+        for i in np.arange(len(results)):
             subcel_locs = []
             try:
-                for comment_idx in np.arange(len(json["results"][i]["comments"])):
-                    comment_json = json["results"][i]["comments"][comment_idx]
+                for comment_idx in np.arange(len(results[i]["comments"])):
+                    comment_json = results[i]["comments"][comment_idx]
                     if comment_json["commentType"] == "SUBCELLULAR LOCATION":
                         for location_dict in comment_json["subcellularLocations"]:
                             subcel_locs.append(location_dict["location"]["value"])
@@ -519,6 +1121,185 @@ def get_uniprot_info(server, ensembl_id, verbose=True):
         return None
 
 
+# NCBI E-utilities configuration for gget info
+NCBI_BATCH_SIZE = 200  # Number of IDs per esearch/esummary request
+NCBI_API_KEY = os.getenv("NCBI_API_KEY")
+# NCBI allows 3 requests per second without an API key and 10 requests per second with an API key
+NCBI_REQUESTS_PER_SECOND = 10 if NCBI_API_KEY else 3
+
+
+def _eutils_request(endpoint, params, rate_limiter, cache=None):
+    """
+    Submit a POST request to an NCBI E-utilities endpoint and return the json response.
+    Throttled (429) and server error responses are retried (see request_with_retries).
+    """
+    params = dict(params, retmode="json", tool="gget")
+    if NCBI_API_KEY:
+        params["api_key"] = NCBI_API_KEY
+
+    def send():
+        rate_limiter.wait()
+        return cached_request(
+            "POST", NCBI_EUTILS_URL + endpoint, cache=cache, data=params
+        )
+
+    # E-utilities reads are idempotent, so throttled (429) and failed requests are retried
+    r = request_with_retries(send)
+
+    if not r.ok:
+        raise RuntimeError(
+            f"NCBI E-utilities server request returned error status code {r.status_code}. "
+            "Please double-check arguments or try again later."
+        )
+
+    return r.json()
+
+
+def _ncbi_gene_summaries(uids, rate_limiter, cache=None):
+    """
+    Fetch NCBI gene summaries for a list of NCBI gene IDs using batched esummary requests.
+    Returns dictionary of NCBI gene ID: summary (json).
+    """
+    summaries = {}
+    for i in range(0, len(uids), NCBI_BATCH_SIZE):
+        batch = uids[i : i + NCBI_BATCH_SIZE]
+        result = _eutils_request(
+            "esummary.fcgi", {"db": "gene", "id": ",".join(batch)}, rate_limiter, cache
+        )["result"]
+        for uid in result.get("uids", []):
+            summaries[uid] = result[uid]
+
+    return summaries
+
+
+def get_ncbi_gene_info(ensembl_ids, ensembl_info=None, verbose=True, cache=None):
+    """
+    Fetch NCBI gene IDs, descriptions and synonyms for Ensembl IDs using batched E-utilities requests.
+
+    The IDs are first searched in batches of NCBI_BATCH_SIZE (OR-joined esearch), and the summaries of
+    all matching genes are fetched with batched esummary requests. Matches are assigned by gene name and
+    species (from ensembl_info). IDs that could not be assigned are searched separately; as on the NCBI
+    website, an ID is only linked to an NCBI gene if the search returns a single gene.
+    Set the environment variable NCBI_API_KEY to allow 10 instead of 3 requests per second.
+
+    Args:
+    - ensembl_ids     List of Ensembl, WormBase or FlyBase IDs.
+    - ensembl_info    Dictionary of ID: Ensembl lookup results (keys 'display_name' and 'species').
+    - verbose         True/False to print logging messages.
+    - cache           'off', 'read' or 'readwrite' (see cached_request).
+
+    Returns dictionary of ID: dictionary with keys 'ncbi_gene_id', 'ncbi_description' and 'ncbi_synonyms'.
+    """
+    ensembl_info = ensembl_info or {}
+    rate_limiter = RateLimiter(NCBI_REQUESTS_PER_SECOND)
+
+    gene_ids = {}
+    summaries = {}
+    unresolved_ids = []
+
+    ## Batched search: match results to IDs based on gene name and species
+    for i in range(0, len(ensembl_ids), NCBI_BATCH_SIZE):
+        batch = ensembl_ids[i : i + NCBI_BATCH_SIZE]
+        try:
+            uids = _eutils_request(
+                "esearch.fcgi",
+                {"db": "gene", "term": " OR ".join(batch), "retmax": 10000},
+                rate_limiter,
+                cache,
+            )["esearchresult"]["idlist"]
+            batch_summaries = _ncbi_gene_summaries(uids, rate_limiter, cache)
+        except Exception as e:
+            logger.debug(f"Batched NCBI search failed with error: {e}")
+            unresolved_ids += batch
+            continue
+
+        # No NCBI genes were found for any of the IDs in this batch
+        if len(batch_summaries) == 0:
+            continue
+        summaries.update(batch_summaries)
+
+        # Index genes by (gene name, species)
+        genes_by_name = {}
+        for uid, summary in batch_summaries.items():
+            species = (
+                summary.get("organism", {})
+                .get("scientificname", "")
+                .lower()
+                .replace(" ", "_")
+            )
+            for name in {summary.get("name"), summary.get("nomenclaturesymbol")}:
+                if name:
+                    genes_by_name.setdefault((name.lower(), species), set()).add(uid)
+
+        for id_ in batch:
+            # A single ID was searched -> only link ID to a gene if the search found a single gene
+            if len(batch) == 1:
+                if len(batch_summaries) == 1:
+                    gene_ids[id_] = next(iter(batch_summaries))
+                continue
+
+            gene_name = ensembl_info.get(id_, {}).get("display_name") or ""
+            species = ensembl_info.get(id_, {}).get("species") or ""
+            matches = genes_by_name.get((gene_name.lower(), species), set())
+            if len(matches) == 1:
+                gene_ids[id_] = next(iter(matches))
+            else:
+                unresolved_ids.append(id_)
+
+    ## Search remaining IDs individually
+    def search_id(id_):
+        try:
+            uids = _eutils_request(
+                "esearch.fcgi", {"db": "gene", "term": id_}, rate_limiter, cache
+            )["esearchresult"]["idlist"]
+        except Exception as e:
+            logger.error(
+                f"The NCBI server request for Ensembl ID '{id_}' returned the following error:\n{e}"
+            )
+            return None
+
+        # Only link ID to a gene if the search found a single gene
+        if len(uids) == 1:
+            return uids[0]
+
+        return None
+
+    if len(unresolved_ids) > 0:
+        with ThreadPoolExecutor(max_workers=NCBI_REQUESTS_PER_SECOND) as executor:
+            for id_, uid in zip(
+                unresolved_ids, executor.map(search_id, unresolved_ids)
+            ):
+                if uid is not None:
+                    gene_ids[id_] = uid
+
+        missing_uids = [uid for uid in set(gene_ids.values()) if uid not in summaries]
+        try:
+            summaries.update(_ncbi_gene_summaries(missing_uids, rate_limiter, cache))
+        except Exception as e:
+            logger.error(
+                f"The NCBI server request for gene summaries returned the following error:\n{e}"
+            )
+
+    ## Collect NCBI gene ID, description and synonyms for each ID
+    ncbi_info = {}
+    for id_ in ensembl_ids:
+        uid = gene_ids.get(id_)
+        summary = summaries.get(uid, {})
+
+        ncbi_description = summary.get("summary") or np.nan
+        ncbi_synonyms = summary.get("otheraliases") or None
+        if ncbi_synonyms is not None:
+            ncbi_synonyms = ncbi_synonyms.split(", ")
+
+        ncbi_info[id_] = {
+            "ncbi_gene_id": uid if uid is not None else np.nan,
+            "ncbi_description": ncbi_description,
+            "ncbi_synonyms": ncbi_synonyms,
+        }
+
+    return ncbi_info
+
+
 # This function was replaced by the faster and more complete PDB API (see get_pdb_ids below)
 # def get_pdb_ids(uniprot_ids):
 #     """
@@ -611,24 +1392,15 @@ def get_uniprot_info(server, ensembl_id, verbose=True):
 #     return list(pdb_ids)
 
 
-def get_pdb_ids(ens_id):
+def _parse_pdb_ids(res, ens_id):
     """
-    Function to fetch all PDB IDs linked to an Ensembl ID.
-    using the PDBe API https://wwwdev.ebi.ac.uk/pdbe/aggregated-api/mappings/ensembl_to_pdb/[ens_id]
-
-    API documentation:
-    https://www.ebi.ac.uk/pdbe/aggregated-api/#/SIFTS/get_ensembl_to_pdb_mappings_api_mappings_ensembl_to_pdb__gene_id__get
+    Returns the sorted PDB IDs from a PDBe ensembl_to_pdb response (None if no PDB IDs were found).
     """
-
-    res = requests.get(ENS_TO_PDB_API + ens_id)
-
     if not res.ok:
-        # If no PDB IDs were found, return None
         return None
 
     try:
         pdb_dict = res.json()[ens_id]["mappings"]
-    # If no PDB IDs were found, return None
     except KeyError:
         return None
 
@@ -639,10 +1411,110 @@ def get_pdb_ids(ens_id):
     return sorted(list(set(pdb_ids)))
 
 
-def wrap_cols_func(df, cols):
-    """
-    Function to wrap columns cols of a
-    data frame df for easier reading.
+def get_pdb_ids(ens_id, cache=None):
+    """
+    Function to fetch all PDB IDs linked to an Ensembl ID.
+    using the PDBe API https://wwwdev.ebi.ac.uk/pdbe/aggregated-api/mappings/ensembl_to_pdb/[ens_id]
+
+    API documentation:
+    https://www.ebi.ac.uk/pdbe/aggregated-api/#/SIFTS/get_ensembl_to_pdb_mappings_api_mappings_ensembl_to_pdb__gene_id__get
+    """
+
+    res = cached_request("GET", ENS_TO_PDB_API + ens_id, cache=cache)
+
+    # If no PDB IDs were found, return None
+    return _parse_pdb_ids(res, ens_id)
+
+
+# PDBe ensembl_to_pdb lookups for gget info
+PDB_MAX_WORKERS = 8  # Number of PDBe requests submitted concurrently
+
+
+def _pdb_mapping_cache_key(ens_id):
+    # The parsed mapping is cached (including 'no PDB IDs' results, which PDBe returns as 404)
+    return ResponseCache.make_key("GET", ENS_TO_PDB_API + ens_id, {"parsed": "pdb_ids"})
+
+
+def get_pdb_ids_bulk(ens_ids, verbose=True, cache=None, max_workers=None):
+    """
+    Function to fetch all PDB IDs linked to each of a list of Ensembl IDs (see get_pdb_ids).
+    The PDBe API is queried concurrently. Depending on the cache mode, the mappings are read from
+    and/or saved to the persistent response cache (TTL of www.ebi.ac.uk in CACHE_TTLS).
+
+    Args:
+    - ens_ids       List of Ensembl IDs.
+    - verbose       True/False whether to print progress information. Default True.
+    - cache         'off', 'read' or 'readwrite' (see cached_request).
+    - max_workers   Maximum number of concurrent requests. Default: PDB_MAX_WORKERS.
+
+    Returns a dictionary {ens_id: sorted list of PDB IDs, or None if no PDB IDs were found}.
+    Ensembl IDs for which the request failed are not included.
+    """
+    cache = check_cache_mode(cache)
+
+    pdb_dict = {}
+    if cache != "off":
+        for ens_id in dict.fromkeys(ens_ids):
+            try:
+                body = get_response_cache().get(
+                    _pdb_mapping_cache_key(ens_id),
+                    ENS_TO_PDB_API + ens_id,
+                    update=cache == "readwrite",
+                )
+            except sqlite3.Error as e:
+                logger.debug(f"Reading from the gget cache failed: {e}")
+                break
+            if body is not None:
+                pdb_dict[ens_id] = json_package.loads(body)
+
+    missing = [ens_id for ens_id in dict.fromkeys(ens_ids) if ens_id not in pdb_dict]
+    if len(missing) == 0:
+        return pdb_dict
+
+    def fetch(ens_id):
+        res = http_get(ENS_TO_PDB_API + ens_id)
+        # PDBe returns 404 if no PDB IDs are linked to the Ensembl ID
+        if not res.ok and res.status_code != 404:
+            raise RuntimeError(
+                f"{ENS_TO_PDB_API} returned error status code {res.status_code}."
+            )
+        return _parse_pdb_ids(res, ens_id)
+
+    fetched = {}
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers or PDB_MAX_WORKERS, len(missing))
+    ) as executor:
+        futures = {executor.submit(fetch, ens_id): ens_id for ens_id in missing}
+        for future, ens_id in futures.items():
+            try:
+                fetched[ens_id] = future.result()
+            except Exception as e:
+                if verbose:
+                    logger.warning(
+                        f"The PDBe server request for Ensembl ID '{ens_id}' returned the following error:\n{e}"
+                    )
+
+    pdb_dict.update(fetched)
+
+    if cache == "readwrite":
+        try:
+            for ens_id, pdb_ids in fetched.items():
+                get_response_cache().set(
+                    _pdb_mapping_cache_key(ens_id),
+                    ENS_TO_PDB_API + ens_id,
+                    json_package.dumps(pdb_ids),
+                )
+        except sqlite3.Error as e:
+            logger.debug(f"Writing to the gget cache failed: {e}")
+
+    # Return results in the input order
+    return {ens_id: pdb_dict[ens_id] for ens_id in ens_ids if ens_id in pdb_dict}
+
+
+def wrap_cols_func(df, cols):
+    """
+    Function to wrap columns cols of a
+    data frame df for easier reading.
     """
     for col in cols:
         df.loc[:, col] = df[col].str.wrap(30)
@@ -650,7 +1522,7 @@ def wrap_cols_func(df, cols):
     return display(HTML(df.to_html().replace("\\n", "<br>")))
 
 
-def rest_query(server, query, content_type):
+def rest_query(server, query, content_type, cache=None):
     """
     Function to perform a REST API query.
 
@@ -658,11 +1530,14 @@ def rest_query(server, query, content_type):
     - server        Server to query.
     - Query         Query that is passed to server.
     - content_type  Content type requested from the server.
+    - cache         'off', 'read' or 'readwrite' (see cached_request).
 
     Returns server output.
     """
 
-    r = requests.get(server + query, headers={"Content-Type": content_type})
+    r = cached_request(
+        "GET", server + query, cache=cache, headers={"Content-Type": content_type}
+    )
 
     if not r.ok:
         raise RuntimeError(
@@ -676,31 +1551,180 @@ def rest_query(server, query, content_type):
         return r.text
 
 
-def post_query(server, endpoint, query):
+class HTTPStatusError(RuntimeError):
+    """
+    Raised when a server returns an error status code (status code saved as status_code).
+    """
+
+    def __init__(self, message, status_code):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def post_query(server, endpoint, query, cache=None):
     """
     Function to perform a POST API query.
 
     :param server:  Server to query .
     :param endpoint: Server endpoint
     :param query:   Query that is passed to server.
+    :param cache:   'off', 'read' or 'readwrite' (see cached_request).
 
     :return: server output
     """
 
-    r = requests.post(
-        server + endpoint, json=query, headers={"Content-Type": "application/json"}
+    # The queries are read-only, so failed requests can be retried (timeouts are raised,
+    # so that iter_post_query_chunks can retry with smaller chunks)
+    r = request_with_retries(
+        lambda: cached_request(
+            "POST",
+            server + endpoint,
+            cache=cache,
+            json=query,
+            headers={"Content-Type": "application/json"},
+        ),
+        retry_timeouts=False,
     )
 
     if not r.ok:
-        raise RuntimeError(
+        raise HTTPStatusError(
             f"{server} returned error status code {r.status_code}. "
-            "Please double-check arguments and try again.\n"
+            "Please double-check arguments and try again.\n",
+            r.status_code,
         )
 
     return r.json()
 
 
-def graphql_query(server, query, variables):
+# Maximum number of IDs per POST request to the Ensembl REST API endpoints
+# (https://github.com/Ensembl/ensembl-rest/blob/release/113/ensembl_rest.conf.default)
+ENSEMBL_POST_MAX_IDS = {"lookup/id/": 1000, "sequence/id/": 50}
+ENSEMBL_MAX_WORKERS = 4  # Number of chunks submitted concurrently
+# Status codes with which the server rejects a chunk because of its content or size
+# (429/5xx are retried by post_query and raised if they persist)
+POST_SPLIT_STATUS_CODES = (400, 413)
+
+
+def iter_post_query_chunks(
+    server, endpoint, ids, query=None, chunk_size=None, max_workers=None, cache=None
+):
+    """
+    Function to perform a POST API query for an arbitrarily long list of IDs,
+    yielding the server output for each chunk of IDs as soon as it is available.
+    The IDs are split into chunks (default: the maximum number of IDs allowed by the endpoint),
+    which are submitted concurrently. Chunks that are rejected by the server (POST_SPLIT_STATUS_CODES)
+    or time out are split in half and resubmitted; IDs that still fail on their own are dropped with a warning.
+    At most 2 * max_workers chunks are requested ahead of the chunk that is yielded next,
+    so memory use is bounded by the chunk size rather than by the number of IDs.
+
+    Args:
+    - server        Server to query.
+    - endpoint      Server endpoint.
+    - ids           List of IDs (passed to the server as {"ids": [...]}).
+    - query         Dictionary with additional query parameters, e.g. {"expand": True}.
+    - chunk_size    Number of IDs per request (default: ENSEMBL_POST_MAX_IDS for the endpoint, or 1000).
+    - max_workers   Number of requests submitted concurrently (default: ENSEMBL_MAX_WORKERS).
+    - cache         'off', 'read' or 'readwrite' (see cached_request).
+
+    Yields the server output (dictionary or list) for each chunk in the order of the IDs.
+    """
+    query = query or {}
+    chunk_size = chunk_size or ENSEMBL_POST_MAX_IDS.get(endpoint, 1000)
+    max_workers = max_workers or ENSEMBL_MAX_WORKERS
+
+    errors = []
+    dropped_ids = []
+
+    def submit(chunk):
+        try:
+            return [post_query(server, endpoint, dict(query, ids=chunk), cache=cache)]
+        except (HTTPStatusError, requests.Timeout) as e:
+            if (
+                isinstance(e, HTTPStatusError)
+                and e.status_code not in POST_SPLIT_STATUS_CODES
+            ):
+                raise
+            if len(chunk) == 1:
+                errors.append(e)
+                dropped_ids.append(chunk[0])
+                return []
+            # Split rejected or timed out chunk in half and try again
+            half = len(chunk) // 2
+            return submit(chunk[:half]) + submit(chunk[half:])
+
+    n_results = 0
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            for i in range(0, len(ids), chunk_size):
+                pending.append(executor.submit(submit, ids[i : i + chunk_size]))
+
+                if len(pending) < 2 * max_workers:
+                    continue
+                for result in pending.popleft().result():
+                    n_results += 1
+                    yield result
+
+            while pending:
+                for result in pending.popleft().result():
+                    n_results += 1
+                    yield result
+        finally:
+            # Do not submit the remaining chunks if a request failed (or the caller stopped iterating)
+            for future in pending:
+                future.cancel()
+
+    # Raise error if all requests failed
+    if n_results == 0 and len(errors) > 0:
+        raise errors[0]
+
+    if len(dropped_ids) > 0:
+        logger.warning(
+            f"The server rejected or timed out on the following {len(dropped_ids)} ID(s), which were dropped: {', '.join(dropped_ids)}"
+        )
+
+
+def post_query_chunked(
+    server, endpoint, ids, query=None, chunk_size=None, max_workers=None, cache=None
+):
+    """
+    Function to perform a POST API query for an arbitrarily long list of IDs
+    (see iter_post_query_chunks).
+
+    Args:
+    - server        Server to query.
+    - endpoint      Server endpoint.
+    - ids           List of IDs (passed to the server as {"ids": [...]}).
+    - query         Dictionary with additional query parameters, e.g. {"expand": True}.
+    - chunk_size    Number of IDs per request (default: ENSEMBL_POST_MAX_IDS for the endpoint, or 1000).
+    - max_workers   Number of requests submitted concurrently (default: ENSEMBL_MAX_WORKERS).
+    - cache         'off', 'read' or 'readwrite' (see cached_request).
+
+    Returns the merged server output (dictionary or list) in the order of the IDs.
+    """
+    chunk_results = list(
+        iter_post_query_chunks(
+            server,
+            endpoint,
+            ids,
+            query=query,
+            chunk_size=chunk_size,
+            max_workers=max_workers,
+            cache=cache,
+        )
+    )
+
+    if any(isinstance(result, dict) for result in chunk_results):
+        merged = {}
+        for result in chunk_results:
+            merged.update(result)
+    else:
+        merged = [item for result in chunk_results for item in result]
+
+    return merged
+
+
+def graphql_query(server, query, variables, cache=None):
     """
     Function to perform a GraphQL API query.
 
@@ -708,11 +1732,14 @@ def graphql_query(server, query, variables):
     - server        Server to query.
     - query         Query that is passed to server.
     - variables     Variables that are passed to server.
+    - cache         'off', 'read' or 'readwrite' (see cached_request).
 
     Returns server output.
     """
 
-    r = requests.post(server, json={"query": query, "variables": variables})
+    r = cached_request(
+        "POST", server, cache=cache, json={"query": query, "variables": variables}
+    )
 
     if not r.ok:
         logger.debug(
@@ -726,9 +1753,24 @@ def graphql_query(server, query, variables):
     return r.json()
 
 
+# Seconds for which the latest Ensembl release number is remembered within a session
+ENS_RELEASE_CHECK_INTERVAL = 3600
+_latest_ens_rel = {}
+
+# Ensembl FTP directory listings per (database, release), persisted in CACHE_DIR/ensembl_index
+# when the cache is enabled (see check_cache_mode)
+_ens_ftp_index = {}
+_ens_ftp_index_loaded = set()
+_ens_ftp_index_lock = threading.Lock()
+# Missing FTP folders are only remembered in memory, for ENS_FTP_MISSING_TTL seconds
+ENS_FTP_MISSING_TTL = 600
+_ens_ftp_missing = {}
+
+
 def find_latest_ens_rel(database=ENSEMBL_FTP_URL):
     """
     Returns the latest Ensembl release number.
+    The release number is remembered for ENS_RELEASE_CHECK_INTERVAL seconds.
 
     Args:
     - database    Link to Ensembl database.
@@ -752,16 +1794,167 @@ def find_latest_ens_rel(database=ENSEMBL_FTP_URL):
     # # Find highest release number (= latest release)
     # ENS_rel = np.array(rels).astype(int).max()
 
-    html = requests.get(database + "VERSION")
+    if database in _latest_ens_rel:
+        ENS_rel, checked = _latest_ens_rel[database]
+        if time.time() - checked < ENS_RELEASE_CHECK_INTERVAL:
+            return ENS_rel
+
+    html = http_get(database + "VERSION")
     if html.status_code != 200:
         raise RuntimeError(
             f"The Ensembl FTP server returned error status code {html.status_code}. Please try again."
         )
     ENS_rel = int(html.text)
 
+    _latest_ens_rel[database] = (ENS_rel, time.time())
+
     return ENS_rel
 
 
+def _ens_ftp_index_path(database, release):
+    parsed = urlparse(database)
+    name = (parsed.hostname + parsed.path).strip("/").replace("/", "_")
+    return os.path.join(CACHE_DIR, "ensembl_index", f"{name}_release-{release}.json")
+
+
+def _ens_ftp_index_get(database, release, key, cache=None):
+    """
+    Returns (True, value) if key is saved in the FTP index of this release, else (False, None).
+    The persisted index is only read if the cache mode is 'read' or 'readwrite'.
+    """
+    cache = check_cache_mode(cache)
+    index_key = (database, int(release))
+
+    with _ens_ftp_index_lock:
+        index = _ens_ftp_index.setdefault(index_key, {})
+        if cache != "off" and index_key not in _ens_ftp_index_loaded:
+            try:
+                with open(_ens_ftp_index_path(database, release)) as f:
+                    # Entries fetched during this session take precedence
+                    index.update({**json_package.load(f), **index})
+            except (OSError, ValueError):
+                pass
+            _ens_ftp_index_loaded.add(index_key)
+
+        if key in index:
+            return True, index[key]
+
+        missing_since = _ens_ftp_missing.get(index_key + (key,))
+        if (
+            missing_since is not None
+            and time.monotonic() - missing_since < ENS_FTP_MISSING_TTL
+        ):
+            return True, None
+
+    return False, None
+
+
+def _ens_ftp_index_set(database, release, key, value, cache=None):
+    """
+    Saves key in the FTP index of this release and persists the index if the cache mode is 'readwrite'.
+    A value of None (missing folder) is only remembered in memory for ENS_FTP_MISSING_TTL seconds.
+    """
+    cache = check_cache_mode(cache)
+    index_key = (database, int(release))
+
+    with _ens_ftp_index_lock:
+        if value is None:
+            _ens_ftp_missing[index_key + (key,)] = time.monotonic()
+            return
+
+        index = _ens_ftp_index.setdefault(index_key, {})
+        index[key] = value
+        _ens_ftp_missing.pop(index_key + (key,), None)
+
+        if cache != "readwrite":
+            return
+
+        # Persist index (write to temporary file first so readers never see a partial file)
+        path = _ens_ftp_index_path(database, release)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{uuid.uuid4()}.tmp"
+            with open(tmp_path, "w") as f:
+                json_package.dump(index, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.debug(f"Saving the Ensembl FTP index to {path} failed: {e}")
+
+
+def get_ens_ftp_listing(database, release, folder, cache=None):
+    """
+    Returns the entries (file and folder names) of an Ensembl FTP directory.
+
+    Listings are kept in a per-release index, so each directory page is only downloaded and parsed
+    once per release. The index is persisted in CACHE_DIR/ensembl_index if the cache is enabled.
+
+    Args:
+    - database  Link to Ensembl database.
+    - release   Ensembl release number.
+    - folder    Folder within the release, e.g. 'mysql', 'gtf' or 'plants/fasta'.
+    - cache     'off', 'read' or 'readwrite' (see cached_request).
+
+    Returns list of entries in the order of the directory page (including its header links).
+    """
+    found, entries = _ens_ftp_index_get(database, release, folder, cache=cache)
+    if found:
+        return entries
+
+    url = database + f"release-{release}/{folder}/"
+    html = http_get(url)
+
+    # Raise error if status code not "OK" Response
+    if html.status_code != 200:
+        raise RuntimeError(
+            f"The Ensembl server returned error status code {html.status_code}. Please try again."
+        )
+
+    soup = BeautifulSoup(html.text, "html.parser")
+    entries = [subsoup["href"].split("/")[0] for subsoup in soup.body.findAll("a")]
+
+    _ens_ftp_index_set(database, release, folder, entries, cache=cache)
+
+    return entries
+
+
+def get_ens_ftp_table(database, release, folder, cache=None):
+    """
+    Returns the table cells (file name, date, size, ...) of an Ensembl FTP directory page.
+    Saved in the same per-release index as get_ens_ftp_listing.
+
+    Args:
+    - database  Link to Ensembl database.
+    - release   Ensembl release number.
+    - folder    Folder within the release, e.g. 'gtf/homo_sapiens' or 'plants/fasta/arabidopsis_thaliana/dna'.
+    - cache     'off', 'read' or 'readwrite' (see cached_request).
+
+    Returns list of the text of all table cells in the order of the directory page,
+    or None if the folder does not exist.
+    """
+    key = f"table:{folder}"
+    found, cells = _ens_ftp_index_get(database, release, key, cache=cache)
+    if found:
+        return cells
+
+    url = database + f"release-{release}/{folder}/"
+    html = http_get(url)
+
+    # Missing folders (e.g. species without ncRNA data) are briefly remembered as None
+    if html.status_code == 404:
+        cells = None
+    elif html.status_code != 200:
+        raise RuntimeError(
+            f"HTTP response status code {html.status_code}. Please try again.\n"
+        )
+    else:
+        soup = BeautifulSoup(html.text, "html.parser")
+        cells = [stuff.text.strip() for stuff in soup.findAll("td")]
+
+    _ens_ftp_index_set(database, release, key, cells, cache=cache)
+
+    return cells
+
+
 def search_species_options(database=ENSEMBL_FTP_URL, release=None):
     """
     Function to find all available species core databases for gget search.
@@ -789,39 +1982,16 @@ def search_species_options(database=ENSEMBL_FTP_URL, release=None):
         databases = []
         kds = ["plants", "protists", "metazoa", "fungi"]
         for kingdom in kds:
-            url = database + f"release-{ENS_rel}/{kingdom}/mysql/"
-            html = requests.get(url)
-
-            # Raise error if status code not "OK" Response
-            if html.status_code != 200:
-                raise RuntimeError(
-                    f"The Ensembl server returned error status code {html.status_code}. Please try again."
-                )
-
-            soup = BeautifulSoup(html.text, "html.parser")
-
-            # Find all available databases
-            for subsoup in soup.body.findAll("a"):
-                if "core" in subsoup["href"]:
-                    databases.append(subsoup["href"].split("/")[0])
+            for entry in get_ens_ftp_listing(database, ENS_rel, f"{kingdom}/mysql"):
+                if "core" in entry:
+                    databases.append(entry)
 
     else:
-        url = database + f"release-{ENS_rel}/mysql/"
-        html = requests.get(url)
-
-        # Raise error if status code not "OK" Response
-        if html.status_code != 200:
-            raise RuntimeError(
-                f"The Ensembl server returned error status code {html.status_code}. Please try again."
-            )
-
-        soup = BeautifulSoup(html.text, "html.parser")
-
         # Return list of all available databases
         databases = []
-        for subsoup in soup.body.findAll("a"):
-            if "core" in subsoup["href"]:
-                databases.append(subsoup["href"].split("/")[0])
+        for entry in get_ens_ftp_listing(database, ENS_rel, "mysql"):
+            if "core" in entry:
+                databases.append(entry)
 
     return databases
 
@@ -829,21 +1999,8 @@ def search_species_options(database=ENSEMBL_FTP_URL, release=None):
 def find_nv_kingdom(species, release):
     kds = ["plants", "protists", "metazoa", "fungi"]
     for kingdom in kds:
-        url = ENSEMBL_FTP_URL_NV + f"release-{release}/{kingdom}/fasta/"
-        html = requests.get(url)
-
-        # Raise error if status code not "OK" Response
-        if html.status_code != 200:
-            raise RuntimeError(
-                f"The Ensembl server returned error status code {html.status_code}. Please try again."
-            )
-
-        # Parse the html and generate a clean list of the available genomes
-        soup = BeautifulSoup(html.text, "html.parser")
-
-        sps = []
-        for subsoup in soup.body.findAll("a"):
-            sps.append(subsoup["href"].split("/")[0])
+        # Generate a clean list of the available genomes
+        sps = get_ens_ftp_listing(ENSEMBL_FTP_URL_NV, release, f"{kingdom}/fasta")
 
         # Return kingdom if species was found
         if species in sps[5:]:
@@ -874,60 +2031,281 @@ def ref_species_options(which, database=ENSEMBL_FTP_URL, release=None):
             )
         ENS_rel = release
 
+    # Find all available species for this release and FTP type
+    if which == "gtf":
+        folder = "gtf"
+    elif which in ("dna", "cdna"):
+        folder = "fasta"
+
     # Handle structure of non-vertebrate database
     if "ensemblgenomes" in database:
         species_list = []
         kds = ["plants", "protists", "metazoa", "fungi"]
         for kingdom in kds:
-            # Find all available species for this release and FTP type
-            if which == "gtf":
-                url = database + f"release-{ENS_rel}/{kingdom}/gtf/"
-            elif which in ("dna", "cdna"):
-                url = database + f"release-{ENS_rel}/{kingdom}/fasta/"
-            html = requests.get(url)
-
-            # Raise error if status code not "OK" Response
-            if html.status_code != 200:
-                raise RuntimeError(
-                    f"The Ensembl server returned error status code {html.status_code}. Please try again."
-                )
-
-            # Parse the html and generate a clean list of the available genomes
-            soup = BeautifulSoup(html.text, "html.parser")
-
-            sps = []
-            for subsoup in soup.body.findAll("a"):
-                sps.append(subsoup["href"].split("/")[0])
-
+            # Generate a clean list of the available genomes
+            sps = get_ens_ftp_listing(database, ENS_rel, f"{kingdom}/{folder}")
             species_list.append(sps[5:])
 
         species_list = flatten(species_list)
 
     else:
-        # Find all available species for this release and FTP type
-        if which == "gtf":
-            url = database + f"release-{ENS_rel}/gtf/"
-        elif which in ("dna", "cdna"):
-            url = database + f"release-{ENS_rel}/fasta/"
-        html = requests.get(url)
-
-        # Raise error if status code not "OK" Response
-        if html.status_code != 200:
-            raise RuntimeError(
-                f"The Ensembl server returned error status code {html.status_code}. Please try again."
+        # Generate a clean list of the available genomes
+        sps = get_ens_ftp_listing(database, ENS_rel, folder)
+        species_list = sps[5:]
+
+    # Return list of all available species
+    return sorted(species_list)
+
+
+# Streamed file downloads (gget ref)
+DOWNLOAD_CHUNK_SIZE = 1024**2  # Bytes
+# Number of times an interrupted download is resumed before giving up
+DOWNLOAD_MAX_ATTEMPTS = int(os.getenv("GGET_DOWNLOAD_MAX_ATTEMPTS", 5))
+
+
+# Bytes checksummed per vectorized block by the pure Python BSD checksum
+BSD_SUM_BLOCK_SIZE = 2**16
+
+
+def _bsd_sum_block(data, checksum):
+    """
+    Continue the BSD checksum 'checksum' over the bytes in data (numpy uint8 array) and return the new checksum.
+
+    Each step rotates the 16-bit checksum right by one bit and adds the next byte. Modulo 65535 the rotation is a
+    multiplication by 2^15 (since 2^16 = 1), so as long as no addition wraps around 2^16, the checksums after
+    each byte follow from one cumulative sum. The checksums are computed for a window of bytes at once
+    and only the byte at which an addition wraps around is processed on its own.
+    """
+    n = len(data)
+    phases = np.arange(n + 1) % 16
+    # 2^k and 2^-k modulo 65535
+    powers = np.left_shift(1, phases).astype(np.int64)
+    inverse_powers = np.left_shift(1, (16 - phases) % 16).astype(np.int64)
+    data = data.astype(np.int64)
+
+    # 2^k * checksum_k (mod 65535) = 2^i * checksum_i + cumsum_k - cumsum_i (if no wrap-around between i and k)
+    cumsum = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(powers[1:] * data, out=cumsum[1:])
+    cumsum %= 65535
+
+    pos = 0
+    width = 1024
+    while pos < n:
+        end = min(pos + width, n)
+        offset = (checksum * powers[pos] - cumsum[pos]) % 65535
+        residues = (
+            (cumsum[pos + 1 : end + 1] + offset)
+            % 65535
+            * inverse_powers[pos + 1 : end + 1]
+            % 65535
+        )
+
+        previous = np.empty(end - pos, dtype=np.int64)
+        previous[0] = checksum
+        previous[1:] = residues[:-1]
+        sums = ((previous >> 1) | ((previous & 1) << 15)) + data[pos:end]
+
+        # Stop at the first addition that wraps around, or after a residue of 0 (checksum 0 or 0xFFFF)
+        stop = sums > 0xFFFF
+        stop[1:] |= residues[:-1] == 0
+        i = int(stop.argmax())
+        if not stop[i]:
+            checksum = int(sums[-1])
+            pos = end
+            width = min(2 * width, BSD_SUM_BLOCK_SIZE)
+        else:
+            if i > 0:
+                checksum = int(sums[i - 1])
+            checksum = (
+                ((checksum >> 1) | ((checksum & 1) << 15)) + int(data[pos + i])
+            ) & 0xFFFF
+            pos += i + 1
+            width = max(2 * i, 256)
+
+    return checksum
+
+
+def bsd_sum(path):
+    """
+    Returns the BSD checksum and the number of 1 KB blocks of a file (as computed by the 'sum' command,
+    which Ensembl uses for its CHECKSUMS files).
+    The 'sum' executable is used if available, since the Python fallback is slower for large files.
+    """
+    sum_executable = shutil.which("sum")
+    if sum_executable:
+        try:
+            fields = subprocess.run(
+                [sum_executable, path], capture_output=True, text=True, check=True
+            ).stdout.split()
+            return int(fields[0]), int(fields[1])
+        except (subprocess.CalledProcessError, OSError, ValueError, IndexError):
+            pass
+
+    checksum = 0
+    size = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(BSD_SUM_BLOCK_SIZE), b""):
+            size += len(chunk)
+            checksum = _bsd_sum_block(np.frombuffer(chunk, dtype=np.uint8), checksum)
+
+    return checksum, (size + 1023) // 1024
+
+
+def get_ens_checksums(folder_url):
+    """
+    Returns the checksums of the files of an Ensembl FTP folder from its CHECKSUMS file as a dictionary
+    {filename: (BSD checksum, blocks)} (or {filename: md5} for MD5 checksum files).
+    Returns an empty dictionary if the folder does not have a CHECKSUMS file.
+
+    Args:
+    - folder_url    URL of the FTP folder (ending in '/').
+    """
+    html = http_get(folder_url + "CHECKSUMS")
+    if html.status_code != 200:
+        return {}
+
+    checksums = {}
+    for line in html.text.splitlines():
+        fields = line.split()
+        if len(fields) == 3 and fields[0].isdigit() and fields[1].isdigit():
+            checksums[fields[2]] = (int(fields[0]), int(fields[1]))
+        elif len(fields) == 2 and re.fullmatch(r"[0-9a-fA-F]{32}", fields[0]):
+            checksums[fields[1].lstrip("*")] = fields[0].lower()
+
+    return checksums
+
+
+def _verify_checksum(path, checksum):
+    if isinstance(checksum, str):
+        md5 = hashlib.md5()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+                md5.update(chunk)
+        return md5.hexdigest() == checksum
+
+    return bsd_sum(path) == tuple(checksum)
+
+
+def _stream_download(url, part_path, verbose=True):
+    """
+    Download url to part_path, resuming from the bytes already saved in part_path
+    (HTTP range requests) if the download is interrupted.
+    """
+    for attempt in range(1, DOWNLOAD_MAX_ATTEMPTS + 1):
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+
+        try:
+            with http_get(url, headers=headers, stream=True) as response:
+                # Requested range starts at the end of the file -> download is complete
+                if response.status_code == 416 and offset:
+                    return
+
+                if response.status_code not in (200, 206):
+                    raise RuntimeError(
+                        f"Downloading {url} failed with HTTP response status code {response.status_code}."
+                    )
+
+                # The server ignored the range request -> restart from zero
+                if response.status_code == 200:
+                    offset = 0
+
+                expected_size = None
+                if response.headers.get("Content-Length"):
+                    expected_size = offset + int(response.headers["Content-Length"])
+
+                with open(part_path, "ab" if offset else "wb") as f:
+                    for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+
+            if expected_size is None or os.path.getsize(part_path) >= expected_size:
+                return
+
+            error = "connection closed before the download was complete"
+
+        except requests.exceptions.RequestException as e:
+            error = e
+
+        if verbose:
+            logger.warning(
+                f"Download of {url} was interrupted ({error}). "
+                f"Resuming (attempt {attempt}/{DOWNLOAD_MAX_ATTEMPTS})..."
             )
 
-        # Parse the html and generate a clean list of the available genomes
-        soup = BeautifulSoup(html.text, "html.parser")
+    raise RuntimeError(
+        f"Downloading {url} failed after {DOWNLOAD_MAX_ATTEMPTS} attempts."
+    )
 
-        sps = []
-        for subsoup in soup.body.findAll("a"):
-            sps.append(subsoup["href"].split("/")[0])
 
-        species_list = sps[5:]
+def download_file(url, out_dir=None, checksum=None, decompress=False, verbose=True):
+    """
+    Download a file by streaming it to disk. Interrupted downloads are resumed
+    (also across calls, from the partial '.part' file), and the file is verified against its checksum.
 
-    # Return list of all available species
-    return sorted(species_list)
+    Args:
+    - url           URL of the file.
+    - out_dir       Directory the file is saved in (default: current working directory).
+    - checksum      Expected checksum as (BSD checksum, blocks) tuple or md5 string (see get_ens_checksums).
+                    Default: None -> the file is not verified.
+    - decompress    If True, gzip-compressed files are decompressed into out_dir after verification
+                    (the compressed file is removed). Default: False.
+    - verbose       True/False whether to print progress information. Default True.
+
+    Returns the path to the downloaded (or decompressed) file.
+    """
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    out_path = os.path.join(out_dir or "", url.split("/")[-1])
+    decompressed_path = out_path[: -len(".gz")]
+    decompress = decompress and out_path.endswith(".gz")
+
+    # Skip files that were already downloaded
+    if decompress and os.path.exists(decompressed_path):
+        if verbose:
+            logger.info(f"{decompressed_path} already exists. Skipping download.")
+        return decompressed_path
+    if os.path.exists(out_path) and (
+        checksum is None or _verify_checksum(out_path, checksum)
+    ):
+        if verbose:
+            logger.info(f"{out_path} already exists. Skipping download.")
+    else:
+        part_path = out_path + ".part"
+        if verbose:
+            logger.info(f"Downloading {url}")
+
+        for restart in [False, True]:
+            _stream_download(url, part_path, verbose=verbose)
+
+            if checksum is None or _verify_checksum(part_path, checksum):
+                break
+
+            # Download from zero once more if the checksum does not match
+            os.remove(part_path)
+            if restart:
+                raise RuntimeError(
+                    f"The checksum of {url} does not match the checksum provided by the server."
+                )
+            if verbose:
+                logger.warning(
+                    f"The checksum of {url} does not match. Downloading the file again..."
+                )
+
+        os.replace(part_path, out_path)
+
+    if not decompress:
+        return out_path
+
+    # Decompress to a temporary file first, so an interrupted decompression is never mistaken for a finished one
+    if verbose:
+        logger.info(f"Decompressing {out_path}")
+    tmp_path = decompressed_path + ".part"
+    with gzip.open(out_path, "rb") as f_in, open(tmp_path, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out, DOWNLOAD_CHUNK_SIZE)
+    os.replace(tmp_path, decompressed_path)
+    os.remove(out_path)
+
+    return decompressed_path
 
 
 def parse_blast_ref_page(handle):
@@ -1047,6 +2425,30 @@ def create_tmp_fasta(sequences):
     return os.path.abspath(f"tmp_{random_id}.fa")
 
 
+def uncompressed_fasta(fasta, supported=()):
+    """
+    Decompress a FASTA file to a temporary file for external tools that cannot read its compression.
+
+    Args:
+    - fasta         (str) Path to the (optionally compressed) FASTA file.
+    - supported     (tuple) Compressions read natively by the tool ('gzip', 'bgzf' and/or 'zstd').
+
+    Returns: Absolute path to a FASTA file the tool can read and whether it is a temporary copy.
+    """
+    if not os.path.isfile(fasta):
+        return os.path.abspath(fasta), False
+
+    compression = fasta_compression(fasta)
+    if compression is None or compression in supported:
+        return os.path.abspath(fasta), False
+
+    tmp_path = os.path.abspath(f"tmp_{str(uuid.uuid4())}.fa")
+    with open_fasta(fasta, "rb") as source, open(tmp_path, "wb") as target:
+        shutil.copyfileobj(source, target, DOWNLOAD_CHUNK_SIZE)
+
+    return tmp_path, True
+
+
 def remove_temp_files(files_to_delete):
     """
     Delete temporary files.
@@ -1099,23 +2501,719 @@ def json_list_to_df(json_list, columns) -> pd.DataFrame:
 # the original BioPython API while removing the external dependency.
 
 class FastaRecord:
-    """Simple FASTA record class compatible with BioPython SeqIO.SeqRecord"""
-    def __init__(self, seq, id, description=""):
-        self.seq = seq
+    """
+    Simple FASTA record class compatible with BioPython SeqIO.SeqRecord.
+    With as_bytes=True the sequence is stored as UTF-8 encoded bytes; the seq attribute always returns a string.
+    """
+    __slots__ = ('id', 'description', '_seq')
+
+    def __init__(self, seq, id, description="", as_bytes=False):
         self.id = id
         self.description = description
+        self._seq = seq.encode('utf-8') if as_bytes and isinstance(seq, str) else seq
+
+    @property
+    def seq(self):
+        if isinstance(self._seq, (bytes, bytearray, memoryview)):
+            return bytes(self._seq).decode('utf-8')
+        return self._seq
+
+    @seq.setter
+    def seq(self, value):
+        self._seq = value
+
+    @property
+    def seq_bytes(self):
+        """The sequence as bytes (without copying when stored as bytes)."""
+        if isinstance(self._seq, (bytes, bytearray, memoryview)):
+            return self._seq
+        return str(self._seq).encode('utf-8')
+
+    def __len__(self):
+        return len(self._seq)
+
+    def __repr__(self):
+        return f"FastaRecord(id={self.id!r}, description={self.description!r}, length={len(self)})"
+
+
+class FastaBatch:
+    """
+    Columnar container for many FASTA records: lists of ids and descriptions, and all sequences
+    concatenated in one bytes buffer delimited by an offsets array (record i spans offsets[i]:offsets[i + 1]).
+    Iterating or indexing a batch returns FastaRecord objects backed by slices of the buffer.
+    """
+    __slots__ = ('ids', 'descriptions', 'data', 'offsets')
+
+    def __init__(self, ids, descriptions, data, offsets):
+        self.ids = ids
+        self.descriptions = descriptions
+        self.data = data
+        self.offsets = offsets
+
+    @classmethod
+    def from_sequences(cls, ids, descriptions, seqs):
+        """
+        Args:
+        - ids           (list) Record ids.
+        - descriptions  (list) Record descriptions.
+        - seqs          (list) Sequences as str or bytes.
+        """
+        encoded = [seq.encode('utf-8') if isinstance(seq, str) else bytes(seq) for seq in seqs]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(seq) for seq in encoded], out=offsets[1:])
+        return cls(list(ids), list(descriptions), b''.join(encoded), offsets)
+
+    @classmethod
+    def from_records(cls, records):
+        records = list(records)
+        return cls.from_sequences(
+            [record.id for record in records],
+            [getattr(record, 'description', '') for record in records],
+            [record.seq_bytes if isinstance(record, FastaRecord) else str(record.seq) for record in records],
+        )
+
+    @classmethod
+    def concat(cls, batches):
+        """Combine several batches into one, in order."""
+        batches = list(batches)
+        if not batches:
+            return cls([], [], b'', np.zeros(1, dtype=np.int64))
+        ids = [x for batch in batches for x in batch.ids]
+        descriptions = [x for batch in batches for x in batch.descriptions]
+        offsets = [np.zeros(1, dtype=np.int64)]
+        total = 0
+        for batch in batches:
+            offsets.append(batch.offsets[1:] - batch.offsets[0] + total)
+            total += int(batch.offsets[-1] - batch.offsets[0])
+        data = b''.join(
+            memoryview(batch.data)[batch.offsets[0]:batch.offsets[-1]] for batch in batches
+        )
+        return cls(ids, descriptions, data, np.concatenate(offsets))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        for i in range(len(self.ids)):
+            yield self[i]
+
+    def __getitem__(self, i):
+        return FastaRecord(self.seq_bytes(i), self.ids[i], self.descriptions[i])
+
+    @property
+    def lengths(self):
+        return np.diff(self.offsets)
+
+    def seq_bytes(self, i):
+        """Returns the i-th sequence as a memoryview of the buffer (no copy)."""
+        return memoryview(self.data)[self.offsets[i]:self.offsets[i + 1]]
+
+    def seq(self, i):
+        return self.data[self.offsets[i]:self.offsets[i + 1]].decode('utf-8')
+
+    def count(self, characters):
+        """
+        Args:
+        - characters    (str) Characters to count, e.g. 'Nn'.
+
+        Returns a numpy array with the number of occurrences of the characters in each sequence.
+        """
+        buffer = np.frombuffer(self.data, dtype=np.uint8)
+        hits = np.isin(buffer, np.frombuffer(characters.encode('utf-8'), dtype=np.uint8))
+        cumulative = np.concatenate(([0], np.cumsum(hits, dtype=np.int64)))
+        return cumulative[self.offsets[1:]] - cumulative[self.offsets[:-1]]
+
+    def select(self, indices):
+        """
+        Args:
+        - indices   Integer indices or boolean mask of the records to keep.
+
+        Returns a new FastaBatch with the selected records.
+        """
+        indices = np.asarray(indices)
+        if indices.dtype == bool:
+            indices = np.flatnonzero(indices)
+        view = memoryview(self.data)
+        return FastaBatch.from_sequences(
+            [self.ids[i] for i in indices],
+            [self.descriptions[i] for i in indices],
+            [view[self.offsets[i]:self.offsets[i + 1]] for i in indices],
+        )
+
+
+BGZF_MAGIC = b'\x1f\x8b\x08\x04'
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+BGZF_BLOCK_SIZE = 0xff00  # Uncompressed bytes per block, as in bgzip
+BGZF_COMPRESS_LEVEL = 6
+FASTA_IO_THREADS = int(os.getenv("GGET_FASTA_IO_THREADS", min(4, os.cpu_count() or 1)))
+FASTA_PARSE_WORKERS = int(os.getenv("GGET_FASTA_PARSE_WORKERS", os.cpu_count() or 1))
+FASTA_PARSE_CHUNK_SIZE = 32 * 1024**2  # Bytes of FASTA text parsed per task
+FASTA_BATCH_RECORDS = 10000  # Records per batch when batches cannot follow byte ranges
+FASTA_LINE_WIDTH = 70
+FASTA_WRITE_BUFFER_SIZE = 8 * 1024**2  # Bytes
+FASTA_COMPRESSION_EXTENSIONS = {'.gz': 'bgzf', '.bgz': 'bgzf', '.bgzf': 'bgzf', '.zst': 'zstd'}
+
+
+def _read_bgzf_header(handle):
+    """
+    Args:
+    - handle    Binary file handle positioned at the start of a BGZF block.
+
+    Returns the total size of the block in bytes and the length of its header,
+    or None at the end of the file.
+    """
+    header = handle.read(12)
+    if len(header) < 12:
+        return None
+    if header[:4] != BGZF_MAGIC:
+        raise ValueError('File is not BGZF compressed. Compress it with bgzip to enable random access.')
+
+    xlen = struct.unpack('<H', header[10:12])[0]
+    extra = handle.read(xlen)
+    i = 0
+    while i + 4 <= xlen:
+        subfield_len = struct.unpack('<H', extra[i + 2:i + 4])[0]
+        if extra[i:i + 2] == b'BC':
+            return struct.unpack('<H', extra[i + 4:i + 6])[0] + 1, 12 + xlen
+        i += 4 + subfield_len
+
+    raise ValueError('File is not BGZF compressed. Compress it with bgzip to enable random access.')
+
+
+def _read_bgzf_cdata(handle):
+    """
+    Returns the compressed (raw deflate) data of the BGZF block starting at the current position
+    of the binary file handle, or None at the end of the file.
+    """
+    sizes = _read_bgzf_header(handle)
+    if sizes is None:
+        return None
+    block_size, header_size = sizes
+    return handle.read(block_size - header_size)[:-8]  # Drop CRC32 and ISIZE
+
+
+def _inflate(cdata):
+    return zlib.decompress(cdata, -15)
+
+
+def _read_bgzf_block(handle):
+    """
+    Returns the decompressed content of the BGZF block starting at the current position
+    of the binary file handle, or None at the end of the file.
+    """
+    cdata = _read_bgzf_cdata(handle)
+    return None if cdata is None else _inflate(cdata)
+
+
+def _deflate_bgzf_block(data):
+    """Returns a complete BGZF block (header, raw deflate data, CRC32 and ISIZE) for the given bytes."""
+    compressor = zlib.compressobj(BGZF_COMPRESS_LEVEL, zlib.DEFLATED, -15)
+    cdata = compressor.compress(data) + compressor.flush()
+    header = BGZF_MAGIC + b'\x00\x00\x00\x00\x00\xff\x06\x00BC\x02\x00'
+    return (
+        header
+        + struct.pack('<H', len(header) + 2 + len(cdata) + 8 - 1)
+        + cdata
+        + struct.pack('<II', zlib.crc32(data) & 0xffffffff, len(data))
+    )
+
+
+class BgzfReader(io.RawIOBase):
+    """
+    Sequential reader for BGZF (bgzip) files. Blocks are decompressed ahead of time
+    in a thread pool (zlib releases the GIL), while output stays in file order.
+    """
+
+    def __init__(self, filename, threads=None):
+        self._handle = open(filename, 'rb')
+        self._threads = threads or FASTA_IO_THREADS
+        self._executor = ThreadPoolExecutor(self._threads) if self._threads > 1 else None
+        self._pending = deque()
+        self._data = b''
+        self._position = 0
+        self._exhausted = False
+
+    def readable(self):
+        return True
+
+    def _fill(self):
+        # Keep a few blocks per thread in flight
+        while not self._exhausted and len(self._pending) < self._threads * 4:
+            cdata = _read_bgzf_cdata(self._handle)
+            if cdata is None:
+                self._exhausted = True
+            elif self._executor is None:
+                self._pending.append(_inflate(cdata))
+            else:
+                self._pending.append(self._executor.submit(_inflate, cdata))
+
+    def readinto(self, buffer):
+        while self._position >= len(self._data):
+            self._fill()
+            if not self._pending:
+                return 0
+            block = self._pending.popleft()
+            self._data = block if isinstance(block, bytes) else block.result()
+            self._position = 0
+
+        n = min(len(buffer), len(self._data) - self._position)
+        buffer[:n] = self._data[self._position:self._position + n]
+        self._position += n
+        return n
+
+    def close(self):
+        if not self.closed:
+            if self._executor is not None:
+                # Blocks that are not being inflated yet are not needed anymore
+                for block in self._pending:
+                    block.cancel()
+                self._pending.clear()
+                self._executor.shutdown()
+            self._handle.close()
+        super().close()
+
+
+class BgzfWriter(io.RawIOBase):
+    """
+    Writer for BGZF (bgzip) files, which are also valid gzip files. Batches of blocks
+    are compressed in a thread pool and written in order, followed by the BGZF EOF marker.
+    """
+
+    def __init__(self, filename, threads=None):
+        self._handle = open(filename, 'wb')
+        self._threads = threads or FASTA_IO_THREADS
+        self._executor = ThreadPoolExecutor(self._threads) if self._threads > 1 else None
+        self._buffer = bytearray()
+
+    def writable(self):
+        return True
+
+    def _write_blocks(self, data):
+        blocks = [data[i:i + BGZF_BLOCK_SIZE] for i in range(0, len(data), BGZF_BLOCK_SIZE)]
+        if self._executor is None:
+            compressed = map(_deflate_bgzf_block, blocks)
+        else:
+            compressed = self._executor.map(_deflate_bgzf_block, blocks)
+        self._handle.write(b''.join(compressed))
+
+    def write(self, data):
+        self._buffer += data
+        batch_size = BGZF_BLOCK_SIZE * self._threads * 4
+        if len(self._buffer) >= batch_size:
+            n = len(self._buffer) - len(self._buffer) % BGZF_BLOCK_SIZE
+            self._write_blocks(bytes(self._buffer[:n]))
+            del self._buffer[:n]
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            try:
+                if self._buffer:
+                    self._write_blocks(bytes(self._buffer))
+                    self._buffer = bytearray()
+                self._handle.write(_deflate_bgzf_block(b''))
+            finally:
+                if self._executor is not None:
+                    self._executor.shutdown()
+                self._handle.close()
+        super().close()
+
+
+def _import_zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(
+            "Reading and writing .zst files requires the zstandard package. It can be installed using pip: 'pip install zstandard'"
+        )
+    return zstandard
+
+
+def fasta_compression(filename, mode='r'):
+    """
+    Args:
+    - filename  (str) Path to the FASTA file.
+    - mode      (str) 'r' to detect the compression from the file content, 'w' to choose it from the file extension.
+
+    Returns one of 'bgzf', 'gzip', 'zstd' or None for plain text.
+    """
+    if 'w' in mode:
+        name = filename.lower()
+        for extension, compression in FASTA_COMPRESSION_EXTENSIONS.items():
+            if name.endswith(extension):
+                return compression
+        return None
+
+    with open(filename, 'rb') as handle:
+        magic = handle.read(4)
+    if magic == ZSTD_MAGIC:
+        return 'zstd'
+    if magic[:2] == GZIP_MAGIC:
+        return 'bgzf' if is_bgzf(filename) else 'gzip'
+    return None
+
+
+def open_fasta(filename, mode='r', threads=None):
+    """
+    Open a plain text, gzip/BGZF or zstd compressed FASTA file.
+    Compression is detected from the file content when reading and from the file extension
+    ('.gz', '.bgz', '.zst') when writing. Gzip output is written as BGZF.
+
+    Args:
+    - filename  (str) Path to the FASTA file.
+    - mode      (str) 'r', 'w', 'rb' or 'wb'. Default: 'r'.
+    - threads   (int) Number of threads used for BGZF and zstd (de)compression.
+                Default: None -> FASTA_IO_THREADS.
+
+    Returns a file object.
+    """
+    if mode not in ('r', 'w', 'rb', 'wb', 'rt', 'wt'):
+        raise ValueError(f"Unsupported mode: {mode}")
+    threads = threads or FASTA_IO_THREADS
+    writing = 'w' in mode
+    compression = fasta_compression(filename, mode)
+
+    if compression is None:
+        if 'b' in mode:
+            return open(filename, mode)
+        return open(filename, mode, encoding='utf-8')
+
+    if compression == 'bgzf':
+        if writing:
+            handle = io.BufferedWriter(BgzfWriter(filename, threads), buffer_size=BGZF_BLOCK_SIZE)
+        else:
+            handle = io.BufferedReader(BgzfReader(filename, threads), buffer_size=BGZF_BLOCK_SIZE)
+    elif compression == 'gzip':
+        handle = gzip.open(filename, 'rb')
+    else:
+        zstandard = _import_zstandard()
+        if writing:
+            handle = zstandard.open(filename, 'wb', cctx=zstandard.ZstdCompressor(threads=threads))
+        else:
+            handle = zstandard.open(filename, 'rb')
+
+    if 'b' in mode:
+        return handle
+    return io.TextIOWrapper(handle, encoding='utf-8')
+
+
+def is_bgzf(filename):
+    """Returns True if the file starts with a BGZF block header (as written by bgzip)."""
+    with open(filename, 'rb') as handle:
+        try:
+            return _read_bgzf_header(handle) is not None
+        except ValueError:
+            return False
+
+
+def _bgzf_block_offsets(filename):
+    """
+    Returns a list of (compressed offset, uncompressed offset) tuples, one for every
+    BGZF block in the file. Only block headers and trailers are read.
+    """
+    offsets = []
+    coffset = 0
+    uoffset = 0
+    with open(filename, 'rb') as handle:
+        while True:
+            sizes = _read_bgzf_header(handle)
+            if sizes is None:
+                break
+            block_size = sizes[0]
+            handle.seek(coffset + block_size - 4)
+            isize = struct.unpack('<I', handle.read(4))[0]
+            offsets.append((coffset, uoffset))
+            coffset += block_size
+            uoffset += isize
+    return offsets
+
+
+class FastaIndex:
+    """
+    Random access to the records of a FASTA file through a samtools-compatible .fai index.
+    Plain text files are memory-mapped; bgzip-compressed files are read block by block.
+    """
+
+    def __init__(self, filename, entries, block_offsets=None):
+        """
+        Args:
+        - filename        (str) Path to the FASTA file.
+        - entries         (dict) Record name -> (length, offset, line bases, line width), in file order.
+        - block_offsets   (list) (compressed, uncompressed) offset of every BGZF block, or None for plain text files.
+        """
+        self.filename = filename
+        self.entries = entries
+        self._block_offsets = block_offsets
+        self._block_uoffsets = [u for _, u in block_offsets] if block_offsets else None
+        self._block_cache = (None, b'')
+        self._handle = open(filename, 'rb')
+        if block_offsets is None and os.path.getsize(filename) > 0:
+            self._data = mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._data = b''
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._handle.close()
+
+    def _read_block(self, block):
+        if self._block_cache[0] != block:
+            self._handle.seek(self._block_offsets[block][0])
+            self._block_cache = (block, _read_bgzf_block(self._handle))
+        return self._block_cache[1]
+
+    def _read(self, start, end):
+        """Returns the raw (uncompressed) bytes in [start, end) of the file."""
+        if self._block_offsets is None:
+            return self._data[start:end]
+
+        block = bisect.bisect_right(self._block_uoffsets, start) - 1
+        chunks = []
+        position = start
+        while position < end and block < len(self._block_offsets):
+            data = self._read_block(block)
+            block_start = self._block_uoffsets[block]
+            chunks.append(data[position - block_start:end - block_start])
+            position = block_start + len(data)
+            block += 1
+        return b''.join(chunks)
+
+    def fetch(self, name, start=0, end=None):
+        """
+        Args:
+        - name    (str) Record name (text following the > until the first whitespace).
+        - start   (int) 0-based start position. Default: 0.
+        - end     (int) 0-based exclusive end position. Default: None -> end of the record.
+
+        Returns the (sub)sequence as a string.
+        """
+        if name not in self.entries:
+            raise KeyError(f"Sequence '{name}' not found in FASTA index of {self.filename}.")
+
+        length, offset, line_bases, line_width = self.entries[name]
+        start = max(0, start)
+        end = length if end is None else min(end, length)
+        if start >= end:
+            return ''
+
+        # Byte positions account for the newline characters at the end of every line
+        raw_start = offset + (start // line_bases) * line_width + start % line_bases
+        raw_end = offset + ((end - 1) // line_bases) * line_width + (end - 1) % line_bases + 1
+        raw = self._read(raw_start, raw_end)
+        if line_width > line_bases:
+            raw = raw.replace(b'\n', b'').replace(b'\r', b'')
+        return raw.decode('ascii')
+
+
+class FastaWriter:
+    """
+    Buffered FASTA writer. Records are assembled in a preallocated buffer, sequence lines are
+    wrapped with numpy views of the buffer instead of per-line writes, and the buffer is flushed
+    to the (optionally compressed) file in large blocks.
+    """
+
+    def __init__(self, filename, line_width=FASTA_LINE_WIDTH, buffer_size=FASTA_WRITE_BUFFER_SIZE, threads=None):
+        """
+        Args:
+        - filename      (str) Path to the output FASTA file. Compressed if it ends with .gz, .bgz or .zst.
+        - line_width    (int) Number of sequence characters per line. None or 0 -> one line per sequence.
+                        Default: FASTA_LINE_WIDTH.
+        - buffer_size   (int) Size of the write buffer in bytes. Default: FASTA_WRITE_BUFFER_SIZE.
+        - threads       (int) Number of compression threads. Default: None -> FASTA_IO_THREADS.
+        """
+        self.line_width = line_width or None
+        self._handle = open_fasta(filename, 'wb', threads)
+        self._buffer = bytearray(buffer_size)
+        self._view = memoryview(self._buffer)
+        self._array = np.frombuffer(self._buffer, dtype=np.uint8)
+        self._size = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def flush(self):
+        if self._size:
+            self._handle.write(self._view[:self._size])
+            self._size = 0
+
+    def close(self):
+        if not self._handle.closed:
+            self.flush()
+            self._view.release()
+            self._handle.close()
+
+    def _append(self, data):
+        n = len(data)
+        if self._size + n > len(self._buffer):
+            self.flush()
+            if n > len(self._buffer):
+                self._handle.write(data)
+                return
+        self._view[self._size:self._size + n] = data
+        self._size += n
+
+    def _append_wrapped(self, seq):
+        """Append seq (bytes-like) as lines of line_width characters, each ending with a newline."""
+        width = self.line_width
+        # Split very long sequences into pieces of whole lines that fit into the buffer
+        max_bases = max(width, (len(self._buffer) // (width + 1)) * width)
+        for piece_start in range(0, len(seq), max_bases):
+            piece = np.frombuffer(seq[piece_start:piece_start + max_bases], dtype=np.uint8)
+            n_full, remainder = divmod(len(piece), width)
+            out_len = n_full * (width + 1) + (remainder + 1 if remainder else 0)
+            if self._size + out_len > len(self._buffer):
+                self.flush()
+            out = self._array[self._size:self._size + out_len]
+
+            if n_full:
+                lines = out[:n_full * (width + 1)].reshape(n_full, width + 1)
+                lines[:, :width] = piece[:n_full * width].reshape(n_full, width)
+                lines[:, width] = 10  # newline
+            if remainder:
+                out[n_full * (width + 1):-1] = piece[n_full * width:]
+                out[-1] = 10
+            self._size += out_len
+
+    def write_record(self, id, seq, description=""):
+        """
+        Args:
+        - id            (str) Record id.
+        - seq           (str/bytes) Sequence.
+        - description   (str) Record description. Default: "".
+        """
+        if description:
+            self._append(f">{id} {description}\n".encode('utf-8'))
+        else:
+            self._append(f">{id}\n".encode('utf-8'))
+
+        if isinstance(seq, str):
+            seq = seq.encode('utf-8')
+        if self.line_width is None:
+            self._append(seq)
+            self._append(b'\n')
+        elif len(seq) <= self.line_width:
+            if len(seq):
+                self._append(seq)
+                self._append(b'\n')
+        else:
+            self._append_wrapped(seq)
+
+    def write(self, records):
+        """
+        Args:
+        - records   Iterable of record objects (with id, seq and optionally description attributes)
+                    and/or FastaBatch objects, or a single FastaBatch.
+        """
+        if isinstance(records, FastaBatch):
+            records = [records]
+
+        for record in records:
+            if isinstance(record, FastaBatch):
+                # Write straight from the batch buffer without creating record objects
+                for i in range(len(record)):
+                    self.write_record(record.ids[i], record.seq_bytes(i), record.descriptions[i])
+            elif isinstance(record, FastaRecord):
+                self.write_record(record.id, record.seq_bytes, record.description)
+            else:
+                self.write_record(record.id, str(record.seq), getattr(record, 'description', ''))
+
+
+def _fasta_chunk_bounds(filename, chunk_size):
+    """
+    Split a plain text FASTA file into byte ranges of roughly chunk_size bytes
+    that each start at the beginning of a record.
+
+    Returns a list of (start, end) tuples.
+    """
+    size = os.path.getsize(filename)
+    if size == 0:
+        return []
+
+    bounds = []
+    start = 0
+    with open(filename, 'rb') as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        while start < size:
+            # The next record boundary is the first newline followed by '>' after the target position
+            boundary = data.find(b'\n>', start + chunk_size)
+            end = size if boundary == -1 else boundary + 1
+            bounds.append((start, end))
+            start = end
+    return bounds
+
+
+def _fasta_parse_context():
+    """
+    Returns the multiprocessing context used for FASTA parsing pools.
+    Forking is avoided because the parent process may be running HTTP or I/O threads.
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+
+def _parse_fasta_range(filename, start, end):
+    """
+    Parse the records in the [start, end) byte range of a plain text FASTA file.
+
+    Returns a FastaBatch.
+    """
+    with open(filename, 'rb') as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        text = data[start:end].decode('utf-8')
+
+    ids = []
+    descriptions = []
+    seqs = []
+    # Anything before the first header is ignored, as in FastaIO.parse
+    for record in ('\n' + text).split('\n>')[1:]:
+        header, _, body = record.partition('\n')
+        header = header.strip()
+        if ' ' in header:
+            seq_id, description = header.split(' ', 1)
+        else:
+            seq_id, description = header, ''
+        ids.append(seq_id)
+        descriptions.append(description)
+        if ' ' in body or '\t' in body:
+            # Keep whitespace inside lines, as FastaIO.parse only strips line ends
+            seqs.append(''.join(line.strip() for line in body.split('\n')))
+        else:
+            seqs.append(body.replace('\n', '').replace('\r', ''))
+    return FastaBatch.from_sequences(ids, descriptions, seqs)
 
 
 class FastaIO:
     """Simple FASTA parser and writer, compatible with BioPython SeqIO interface"""
     
     @staticmethod
-    def parse(filename, format=None):
-        """Parse FASTA file and yield records. Compatible with SeqIO.parse()"""
+    def parse(filename, format=None, as_bytes=False):
+        """
+        Parse (optionally gzip/BGZF or zstd compressed) FASTA file and yield records. Compatible with SeqIO.parse()
+        With as_bytes=True, record sequences are stored as bytes.
+        """
         if format and format.lower() != "fasta":
             raise ValueError(f"Unsupported format: {format}")
         
-        with open(filename, 'r', encoding='utf-8') as handle:
+        with open_fasta(filename) as handle:
             current_id = None
             current_description = ""
             current_seq = []
@@ -1129,7 +3227,7 @@ class FastaIO:
                     # Yield previous record if exists
                     if current_id is not None:
                         seq_str = ''.join(current_seq)
-                        yield FastaRecord(seq_str, current_id, current_description)
+                        yield FastaRecord(seq_str, current_id, current_description, as_bytes)
                     
                     # Start new record
                     header = line[1:]  # Remove '>'
@@ -1147,23 +3245,219 @@ class FastaIO:
             # Yield final record if exists
             if current_id is not None:
                 seq_str = ''.join(current_seq)
-                yield FastaRecord(seq_str, current_id, current_description)
+                yield FastaRecord(seq_str, current_id, current_description, as_bytes)
     
     @staticmethod
-    def write(records, filename, format=None):
-        """Write records to FASTA file. Compatible with SeqIO.write()"""
+    def parse_parallel(filename, workers=None, batches=False, chunk_size=None, as_bytes=False):
+        """
+        Parse a large FASTA file in a process pool. The memory-mapped file is split into byte ranges
+        at record boundaries, and records are yielded in file order.
+        Compressed files are parsed sequentially with FastaIO.parse.
+        Worker processes are started with forkserver or spawn, so scripts calling this with
+        workers > 1 need an `if __name__ == "__main__":` guard.
+
+        Args:
+        - filename      (str) Path to the FASTA file.
+        - workers       (int) Number of worker processes. Default: None -> FASTA_PARSE_WORKERS.
+        - batches       (bool) If True, yield one FastaBatch per byte range instead of FastaRecord objects.
+                        Default: False.
+        - chunk_size    (int) Approximate number of bytes parsed per task. Default: None -> FASTA_PARSE_CHUNK_SIZE.
+        - as_bytes      (bool) If True, FastaRecord sequences are stored as bytes. Default: False.
+        """
+        workers = workers or FASTA_PARSE_WORKERS
+        chunk_size = chunk_size or FASTA_PARSE_CHUNK_SIZE
+
+        if fasta_compression(filename) is not None:
+            chunks = FastaIO._record_batches(FastaIO.parse(filename, as_bytes=True))
+        else:
+            bounds = _fasta_chunk_bounds(filename, chunk_size)
+            if workers > 1 and len(bounds) > 1:
+                chunks = FastaIO._parse_ranges_in_pool(filename, bounds, workers)
+            else:
+                chunks = (_parse_fasta_range(filename, start, end) for start, end in bounds)
+
+        for batch in chunks:
+            if batches:
+                yield batch
+            else:
+                for i in range(len(batch)):
+                    seq = batch.data[batch.offsets[i]:batch.offsets[i + 1]]
+                    yield FastaRecord(
+                        seq if as_bytes else seq.decode('utf-8'), batch.ids[i], batch.descriptions[i]
+                    )
+
+    @staticmethod
+    def _parse_ranges_in_pool(filename, bounds, workers):
+        """
+        Yields the parsed byte ranges in order, keeping a limited number of tasks in flight.
+        Falls back to parsing the remaining ranges in this process if the pool cannot start or breaks.
+        """
+        done = 0
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=_fasta_parse_context()) as executor:
+                pending = deque()
+                submitted = 0
+                while done < len(bounds):
+                    while submitted < len(bounds) and len(pending) < workers * 2:
+                        pending.append(executor.submit(_parse_fasta_range, filename, *bounds[submitted]))
+                        submitted += 1
+                    batch = pending.popleft().result()
+                    done += 1
+                    yield batch
+        except (BrokenProcessPool, OSError) as e:
+            logger.warning(f'Could not parse {filename} in worker processes ({e}). Parsing in the main process instead.')
+
+        for start, end in bounds[done:]:
+            yield _parse_fasta_range(filename, start, end)
+
+    @staticmethod
+    def _record_batches(records):
+        """Groups FastaRecord objects into FastaBatch objects of FASTA_BATCH_RECORDS records."""
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= FASTA_BATCH_RECORDS:
+                yield FastaBatch.from_records(batch)
+                batch = []
+        if batch:
+            yield FastaBatch.from_records(batch)
+
+    @staticmethod
+    def write(records, filename, format=None, line_width=FASTA_LINE_WIDTH):
+        """
+        Write records to FASTA file, compressed if filename ends with .gz, .bgz or .zst. Compatible with SeqIO.write()
+        records can be an iterable of record objects and/or FastaBatch objects, or a single FastaBatch.
+        Sequences are wrapped at line_width characters (None -> one line per sequence).
+        """
         if format and format.lower() != "fasta":
             raise ValueError(f"Unsupported format: {format}")
-        
-        with open(filename, 'w', encoding='utf-8') as handle:
-            for record in records:
-                # Write header
-                if hasattr(record, 'description') and record.description:
-                    handle.write(f">{record.id} {record.description}\n")
-                else:
-                    handle.write(f">{record.id}\n")
-                
-                # Write sequence (wrap at 70 characters)
-                seq_str = str(record.seq)
-                for i in range(0, len(seq_str), 70):
-                    handle.write(seq_str[i:i+70] + '\n')
+
+        with FastaWriter(filename, line_width=line_width) as writer:
+            writer.write(records)
+
+    @staticmethod
+    def build_index(filename):
+        """
+        Build a samtools-compatible .fai index (and .gzi block index for bgzip-compressed files).
+        The index is written next to the FASTA file when the directory is writable.
+
+        Args:
+        - filename  (str) Path to the (optionally bgzip-compressed) FASTA file.
+
+        Returns a FastaIndex object.
+        """
+        block_offsets = None
+        compression = fasta_compression(filename)
+        if compression == 'bgzf':
+            block_offsets = _bgzf_block_offsets(filename)
+        elif compression is not None:
+            raise ValueError(
+                f"{filename} is {compression} compressed and cannot be indexed. Compress it with bgzip to enable random access."
+            )
+        handle = open_fasta(filename, 'rb')
+
+        entries = {}
+        name = None
+        with handle:
+            position = 0
+            for i, line in enumerate(handle):
+                position += len(line)
+                if line.startswith(b'>'):
+                    fields = line[1:].split(None, 1)
+                    name = fields[0].decode() if fields else ''
+                    if name in entries:
+                        raise ValueError(f"Duplicate sequence name '{name}' in {filename}.")
+                    # length, offset, line bases, line width, and whether a short line was seen
+                    entries[name] = [0, position, 0, 0, False]
+                    continue
+                if i == 0:
+                    raise ValueError("Expected FASTA file to start with a '>' character. ")
+
+                entry = entries[name]
+                bases = len(line.rstrip(b'\r\n'))
+                if bases == 0 and entry[0] == 0:
+                    # Skip blank lines before the sequence
+                    entry[1] = position
+                    continue
+                # The last line of the file may lack its line break
+                line_width = len(line) if line.endswith(b'\n') else entry[3]
+                if entry[2] == 0:
+                    entry[2], entry[3] = bases, len(line)
+                elif entry[4] or bases > entry[2] or (bases == entry[2] and line_width != entry[3]):
+                    if bases > 0:
+                        raise ValueError(
+                            f"Sequence '{name}' in {filename} has lines of different lengths and cannot be indexed."
+                        )
+                if bases < entry[2]:
+                    entry[4] = True
+                entry[0] += bases
+
+        entries = {
+            name: (length, offset, line_bases or length, line_width or length + 1)
+            for name, (length, offset, line_bases, line_width, _) in entries.items()
+        }
+
+        try:
+            with open(filename + '.fai', 'w') as fai:
+                for name, entry in entries.items():
+                    fai.write('\t'.join([name] + [str(x) for x in entry]) + '\n')
+            if block_offsets is not None:
+                # The first block (0, 0) is implicit in the .gzi format
+                with open(filename + '.gzi', 'wb') as gzi:
+                    gzi.write(struct.pack('<Q', len(block_offsets) - 1))
+                    for coffset, uoffset in block_offsets[1:]:
+                        gzi.write(struct.pack('<QQ', coffset, uoffset))
+        except OSError as e:
+            logger.debug(f"Could not write FASTA index for {filename}: {e}")
+
+        return FastaIndex(filename, entries, block_offsets)
+
+    @staticmethod
+    def index(filename):
+        """
+        Open a FASTA file for random access, reusing an up-to-date .fai (and .gzi) index
+        next to the file or building one otherwise.
+
+        Args:
+        - filename  (str) Path to the (optionally bgzip-compressed) FASTA file.
+
+        Returns a FastaIndex object.
+        """
+        fai_path = filename + '.fai'
+        bgzf = is_bgzf(filename)
+        required = [fai_path, filename + '.gzi'] if bgzf else [fai_path]
+        fasta_mtime = os.path.getmtime(filename)
+        if not all(os.path.exists(path) and os.path.getmtime(path) >= fasta_mtime for path in required):
+            return FastaIO.build_index(filename)
+
+        entries = {}
+        with open(fai_path) as fai:
+            for line in fai:
+                fields = line.rstrip('\n').split('\t')
+                entries[fields[0]] = tuple(int(x) for x in fields[1:5])
+
+        block_offsets = None
+        if bgzf:
+            block_offsets = [(0, 0)]
+            with open(filename + '.gzi', 'rb') as gzi:
+                n_blocks = struct.unpack('<Q', gzi.read(8))[0]
+                for _ in range(n_blocks):
+                    block_offsets.append(struct.unpack('<QQ', gzi.read(16)))
+
+        return FastaIndex(filename, entries, block_offsets)
+
+    @staticmethod
+    def fetch(filename, seq_id, start=0, end=None):
+        """
+        Fetch one record, or the [start, end) range of it, from an indexed FASTA file.
+
+        Args:
+        - filename  (str) Path to the (optionally bgzip-compressed) FASTA file.
+        - seq_id    (str) Record name (text following the > until the first whitespace).
+        - start     (int) 0-based start position. Default: 0.
+        - end       (int) 0-based exclusive end position. Default: None -> end of the record.
+
+        Returns the (sub)sequence as a string.
+        """
+        with FastaIO.index(filename) as fasta_index:
+            return fasta_index.fetch(seq_id, start, end)
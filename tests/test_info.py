@@ -3,7 +3,11 @@ import unittest
 # import pandas as pd
 import json
 # import time
-from gget.gget_info import info
+import unittest.mock
+import pandas as pd
+import numpy as np
+from gget import gget_info
+from gget.gget_info import info, info_iter, _feature_tables, _translation_lists
 from .from_json import from_json
 
 # Load dictionary containing arguments and expected results
@@ -16,6 +20,106 @@ with open("./tests/fixtures/test_info.json") as json_file:
 class TestInfo(unittest.TestCase, metaclass=from_json(info_dict, info)):
     pass  # all tests are loaded from json
 
+
+class TestInfoOffline(unittest.TestCase):
+    def test_feature_tables(self):
+        master_dict = {
+            "ENSG1": {
+                "id": "ENSG1",
+                "object_type": "Gene",
+                "ensembl_id": "ENSG1.2",
+                "Transcript": [
+                    {
+                        "id": "ENST1",
+                        "version": 1,
+                        "biotype": "protein_coding",
+                        "display_name": "GENE-201",
+                        "strand": -1,
+                        "start": 10,
+                        "end": 50,
+                        "Exon": [
+                            {"id": "ENSE1", "version": 3, "start": 40, "end": 50},
+                            {"id": "ENSE2", "start": 10, "end": 20},
+                        ],
+                        "Translation": {"id": "ENSP1", "start": 12, "end": 45},
+                    }
+                ],
+            },
+            "ENST2": {
+                "id": "ENST2",
+                "version": 4,
+                "object_type": "Transcript",
+                "ensembl_id": "ENST2.4",
+                "Exon": [{"id": "ENSE3", "start": 100, "end": 200}],
+            },
+            "ENSE4": {"id": "ENSE4", "object_type": "Exon", "ensembl_id": "ENSE4"},
+        }
+        df_transcripts, df_exons, df_translations = _feature_tables(
+            master_dict, list(master_dict)
+        )
+
+        self.assertEqual(
+            df_transcripts[["ensembl_id", "transcript_id"]].values.tolist(),
+            [["ENSG1.2", "ENST1.1"], ["ENST2.4", "ENST2.4"]],
+        )
+        self.assertEqual(
+            df_exons.values.tolist(),
+            [
+                ["ENSG1.2", "ENST1.1", "ENSE1.3", 40, 50],
+                ["ENSG1.2", "ENST1.1", "ENSE2", 10, 20],
+                ["ENST2.4", "ENST2.4", "ENSE3", 100, 200],
+            ],
+        )
+        self.assertEqual(
+            df_translations.values.tolist(),
+            [["ENSG1.2", "ENST1.1", "ENSP1", 12, 45]],
+        )
+
+    def test_translation_lists(self):
+        results = [
+            {"object_type": "Gene", "Transcript": []},
+            {
+                "object_type": "Transcript",
+                "Exon": [{"id": "ENSE1", "start": 1, "end": 90}],
+                "Translation": {"id": "ENSP1", "version": 2, "start": 12, "end": 45},
+            },
+            {"object_type": "Transcript", "Exon": []},
+        ]
+        rows = _translation_lists(results)
+
+        # Translation columns list the translation of queried transcripts, not their exons
+        self.assertTrue(all(np.isnan(x) for x in rows[0]))
+        self.assertEqual(rows[1], [["ENSP1.2"], [12], [45]])
+        self.assertEqual(rows[2], [[], [], []])
+
+    def test_info_iter_chunks(self):
+        submitted = []
+
+        def fake_info(ens_ids, **kwargs):
+            submitted.append(ens_ids)
+            # None of the IDs in the last chunk were found
+            if ens_ids == ["ENSG5"]:
+                return None
+            return pd.DataFrame({"ensembl_id": ens_ids})
+
+        with unittest.mock.patch.object(gget_info, "info", fake_info):
+            result_to_test = [
+                df["ensembl_id"].tolist()
+                for df in info_iter(
+                    ["ENSG1.1", "ENSG2", "ENSG1", "ENSG3", "ENSG4", "ENSG5"],
+                    chunk_size=2,
+                    verbose=False,
+                )
+            ]
+
+        self.assertEqual(submitted, [["ENSG1", "ENSG2"], ["ENSG3", "ENSG4"], ["ENSG5"]])
+        self.assertEqual(result_to_test, [["ENSG1", "ENSG2"], ["ENSG3", "ENSG4"]])
+
+    def test_info_iter_bad_chunk_size(self):
+        with self.assertRaises(ValueError):
+            next(info_iter(["ENSG1"], chunk_size=0))
+
+
 # # todo convert to json loading once wormbase & flybase IDs are fixed. At that point, the json test framework will need a way to handle the ANY values
 # class TestInfo(unittest.TestCase):
 #     maxDiff = None
@@ -2,6 +2,7 @@ import json
 
 import pytest
 import unittest
+import unittest.mock
 import gget
 import pandas as pd
 import os
@@ -55,6 +56,8 @@ def create_temp_files():
     # Cleanup
     os.remove(temp_csv_file.name)
     os.remove(temp_fasta_file.name)
+    if os.path.exists(temp_fasta_file.name + ".fai"):
+        os.remove(temp_fasta_file.name + ".fai")
 
 
 def assert_global_variables_zero(
@@ -226,9 +229,103 @@ def test_csv_of_mutations(create_temp_files):
     assert_global_variables_zero()
 
 
+def test_indexed_fasta_only_loads_referenced_sequences(create_temp_files):
+    mutation_temp_csv_file, sequence_temp_fasta_path = create_temp_files
+    expected = gget.mutate(
+        sequences=sequence_temp_fasta_path, mutations=mutation_temp_csv_file
+    )
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        fasta_path = os.path.join(tmpdir, "seqs.fa")
+        with open(fasta_path, "w") as fasta_file:
+            # Multi-line records with version numbers, plus records without mutations
+            for seq_id in ["ENST1", "ENST9", "ENST2", "ENST3", "ENST4", "ENST8"]:
+                fasta_file.write(f">{seq_id}.3 description\n")
+                for i in range(0, len(LONG_SEQUENCE), 7):
+                    fasta_file.write(LONG_SEQUENCE[i : i + 7] + "\n")
+
+        fetched = []
+        fetch = gget.utils.FastaIndex.fetch
+
+        def fetch_spy(self, name, *args, **kwargs):
+            fetched.append(name)
+            return fetch(self, name, *args, **kwargs)
+
+        with unittest.mock.patch.object(gget.utils.FastaIndex, "fetch", fetch_spy):
+            result = gget.mutate(
+                sequences=fasta_path, mutations=mutation_temp_csv_file
+            )
+
+        assert result == expected
+        assert fetched == ["ENST1.3", "ENST2.3", "ENST3.3", "ENST4.3"]
+        assert os.path.exists(fasta_path + ".fai")
+
+
+def test_mutate_out_fasta(create_temp_files):
+    mutation_temp_csv_file, sequence_temp_fasta_path = create_temp_files
+    expected = gget.mutate(
+        sequences=sequence_temp_fasta_path, mutations=mutation_temp_csv_file
+    )
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        out = os.path.join(tmpdir, "mutated.fa")
+        gget.mutate(
+            sequences=sequence_temp_fasta_path,
+            mutations=mutation_temp_csv_file,
+            out=out,
+        )
+        with open(out) as f:
+            lines = f.read().splitlines()
+
+    # Unwrapped output: one header line and one sequence line per mutation
+    assert lines[0::2] == [
+        ">ENST1:c.35G>A",
+        ">ENST2:c.65G>A",
+        ">ENST3:c.35del",
+        ">ENST4:c.4_5insT",
+    ]
+    assert lines[1::2] == expected
+
+
 def test_mismatch_error():
     gget.gget_mutate.mutate(sequences=LONG_SEQUENCE, mutations="c.2G>A")
 
     assert gget.gget_mutate.cosmic_incorrect_wt_base == 1
 
     assert_global_variables_zero()
+
+
+def test_slice_sequences_matches_python_slicing(monkeypatch):
+    # Small chunks so several gathers are needed
+    monkeypatch.setattr(gget.gget_mutate, "SLICE_CHUNK_SIZE", 7)
+    sequences = ["ACGTACGTAC", "", "GGCCTTAA", "NNACGT"]
+    codes = [0, 0, 0, 1, 2, 2, 3, 0, 2, 3]
+    starts = [0, 3, -4, 0, 5, -20, 2, 8, 6, -1]
+    ends = [10, 3, -1, 4, 20, 3, 6, 4, -1, 100]
+
+    result = gget.gget_mutate.slice_sequences(sequences, codes, starts, ends)
+
+    assert result.tolist() == [
+        sequences[c][s:e] for c, s, e in zip(codes, starts, ends)
+    ]
+
+    # A prebuilt buffer gives the same slices and can be reused
+    seq_buffer = gget.gget_mutate.SequenceBuffer(sequences, ["a", "b", "c", "d"])
+    for _ in range(2):
+        assert (
+            gget.gget_mutate.slice_sequences(seq_buffer, codes, starts, ends).tolist()
+            == result.tolist()
+        )
+    assert seq_buffer.codes(["d", "a", "x"]).tolist() == [3, 0, -1]
+
+    # Non-ASCII sequences fall back to Python slicing
+    assert gget.gget_mutate.slice_sequences(
+        ["ACGTé", "GG"], [0, 1], [3, 0], [5, 1]
+    ).tolist() == ["Té", "G"]
+
+    assert gget.gget_mutate.slice_strings(
+        ["ACGT", "TTGA"], [1, 0], [3, -1]
+    ).tolist() == [
+        "CG",
+        "TTG",
+    ]
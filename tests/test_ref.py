@@ -1,6 +1,10 @@
 import unittest
+import unittest.mock
 import json
+import tempfile
+from gget import utils, gget_ref
 from gget.gget_ref import ref
+from gget.constants import ENSEMBL_FTP_URL
 from .from_json import from_json
 
 # Load dictionary containing arguments and expected results
@@ -10,3 +14,114 @@ with open("./tests/fixtures/test_ref.json") as json_file:
 
 class TestRef(unittest.TestCase, metaclass=from_json(ref_dict, ref)):
     pass  # all tests are loaded from json
+
+
+class TestRefOffline(unittest.TestCase):
+    def test_ref_memoized_ftp_pages(self):
+        # FTP pages (table cells: name, date, size) of the requested folders
+        tables = {
+            "table:gtf/homo_sapiens": [
+                "",
+                "Homo_sapiens.GRCh38.110.gtf.gz",
+                "2023-04-21 23:40",
+                "53M",
+                "",
+            ],
+            "table:fasta/homo_sapiens/dna": [
+                "",
+                "Homo_sapiens.GRCh38.dna.toplevel.fa.gz",
+                "2023-04-21 23:40",
+                "1.0G",
+                "",
+            ],
+        }
+        requested_urls = []
+
+        def fake_http_get(url, **kwargs):
+            requested_urls.append(url)
+            return unittest.mock.Mock(status_code=404)
+
+        cache_dir = utils.CACHE_DIR
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            utils.CACHE_DIR = tmp_dir
+            utils._ens_ftp_index[(ENSEMBL_FTP_URL, 110)] = dict(tables)
+            try:
+                with unittest.mock.patch.object(
+                    gget_ref, "find_latest_ens_rel", return_value=110
+                ), unittest.mock.patch.object(
+                    gget_ref, "ref_species_options", return_value=["homo_sapiens"]
+                ), unittest.mock.patch.object(
+                    utils, "http_get", fake_http_get
+                ):
+                    for _ in range(2):
+                        result_to_test = ref(
+                            "human",
+                            which=["gtf", "dna", "ncrna"],
+                            release=110,
+                            ftp=True,
+                            verbose=False,
+                        )
+            finally:
+                utils.CACHE_DIR = cache_dir
+                utils._ens_ftp_index.pop((ENSEMBL_FTP_URL, 110), None)
+
+        self.assertEqual(
+            result_to_test,
+            [
+                "http://ftp.ensembl.org/pub/release-110/gtf/homo_sapiens/Homo_sapiens.GRCh38.110.gtf.gz",
+                "http://ftp.ensembl.org/pub/release-110/fasta/homo_sapiens/dna/Homo_sapiens.GRCh38.dna.toplevel.fa.gz",
+                "",
+            ],
+        )
+        # The missing ncRNA folder was only requested once
+        self.assertEqual(
+            requested_urls,
+            ["http://ftp.ensembl.org/pub/release-110/fasta/homo_sapiens/ncrna/"],
+        )
+
+    def test_ref_multiple_species(self):
+        tables = {
+            f"table:gtf/{species}": [
+                "",
+                f"{species}.110.gtf.gz",
+                "2023-04-21 23:40",
+                "1M",
+                "",
+            ]
+            for species in ["homo_sapiens", "mus_musculus"]
+        }
+        cache_dir = utils.CACHE_DIR
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            utils.CACHE_DIR = tmp_dir
+            utils._ens_ftp_index[(ENSEMBL_FTP_URL, 110)] = tables
+            try:
+                with unittest.mock.patch.object(
+                    gget_ref, "find_latest_ens_rel", return_value=110
+                ), unittest.mock.patch.object(
+                    gget_ref,
+                    "ref_species_options",
+                    return_value=["homo_sapiens", "mus_musculus"],
+                ):
+                    result_to_test = ref(
+                        ["human", "mus_musculus"], which="gtf", verbose=False
+                    )
+            finally:
+                utils.CACHE_DIR = cache_dir
+                utils._ens_ftp_index.pop((ENSEMBL_FTP_URL, 110), None)
+
+        self.assertEqual(list(result_to_test), ["homo_sapiens", "mus_musculus"])
+        self.assertEqual(
+            result_to_test["mus_musculus"]["annotation_gtf"],
+            {
+                "ftp": "http://ftp.ensembl.org/pub/release-110/gtf/mus_musculus/mus_musculus.110.gtf.gz",
+                "ensembl_release": 110,
+                "release_date": "2023-04-21",
+                "release_time": "23:40",
+                "bytes": "1M",
+            },
+        )
+
+    def test_ref_no_species(self):
+        for species in [[], "", ["homo_sapiens", ""]]:
+            with self.assertRaises(ValueError):
+                ref(species, which="gtf", verbose=False)
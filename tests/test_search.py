@@ -1,7 +1,18 @@
 import unittest
+import unittest.mock
+import os
+import gzip
+import tempfile
 import pandas as pd
 import json
-from gget.gget_search import search
+from gget import gget_search
+from gget.gget_search import (
+    search,
+    build_search_query,
+    build_search_index,
+    mysql_connection,
+    _collapse_results,
+)
 from .from_json import from_json
 
 # Load dictionary containing arguments and expected results
@@ -11,3 +22,189 @@ with open("./tests/fixtures/test_search.json") as json_file:
 
 class TestSearch(unittest.TestCase, metaclass=from_json(search_dict, search)):
     pass  # all tests are loaded from json
+
+
+class TestSearchOffline(unittest.TestCase):
+    def test_build_search_query_or(self):
+        query, params = build_search_query(["swiss", "cheese"], "gene", "or", limit=5)
+        # 5 searchable fields per searchword, in the subquery and in the outer query
+        self.assertEqual(query.count("%s"), len(params))
+        self.assertEqual(params[:5], ["%swiss%"] * 5)
+        self.assertEqual(len(params), 20)
+        self.assertIn("LIMIT 5", query)
+        self.assertNotIn("HAVING", query)
+        self.assertIn("SELECT DISTINCT gene.stable_id", query)
+
+    def test_build_search_query_and(self):
+        query, params = build_search_query(["swiss", "cheese"], "transcript", "and")
+        self.assertEqual(query.count("%s"), len(params))
+        # Subquery WHERE, HAVING, and rows matching the first searchword
+        self.assertEqual(len(params), 25)
+        self.assertEqual(params[-5:], ["%swiss%"] * 5)
+        self.assertIn("HAVING", query)
+        self.assertNotIn("LIMIT", query)
+        self.assertIn("transcript_attrib", query)
+
+    def test_mysql_connection_pool(self):
+        attempted_ports = []
+
+        def fake_connect(host, database, user, password, port):
+            attempted_ports.append(port)
+            # Only the GRCh37 port hosts this database
+            if port != 3337:
+                raise Exception("Unknown database")
+            return unittest.mock.MagicMock()
+
+        with unittest.mock.patch.object(
+            gget_search, "_mysql_pool", {}
+        ), unittest.mock.patch.object(
+            gget_search, "_mysql_ports", {}
+        ), unittest.mock.patch.object(
+            gget_search.sql, "connect", fake_connect
+        ):
+            with mysql_connection("test_core_75_37") as first:
+                pass
+            with mysql_connection("test_core_75_37") as second:
+                pass
+            # A dead connection is replaced, starting with the port that worked
+            first.is_connected.return_value = False
+            with mysql_connection("test_core_75_37") as third:
+                pass
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, third)
+        self.assertEqual(attempted_ports, [3306, 5306, 4157, 3337, 3337])
+        first.close.assert_called_once()
+
+    def test_search_local_backend(self):
+        # Minimal MySQL dump of a core database (gene table columns reordered in the schema)
+        dump = {
+            "gene": [
+                ["1", "ENSG01", "11", "GABA receptor subunit", "protein_coding"],
+                ["2", "ENSG02", "12", "Swiss cheese protein", "protein_coding"],
+                [
+                    "3",
+                    "ENSG03",
+                    "\\N",
+                    "gamma-aminobutyric acid\\ttransporter",
+                    "lncRNA",
+                ],
+            ],
+            "transcript": [
+                ["1", "1", "0", "1", "1", "9", "1", "11", "ensembl", "protein_coding"]
+                + ["\\N", "1", "\\N", "ENST01", "1", "\\N", "\\N"],
+            ],
+            "xref": [
+                ["11", "1", "A", "GABRA1", "0", "GABA type A receptor", "X", ""],
+                ["12", "1", "B", "SWS1", "0", "\\N", "X", ""],
+            ],
+            "external_synonym": [["11", "GABA-A"], ["11", "EJM5"], ["12", "Cheese1"]],
+            "gene_attrib": [["2", "4", "kinase-like"]],
+            "transcript_attrib": [],
+        }
+        schema = """
+CREATE TABLE `gene` (
+  `gene_id` int(10) unsigned NOT NULL AUTO_INCREMENT,
+  `stable_id` varchar(128) DEFAULT NULL,
+  `display_xref_id` int(10) unsigned DEFAULT NULL,
+  `description` text,
+  `biotype` varchar(40) NOT NULL,
+  PRIMARY KEY (`gene_id`)
+) ENGINE=MyISAM;
+"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            dump_dir = os.path.join(tmp_dir, "test_species_core_110_1")
+            os.makedirs(dump_dir)
+            with gzip.open(
+                os.path.join(dump_dir, "test_species_core_110_1.sql.gz"), "wt"
+            ) as f:
+                f.write(schema)
+            for table, rows in dump.items():
+                with gzip.open(os.path.join(dump_dir, f"{table}.txt.gz"), "wt") as f:
+                    f.writelines("\t".join(row) + "\n" for row in rows)
+
+            with unittest.mock.patch.object(
+                gget_search, "_find_kingdom", return_value="plants"
+            ):
+                build_search_index(
+                    "test_species", dump_dir=dump_dir, index_dir=tmp_dir, verbose=False
+                )
+
+            result_to_test = search(
+                ["gaba", "kinase", "AMINOBUTYRIC"],
+                "test_species",
+                backend="local",
+                index_dir=tmp_dir,
+                verbose=False,
+            )
+            self.assertEqual(
+                result_to_test["ensembl_id"].tolist(), ["ENSG01", "ENSG02", "ENSG03"]
+            )
+            self.assertEqual(
+                result_to_test["synonym"].tolist()[:2],
+                [["EJM5", "GABA-A"], ["Cheese1"]],
+            )
+            self.assertEqual(
+                result_to_test["url"].tolist()[0],
+                "https://plants.ensembl.org/test_species/Gene/Summary?g=ENSG01",
+            )
+            self.assertEqual(
+                result_to_test["ensembl_description"].tolist()[2],
+                "gamma-aminobutyric acid\ttransporter",
+            )
+
+            # Searchwords shorter than 3 characters are matched without the trigram index
+            result_to_test = search(
+                ["ej", "gaba"],
+                "test_species",
+                andor="and",
+                backend="local",
+                index_dir=tmp_dir,
+                verbose=False,
+            )
+            self.assertEqual(result_to_test["ensembl_id"].tolist(), ["ENSG01"])
+
+            result_to_test = search(
+                "ensembl",
+                "test_species",
+                id_type="transcript",
+                backend="local",
+                index_dir=tmp_dir,
+                verbose=False,
+            )
+            self.assertEqual(len(result_to_test), 0)
+
+            with self.assertRaises(FileNotFoundError):
+                search("gaba", "other_species", backend="local", index_dir=tmp_dir)
+
+    def test_collapse_results(self):
+        df = pd.DataFrame(
+            [
+                ["ENSG2", "B", "desc B", None, "lncRNA", None],
+                ["ENSG1", "A", "desc A", "ext A", "protein_coding", "syn2"],
+                ["ENSG1", "A", "desc A", "ext A", "protein_coding", "syn1"],
+                ["ENSG1", "A", "desc A2", "ext A", "protein_coding", "syn1"],
+            ],
+            columns=[
+                "ensembl_id",
+                "gene_name",
+                "ensembl_description",
+                "ext_ref_description",
+                "biotype",
+                "synonym",
+            ],
+        )
+        result_to_test = _collapse_results(df).values.tolist()
+        self.assertEqual(
+            result_to_test[0],
+            [
+                "ENSG1",
+                "A",
+                ["desc A", "desc A2"],
+                "ext A",
+                "protein_coding",
+                ["syn1", "syn2"],
+            ],
+        )
+        self.assertEqual(result_to_test[1][:3], ["ENSG2", "B", "desc B"])
+        self.assertEqual(len(result_to_test[1][5]), 1)
@@ -1,7 +1,12 @@
 import unittest
+import unittest.mock
+import tempfile
+import gzip
+import os
 import pandas as pd
 import json
 import time
+from gget import gget_seq
 from gget.gget_seq import seq
 
 # Load dictionary containing arguments and expected results
@@ -92,3 +97,107 @@ class TestSeq(unittest.TestCase):
         result_to_test = seq(**seq_dict[test]["args"])
 
         self.assertListEqual(result_to_test, expected_result)
+
+    def test_seq_isoforms_bulk_query(self):
+        info_df = pd.DataFrame(
+            {
+                "object_type": ["Gene", "Transcript"],
+                "all_transcripts": [["ENST1.2", "ENST2.1"], None],
+            },
+            index=["ENSG1", "ENST9"],
+        )
+        submitted = []
+
+        def fake_iter_post_query_chunks(server, endpoint, ids, cache=None):
+            submitted.append(ids)
+            # Return results in chunks of two IDs
+            for i in range(0, len(ids), 2):
+                yield [
+                    {"query": id_, "id": id_, "desc": f"desc {id_}", "seq": "ACGT"}
+                    for id_ in ids[i : i + 2]
+                ]
+
+        with unittest.mock.patch.object(
+            gget_seq, "info", lambda *args, **kwargs: info_df
+        ), unittest.mock.patch.object(
+            gget_seq, "iter_post_query_chunks", fake_iter_post_query_chunks
+        ):
+            result_to_test = seq(["ENSG1", "ENST9"], isoforms=True, verbose=False)
+
+            # Stream results to a gzip-compressed FASTA file
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                out = os.path.join(tmp_dir, "results.fa.gz")
+                self.assertIsNone(
+                    seq(["ENSG1", "ENST9"], isoforms=True, verbose=False, out=out)
+                )
+                with gzip.open(out, "rt") as f:
+                    out_to_test = f.read().splitlines()
+
+        # All transcript IDs are fetched with a single (chunked) bulk query per call
+        self.assertEqual(submitted, [["ENST1", "ENST2", "ENST9"]] * 2)
+        self.assertEqual(
+            result_to_test,
+            [
+                ">ENST1 desc ENST1",
+                "ACGT",
+                ">ENST2 desc ENST2",
+                "ACGT",
+                ">ENST9 desc ENST9",
+                "ACGT",
+            ],
+        )
+        self.assertEqual(out_to_test, result_to_test)
+
+    def test_seq_duplicate_ids(self):
+        submitted = []
+
+        def fake_iter_post_query_chunks(server, endpoint, ids, cache=None):
+            submitted.append(ids)
+            for i in range(0, len(ids), 2):
+                yield [
+                    {"query": id_, "id": id_, "desc": f"desc {id_}", "seq": id_[-1]}
+                    for id_ in ids[i : i + 2]
+                    if id_ != "ENST3"
+                ]
+
+        with unittest.mock.patch.object(
+            gget_seq, "iter_post_query_chunks", fake_iter_post_query_chunks
+        ):
+            result_to_test = seq(
+                ["ENST1", "ENST3", "ENST2", "ENST1.4", "ENST4"], verbose=False
+            )
+
+        # Duplicate IDs are fetched once, but each input ID gives one record in input order
+        self.assertEqual(submitted, [["ENST1", "ENST3", "ENST2", "ENST4"]])
+        self.assertEqual(
+            result_to_test,
+            [
+                ">ENST1 desc ENST1",
+                "1",
+                ">ENST2 desc ENST2",
+                "2",
+                ">ENST1 desc ENST1",
+                "1",
+                ">ENST4 desc ENST4",
+                "4",
+            ],
+        )
+
+    def test_seq_out_removed_on_error(self):
+        def failing_iter_post_query_chunks(server, endpoint, ids, cache=None):
+            yield [{"query": "ENST1", "id": "ENST1", "desc": "desc", "seq": "ACGT"}]
+            raise RuntimeError("Server error")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            out = os.path.join(tmp_dir, "results.fa")
+            with unittest.mock.patch.object(
+                gget_seq, "iter_post_query_chunks", failing_iter_post_query_chunks
+            ):
+                with self.assertRaises(RuntimeError):
+                    seq(["ENST1", "ENST2"], verbose=False, out=out)
+
+            # Neither the incomplete file nor the temporary file are left behind
+            self.assertEqual(os.listdir(tmp_dir), [])
+
+            with self.assertRaises(ValueError):
+                seq("ENST1", save=True, out=out)
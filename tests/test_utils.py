@@ -1,4 +1,11 @@
 import unittest
+import unittest.mock
+import tempfile
+import time
+import os
+import gzip
+import json
+import requests
 import numpy as np
 from gget.utils import (
     n_colors,
@@ -10,9 +17,28 @@ from gget.utils import (
     search_species_options,
     ref_species_options,
     read_fasta,
+    iter_fasta,
+    get_http_session,
+    configure_http,
+    check_cache_mode,
+    ResponseCache,
+    get_ens_ftp_listing,
+    RateLimiter,
+    FastaIO,
+    FastaRecord,
+    FastaBatch,
+    FastaWriter,
+    open_fasta,
+    fasta_compression,
 )
+from gget import utils
 
-from gget.constants import UNIPROT_REST_API, ENSEMBL_REST_API, ENSEMBL_FTP_URL_NV
+from gget.constants import (
+    UNIPROT_REST_API,
+    ENSEMBL_REST_API,
+    ENSEMBL_FTP_URL,
+    ENSEMBL_FTP_URL_NV,
+)
 
 from .fixtures import (
     LATEST_ENS_RELEASE,
@@ -42,6 +68,637 @@ class TestUtils(unittest.TestCase):
 
         self.assertEqual(result_to_test, expected_result)
 
+    def test_iter_fasta(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "seqs.fa")
+            with open(path, "w") as f:
+                f.write(">seq1 first\nACGT\nAC\n\nGT\n>seq2\nTTTT")
+
+            records = iter_fasta(path)
+            # Records are produced lazily, one at a time
+            self.assertEqual(next(records), ("seq1 first", "ACGTACGT"))
+            self.assertEqual(list(records), [("seq2", "TTTT")])
+
+            with open(path, "w") as f:
+                f.write(">seq1\n>seq2\nACGT\n")
+            with self.assertRaises(ValueError):
+                list(iter_fasta(path))
+
+            with open(path, "w") as f:
+                f.write("ACGT\n>seq1\nACGT\n")
+            with self.assertRaises(ValueError):
+                read_fasta(path)
+
+    def test_fasta_index(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "seqs.fa")
+            with open(path, "w") as f:
+                f.write(">seq1 first\nACGTA\nCGTAC\nGT\n>seq2\nTTTT\n>seq3\n")
+
+            with FastaIO.index(path) as fasta_index:
+                self.assertEqual(list(fasta_index), ["seq1", "seq2", "seq3"])
+                self.assertEqual(fasta_index.fetch("seq1"), "ACGTACGTACGT")
+                self.assertEqual(fasta_index.fetch("seq1", 3, 8), "TACGT")
+                self.assertEqual(fasta_index.fetch("seq2", 2), "TT")
+                self.assertEqual(fasta_index.fetch("seq3"), "")
+                with self.assertRaises(KeyError):
+                    fasta_index.fetch("seq4")
+
+            # The .fai file follows the samtools faidx format
+            with open(path + ".fai") as f:
+                self.assertEqual(f.readline(), "seq1\t12\t12\t5\t6\n")
+
+            # The last line of the file may be a full line without a line break
+            with open(path, "w") as f:
+                f.write(">seq1\nAC\n>seq2\nAAAA\nCCCC")
+            with FastaIO.index(path) as fasta_index:
+                self.assertEqual(fasta_index.fetch("seq2"), "AAAACCCC")
+                self.assertEqual(fasta_index.fetch("seq2", 3, 6), "ACC")
+
+            with open(path, "w") as f:
+                f.write(">seq1\nACG\nACGTA\nA\n")
+            with self.assertRaises(ValueError):
+                FastaIO.index(path)
+
+    def test_compressed_fasta_io(self):
+        records = [
+            FastaRecord("ACGT" * 5000, "seq1", "first"),
+            FastaRecord("TTGCA" * 30, "seq2"),
+        ]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            plain_path = os.path.join(tmpdir, "seqs.fa")
+            FastaIO.write(records, plain_path)
+            with open(plain_path) as f:
+                plain_text = f.read()
+
+            for name in ["seqs.fa.gz", "seqs.fa.bgz"]:
+                path = os.path.join(tmpdir, name)
+                FastaIO.write(records, path)
+                # Gzip output is written as BGZF, which any gzip reader can read
+                self.assertEqual(fasta_compression(path), "bgzf")
+                with gzip.open(path, "rt") as f:
+                    self.assertEqual(f.read(), plain_text)
+
+                result = [(r.id, r.description, r.seq) for r in FastaIO.parse(path)]
+                self.assertEqual(
+                    result, [(r.id, r.description, r.seq) for r in records]
+                )
+
+                # BGZF files can be indexed for random access
+                with FastaIO.index(path) as fasta_index:
+                    self.assertEqual(fasta_index.fetch("seq1", 9998, 10003), "GTACG")
+
+            # Plain gzip files can be streamed but not indexed
+            gzip_path = os.path.join(tmpdir, "plain.fa.gz")
+            with gzip.open(gzip_path, "wt") as f:
+                f.write(plain_text)
+            self.assertEqual(fasta_compression(gzip_path), "gzip")
+            self.assertEqual(
+                [title for title, _ in iter_fasta(gzip_path)], ["seq1 first", "seq2"]
+            )
+            with self.assertRaises(ValueError):
+                FastaIO.index(gzip_path)
+
+            with open_fasta(os.path.join(tmpdir, "seqs.fa.bgz"), "rb", threads=1) as f:
+                self.assertEqual(f.read().decode(), plain_text)
+
+    def test_fasta_parse_parallel(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "seqs.fa")
+            with open(path, "w") as f:
+                f.write("header text\n")
+                for i in range(50):
+                    f.write(f">seq{i} virus {i}\n" + "ACGTN" * i + "\n" + "GT\n\n")
+
+            expected = [(r.id, r.description, r.seq) for r in FastaIO.parse(path)]
+            self.assertEqual(len(expected), 50)
+
+            # Small chunks split the file into many byte ranges parsed in worker processes
+            result = [
+                (r.id, r.description, r.seq)
+                for r in FastaIO.parse_parallel(path, workers=2, chunk_size=100)
+            ]
+            self.assertEqual(result, expected)
+
+            batches = list(FastaIO.parse_parallel(path, batches=True, chunk_size=500))
+            self.assertGreater(len(batches), 1)
+            self.assertEqual(
+                [x for batch in batches for x in batch.ids], [r[0] for r in expected]
+            )
+
+            # A pool that cannot start falls back to parsing in the main process
+            with unittest.mock.patch(
+                "gget.utils.ProcessPoolExecutor", side_effect=OSError("no processes")
+            ):
+                result = [
+                    (r.id, r.description, r.seq)
+                    for r in FastaIO.parse_parallel(path, workers=2, chunk_size=100)
+                ]
+            self.assertEqual(result, expected)
+
+    def test_fasta_record_and_batch(self):
+        record = FastaRecord("ACGT", "seq1", as_bytes=True)
+        self.assertFalse(hasattr(record, "__dict__"))
+        self.assertEqual(record.seq_bytes, b"ACGT")
+        self.assertEqual(record.seq, "ACGT")
+
+        batch = FastaBatch.from_sequences(
+            ["seq1", "seq2", "seq3"], ["a", "", "c"], ["ACNNT", "", "nAN"]
+        )
+        self.assertEqual(batch.data, b"ACNNTnAN")
+        self.assertEqual(batch.lengths.tolist(), [5, 0, 3])
+        self.assertEqual(batch.count("Nn").tolist(), [2, 0, 2])
+        self.assertEqual(batch[2].seq, "nAN")
+
+        selected = batch.select([True, False, True])
+        combined = FastaBatch.concat([selected, batch.select([1])])
+        self.assertEqual(
+            [(r.id, r.description, r.seq) for r in combined],
+            [("seq1", "a", "ACNNT"), ("seq3", "c", "nAN"), ("seq2", "", "")],
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "seqs.fa")
+            # Batches and records can be mixed when writing
+            FastaIO.write([combined, FastaRecord("GG", "seq4")], path)
+            with open(path) as f:
+                self.assertEqual(
+                    f.read(), ">seq1 a\nACNNT\n>seq3 c\nnAN\n>seq2\n>seq4\nGG\n"
+                )
+
+    def test_fasta_writer_line_width(self):
+        records = [
+            FastaRecord("ACGTACGTAC", "seq1", "first"),
+            FastaRecord("", "seq2"),
+            FastaRecord("ACG", "seq3"),
+        ]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "seqs.fa")
+            # A tiny buffer forces flushes in the middle of records
+            with FastaWriter(path, line_width=4, buffer_size=8) as writer:
+                writer.write(records)
+            with open(path) as f:
+                self.assertEqual(
+                    f.read(), ">seq1 first\nACGT\nACGT\nAC\n>seq2\n>seq3\nACG\n"
+                )
+
+            FastaIO.write(records, path, line_width=None)
+            with open(path) as f:
+                self.assertEqual(
+                    f.read(), ">seq1 first\nACGTACGTAC\n>seq2\n\n>seq3\nACG\n"
+                )
+
+    def test_shared_http_session(self):
+        defaults = (utils.HTTP_POOL_MAXSIZE, utils.HTTP_MAX_RETRIES)
+        try:
+            configure_http(pool_maxsize=4, max_retries=1)
+            session = get_http_session()
+            # The same session is reused across calls
+            self.assertIs(session, get_http_session())
+
+            adapter = session.get_adapter("https://rest.ensembl.org/")
+            self.assertEqual(adapter._pool_maxsize, 4)
+            self.assertEqual(adapter.max_retries.total, 1)
+            # POST requests are not idempotent and are never retried
+            self.assertFalse(adapter.max_retries.is_retry("POST", 503))
+            self.assertTrue(adapter.max_retries.is_retry("GET", 503))
+        finally:
+            configure_http(pool_maxsize=defaults[0], max_retries=defaults[1])
+
+    def test_response_cache(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            response_cache = ResponseCache(cache_dir=tmp_dir)
+            url = ENSEMBL_REST_API + "lookup/id/"
+            key = ResponseCache.make_key("POST", url, {"json": {"ids": ["ENSG1"]}})
+            other_key = ResponseCache.make_key(
+                "POST", url, {"json": {"ids": ["ENSG2"]}}
+            )
+            self.assertNotEqual(key, other_key)
+
+            self.assertIsNone(response_cache.get(key, url))
+            response_cache.set(key, url, '{"ENSG1": null}')
+            self.assertEqual(response_cache.get(key, url), '{"ENSG1": null}')
+
+            def query(sql):
+                return response_cache._connect().execute(sql).fetchone()[0]
+
+            # Reads without update (cache mode 'read') do not change access times
+            accessed = query("SELECT accessed FROM responses")
+            time.sleep(0.01)
+            self.assertEqual(
+                response_cache.get(key, url, update=False), '{"ENSG1": null}'
+            )
+            self.assertEqual(query("SELECT accessed FROM responses"), accessed)
+
+            # Expired entries are not returned, and are only deleted by reads with update
+            response_cache.ttls["rest.ensembl.org"] = -1
+            self.assertIsNone(response_cache.get(key, url, update=False))
+            self.assertEqual(query("SELECT COUNT(*) FROM responses"), 1)
+            self.assertIsNone(response_cache.get(key, url))
+            self.assertEqual(query("SELECT COUNT(*) FROM responses"), 0)
+            response_cache.close()
+
+        # Reads without update do not create the cache database
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            response_cache = ResponseCache(cache_dir=os.path.join(tmp_dir, "cache"))
+            self.assertIsNone(response_cache.get(key, url, update=False))
+            self.assertEqual(os.listdir(tmp_dir), [])
+
+    def test_response_cache_lru_eviction(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            response_cache = ResponseCache(cache_dir=tmp_dir, max_size=25)
+            url = ENSEMBL_REST_API + "sequence/id/"
+            keys = [ResponseCache.make_key("GET", url + str(i)) for i in range(3)]
+
+            response_cache.set(keys[0], url, "a" * 10)
+            time.sleep(0.01)
+            response_cache.set(keys[1], url, "b" * 10)
+            time.sleep(0.01)
+            # Access first entry so the second entry is the least recently used
+            response_cache.get(keys[0], url)
+            time.sleep(0.01)
+            response_cache.set(keys[2], url, "c" * 10)
+
+            self.assertEqual(response_cache.get(keys[0], url), "a" * 10)
+            self.assertIsNone(response_cache.get(keys[1], url))
+            self.assertEqual(response_cache.get(keys[2], url), "c" * 10)
+            response_cache.close()
+
+    def test_check_cache_mode_bad_type(self):
+        with self.assertRaises(ValueError):
+            check_cache_mode("banana")
+
+    def test_ens_ftp_listing_index(self):
+        cache_dir = utils.CACHE_DIR
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            utils.CACHE_DIR = tmp_dir
+            try:
+                # Listings saved in the persisted index are returned without querying the server
+                index_path = utils._ens_ftp_index_path(ENSEMBL_FTP_URL, 1)
+                self.assertTrue(index_path.startswith(tmp_dir))
+                os.makedirs(os.path.dirname(index_path))
+                with open(index_path, "w") as f:
+                    json.dump({"mysql": ["homo_sapiens_core_1_38"]}, f)
+
+                result_to_test = get_ens_ftp_listing(
+                    ENSEMBL_FTP_URL, 1, "mysql", cache="read"
+                )
+                self.assertEqual(result_to_test, ["homo_sapiens_core_1_38"])
+            finally:
+                utils.CACHE_DIR = cache_dir
+                utils._ens_ftp_index.pop((ENSEMBL_FTP_URL, 1), None)
+                utils._ens_ftp_index_loaded.discard((ENSEMBL_FTP_URL, 1))
+
+    def test_ens_ftp_table_cache_mode(self):
+        responses = {
+            "release-1/gtf/homo_sapiens/": unittest.mock.Mock(
+                status_code=200, text="<td>a.gtf.gz</td>"
+            ),
+            "release-1/gtf/banana/": unittest.mock.Mock(status_code=404),
+        }
+
+        def fake_http_get(url, **kwargs):
+            return responses[url[len(ENSEMBL_FTP_URL) :]]
+
+        cache_dir = utils.CACHE_DIR
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            utils.CACHE_DIR = tmp_dir
+            index_path = utils._ens_ftp_index_path(ENSEMBL_FTP_URL, 1)
+            try:
+                with unittest.mock.patch.object(utils, "http_get", fake_http_get):
+                    # Nothing is persisted with the cache turned off
+                    utils.get_ens_ftp_table(
+                        ENSEMBL_FTP_URL, 1, "gtf/homo_sapiens", cache="off"
+                    )
+                    self.assertFalse(os.path.exists(index_path))
+
+                    # Missing folders are not persisted
+                    self.assertIsNone(
+                        utils.get_ens_ftp_table(
+                            ENSEMBL_FTP_URL, 1, "gtf/banana", cache="readwrite"
+                        )
+                    )
+                    self.assertFalse(os.path.exists(index_path))
+
+                    # ... and are only remembered for ENS_FTP_MISSING_TTL seconds
+                    responses["release-1/gtf/banana/"] = unittest.mock.Mock(
+                        status_code=200, text="<td>b.gtf.gz</td>"
+                    )
+                    with unittest.mock.patch.object(utils, "ENS_FTP_MISSING_TTL", 0):
+                        self.assertEqual(
+                            utils.get_ens_ftp_table(
+                                ENSEMBL_FTP_URL, 1, "gtf/banana", cache="readwrite"
+                            ),
+                            ["b.gtf.gz"],
+                        )
+                    with open(index_path) as f:
+                        self.assertEqual(
+                            json.load(f),
+                            {
+                                "table:gtf/homo_sapiens": ["a.gtf.gz"],
+                                "table:gtf/banana": ["b.gtf.gz"],
+                            },
+                        )
+            finally:
+                utils.CACHE_DIR = cache_dir
+                utils._ens_ftp_index.pop((ENSEMBL_FTP_URL, 1), None)
+                utils._ens_ftp_index_loaded.discard((ENSEMBL_FTP_URL, 1))
+
+    def test_rate_limiter(self):
+        rate_limiter = RateLimiter(20)
+        start = time.monotonic()
+        for _ in range(5):
+            rate_limiter.wait()
+        # The first call passes immediately, the following four are spaced out by 1/20 s
+        self.assertGreaterEqual(time.monotonic() - start, 0.19)
+
+    def test_post_query_chunked(self):
+        submitted = []
+
+        def fake_post_query(server, endpoint, query, cache=None):
+            submitted.append(len(query["ids"]))
+            if "banana" in query["ids"]:
+                raise utils.HTTPStatusError("Bad request", 400)
+            if "ENSG_UNAVAILABLE" in query["ids"]:
+                raise utils.HTTPStatusError("Service unavailable", 503)
+            return [{"query": ens_id} for ens_id in query["ids"]]
+
+        ids = [f"ENSG{i:011d}" for i in range(120)]
+        ids[70] = "banana"
+        with unittest.mock.patch.object(
+            utils, "post_query", fake_post_query
+        ), self.assertLogs(utils.logger, level="WARNING") as logs:
+            result_to_test = utils.post_query_chunked(
+                ENSEMBL_REST_API, "sequence/id/", ids, max_workers=2
+            )
+
+        # The chunk containing the invalid ID is split until it is isolated
+        self.assertEqual(submitted.count(50), 2)
+        self.assertIn(1, submitted)
+        self.assertEqual(
+            [r["query"] for r in result_to_test], [i for i in ids if i != "banana"]
+        )
+        self.assertIn("banana", logs.output[0])
+
+        # Server errors are raised without splitting the chunk
+        submitted.clear()
+        ids[70] = "ENSG_UNAVAILABLE"
+        with unittest.mock.patch.object(utils, "post_query", fake_post_query):
+            with self.assertRaises(utils.HTTPStatusError):
+                utils.post_query_chunked(
+                    ENSEMBL_REST_API, "sequence/id/", ids, max_workers=1
+                )
+        self.assertNotIn(25, submitted)
+
+    def test_post_query_chunked_timeout_and_throttling(self):
+        class FakeResponse:
+            def __init__(self, status_code, ids=(), headers=None):
+                self.status_code = status_code
+                self.ok = status_code == 200
+                self.ids = ids
+                self.headers = headers or {}
+                self.url = "https://rest.ensembl.org/lookup/id/"
+
+            def json(self):
+                return {ens_id: {"id": ens_id} for ens_id in self.ids}
+
+        submitted = []
+        throttled = []
+
+        def fake_cached_request(method, url, cache=None, json=None, headers=None):
+            ids = json["ids"]
+            submitted.append(len(ids))
+            if len(ids) == 4:
+                raise requests.Timeout("Read timed out")
+            if "ENSG0" in ids and not throttled:
+                throttled.append(ids)
+                return FakeResponse(429, headers={"Retry-After": "2"})
+            return FakeResponse(200, ids)
+
+        ids = [f"ENSG{i}" for i in range(4)]
+        with unittest.mock.patch.object(
+            utils, "cached_request", fake_cached_request
+        ), unittest.mock.patch.object(utils.time, "sleep") as sleep:
+            result_to_test = utils.post_query_chunked(
+                ENSEMBL_REST_API, "lookup/id/", ids, max_workers=1
+            )
+
+        # The timed out chunk is split in half and the throttled half is retried after Retry-After
+        self.assertEqual(list(result_to_test), ids)
+        self.assertEqual(submitted, [4, 2, 2, 2])
+        sleep.assert_called_once_with(2)
+
+        # Throttling that persists is raised after HTTP_MAX_RETRIES retries
+        with unittest.mock.patch.object(
+            utils,
+            "cached_request",
+            lambda *args, **kwargs: FakeResponse(429),
+        ), unittest.mock.patch.object(utils.time, "sleep") as sleep:
+            with self.assertRaises(utils.HTTPStatusError):
+                utils.post_query(ENSEMBL_REST_API, "lookup/id/", {"ids": ids})
+        self.assertEqual(sleep.call_count, utils.HTTP_MAX_RETRIES)
+
+    def test_get_pdb_ids_bulk(self):
+        class FakeResponse:
+            def __init__(self, ens_id):
+                self.ens_id = ens_id
+                self.ok = ens_id != "ENSG3"
+                self.status_code = 200 if self.ok else 404
+
+            def json(self):
+                return {self.ens_id: {"mappings": [{"pdb_id": "2b"}, {"pdb_id": "1a"}]}}
+
+        requested = []
+
+        def fake_http_get(url, **kwargs):
+            requested.append(url.split("/")[-1])
+            return FakeResponse(url.split("/")[-1])
+
+        response_cache = utils._response_cache
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            utils._response_cache = ResponseCache(cache_dir=tmp_dir)
+            try:
+                with unittest.mock.patch.object(utils, "http_get", fake_http_get):
+                    # Nothing is persisted with the cache turned off
+                    result_to_test = utils.get_pdb_ids_bulk(
+                        ["ENSG1", "ENSG3"], cache="off"
+                    )
+                    self.assertEqual(
+                        result_to_test, {"ENSG1": ["1a", "2b"], "ENSG3": None}
+                    )
+                    self.assertEqual(os.listdir(tmp_dir), [])
+
+                    utils.get_pdb_ids_bulk(["ENSG1", "ENSG3"], cache="readwrite")
+
+                    # Cached mappings (also 'no PDB IDs') are reused
+                    requested.clear()
+                    result_to_test = utils.get_pdb_ids_bulk(
+                        ["ENSG3", "ENSG1", "ENSG2"], cache="read"
+                    )
+                    self.assertEqual(list(result_to_test), ["ENSG3", "ENSG1", "ENSG2"])
+                    self.assertEqual(result_to_test["ENSG3"], None)
+                    self.assertEqual(requested, ["ENSG2"])
+            finally:
+                utils._response_cache.close()
+                utils._response_cache = response_cache
+
+    def test_get_ncbi_gene_info(self):
+        summaries = {
+            "7157": {
+                "name": "TP53",
+                "organism": {"scientificname": "Homo sapiens"},
+                "summary": "Tumor suppressor",
+                "otheraliases": "P53, LFS1",
+            },
+            "22059": {
+                "name": "TP53",
+                "organism": {"scientificname": "Mus musculus"},
+                "summary": "Mouse tumor suppressor",
+            },
+            "1": {"name": "ABC", "organism": {"scientificname": "Homo sapiens"}},
+            "2": {"name": "ABC", "organism": {"scientificname": "Homo sapiens"}},
+        }
+        searched = []
+        throttled = []
+
+        class FakeResponse:
+            url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"
+
+            def __init__(self, result, status_code=200):
+                self.result = result
+                self.status_code = status_code
+                self.ok = status_code == 200
+                self.headers = {}
+
+            def json(self):
+                return self.result
+
+        def fake_cached_request(method, url, cache=None, data=None, **kwargs):
+            # The first esummary request is throttled by the server
+            if url.endswith("esummary.fcgi") and not throttled:
+                throttled.append(data["id"])
+                return FakeResponse(None, status_code=429)
+            if url.endswith("esearch.fcgi"):
+                searched.append(data["term"])
+                idlist = {
+                    "ENSG1 OR ENSG2 OR ENSG3": ["7157", "22059", "1", "2"],
+                    "ENSG2": ["2"],
+                }.get(data["term"], [])
+                return FakeResponse({"esearchresult": {"idlist": idlist}})
+
+            uids = data["id"].split(",")
+            result = {"uids": uids, **{uid: summaries[uid] for uid in uids}}
+            return FakeResponse({"result": result})
+
+        ensembl_info = {
+            "ENSG1": {"display_name": "TP53", "species": "homo_sapiens"},
+            "ENSG2": {"display_name": "ABC", "species": "homo_sapiens"},
+            "ENSG3": {"display_name": "XYZ", "species": "homo_sapiens"},
+        }
+        with unittest.mock.patch.object(
+            utils, "cached_request", fake_cached_request
+        ), unittest.mock.patch.object(utils.time, "sleep") as sleep:
+            result_to_test = utils.get_ncbi_gene_info(
+                ["ENSG1", "ENSG2", "ENSG3"], ensembl_info=ensembl_info
+            )
+
+        # The throttled request is retried after a backoff
+        self.assertEqual(len(throttled), 1)
+        sleep.assert_any_call(utils.HTTP_BACKOFF_FACTOR)
+
+        # ENSG1 is matched by gene name and species in the batched search
+        self.assertEqual(
+            result_to_test["ENSG1"],
+            {
+                "ncbi_gene_id": "7157",
+                "ncbi_description": "Tumor suppressor",
+                "ncbi_synonyms": ["P53", "LFS1"],
+            },
+        )
+        # ENSG2 matches two genes and is resolved by its own search, ENSG3 is not found
+        self.assertEqual(searched, ["ENSG1 OR ENSG2 OR ENSG3", "ENSG2", "ENSG3"])
+        self.assertEqual(result_to_test["ENSG2"]["ncbi_gene_id"], "2")
+        self.assertTrue(np.isnan(result_to_test["ENSG3"]["ncbi_gene_id"]))
+        self.assertIsNone(result_to_test["ENSG3"]["ncbi_synonyms"])
+
+    def test_download_file_resume(self):
+        content = os.urandom(5000)
+        compressed = gzip.compress(content)
+        requested_ranges = []
+
+        class FakeResponse:
+            def __init__(self, headers):
+                self.range = headers.get("Range")
+                requested_ranges.append(self.range)
+                offset = int(self.range[6:-1]) if self.range else 0
+                self.status_code = 206 if self.range else 200
+                self.body = compressed[offset:]
+                self.headers = {"Content-Length": str(len(self.body))}
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *args):
+                pass
+
+            def iter_content(self, chunk_size):
+                # The first connection drops after 100 bytes
+                if len(requested_ranges) == 1:
+                    yield self.body[:100]
+                    raise requests.exceptions.ChunkedEncodingError("Connection reset")
+                yield self.body
+
+        def fake_http_get(url, headers=None, **kwargs):
+            return FakeResponse(headers or {})
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "ref.fa.gz")
+            with open(path, "wb") as f:
+                f.write(compressed)
+            checksum = utils.bsd_sum(path)
+            os.remove(path)
+
+            with unittest.mock.patch.object(utils, "http_get", fake_http_get):
+                result_to_test = utils.download_file(
+                    "http://ftp.example.org/ref.fa.gz",
+                    out_dir=tmp_dir,
+                    checksum=checksum,
+                    decompress=True,
+                    verbose=False,
+                )
+
+            self.assertEqual(requested_ranges, [None, "bytes=100-"])
+            self.assertEqual(result_to_test, os.path.join(tmp_dir, "ref.fa"))
+            with open(result_to_test, "rb") as f:
+                self.assertEqual(f.read(), content)
+            self.assertEqual(os.listdir(tmp_dir), ["ref.fa"])
+
+    def test_bsd_sum_fallback(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "file.txt")
+            with open(path, "w") as f:
+                f.write("hello world\n")
+            with unittest.mock.patch.object(utils.shutil, "which", return_value=None):
+                self.assertEqual(utils.bsd_sum(path), (3762, 1))
+
+        # The vectorized blocks match the byte by byte definition, also across wrap-arounds and 0xFFFF
+        def bsd_sum_bytes(data, checksum):
+            for byte in data:
+                checksum = (((checksum >> 1) | ((checksum & 1) << 15)) + byte) & 0xFFFF
+            return checksum
+
+        rng = np.random.default_rng(0)
+        for data in [
+            rng.integers(0, 256, 50000, dtype=np.uint8).tobytes(),
+            b"ACGTN\n" * 5000,
+            b"\x00" * 1000 + b"\xff" * 70000 + b"\x00" * 50,
+        ]:
+            for checksum in [0, 1, 0xFFFF]:
+                self.assertEqual(
+                    utils._bsd_sum_block(np.frombuffer(data, dtype=np.uint8), checksum),
+                    bsd_sum_bytes(data, checksum),
+                )
+
     def test_n_colors(self):
         result_to_test = n_colors("A")
         expected_result = "\x1b[38;5;15m\x1b[48;5;9mA\x1b[0;0m"